@@ -0,0 +1,143 @@
+"""Add stored content_tsv columns to documents and chunks
+
+Revision ID: 33
+Revises: 32
+
+Changes:
+1. Add content_tsv column (TSVECTOR, nullable) to documents and chunks
+2. Add a trigger keeping content_tsv in sync with content
+3. Backfill content_tsv in batches
+4. Replace the expression GIN indexes with GIN indexes on content_tsv
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "33"
+down_revision: str | None = "32"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Number of rows updated per backfill batch
+BACKFILL_BATCH_SIZE = 5000
+
+# (table name, old expression index, new content_tsv index)
+TSV_TABLES = [
+    ("documents", "document_search_index", "document_content_tsv_index"),
+    ("chunks", "chucks_search_index", "chucks_content_tsv_index"),
+]
+
+
+def upgrade() -> None:
+    """Add, backfill and index content_tsv on documents and chunks."""
+
+    from sqlalchemy import inspect
+
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    # Add content_tsv columns if they don't exist
+    for table_name, _, _ in TSV_TABLES:
+        columns = [col["name"] for col in inspector.get_columns(table_name)]
+        if "content_tsv" not in columns:
+            op.add_column(
+                table_name,
+                sa.Column("content_tsv", postgresql.TSVECTOR(), nullable=True),
+            )
+
+    # Keep content_tsv in sync with content for new and updated rows
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION content_tsv_trigger() RETURNS trigger AS $$
+        BEGIN
+            NEW.content_tsv := to_tsvector('english', coalesce(NEW.content, ''));
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table_name, _, _ in TSV_TABLES:
+        op.execute(
+            f"DROP TRIGGER IF EXISTS {table_name}_content_tsv_update ON {table_name}"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table_name}_content_tsv_update "
+            f"BEFORE INSERT OR UPDATE OF content ON {table_name} "
+            "FOR EACH ROW EXECUTE FUNCTION content_tsv_trigger()"
+        )
+
+    # Backfill existing rows in batches of consecutive ids, committing each batch
+    with op.get_context().autocommit_block():
+        for table_name, _, _ in TSV_TABLES:
+            last_id = 0
+            total_updated = 0
+            while True:
+                batch_last_id = conn.execute(
+                    sa.text(
+                        f"""
+                        SELECT max(id) FROM (
+                            SELECT id FROM {table_name}
+                            WHERE id > :last_id
+                            ORDER BY id
+                            LIMIT :batch_size
+                        ) AS batch
+                        """
+                    ),
+                    {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE},
+                ).scalar()
+                if batch_last_id is None:
+                    break
+
+                result = conn.execute(
+                    sa.text(
+                        f"""
+                        UPDATE {table_name}
+                        SET content_tsv = to_tsvector('english', coalesce(content, ''))
+                        WHERE id > :last_id AND id <= :batch_last_id
+                        AND content_tsv IS NULL
+                        """
+                    ),
+                    {"last_id": last_id, "batch_last_id": batch_last_id},
+                )
+                last_id = batch_last_id
+                total_updated += result.rowcount
+                print(f"Backfilled content_tsv for {total_updated} {table_name} rows")
+
+        # Replace the expression indexes with indexes on the stored column,
+        # built and dropped without blocking writes
+        for table_name, old_index, new_index in TSV_TABLES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {new_index} "
+                f"ON {table_name} USING gin (content_tsv)"
+            )
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {old_index}")
+
+
+def downgrade() -> None:
+    """Restore expression indexes and remove content_tsv from documents and chunks."""
+
+    from sqlalchemy import inspect
+
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    for table_name, old_index, new_index in TSV_TABLES:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {old_index} ON {table_name} "
+            "USING gin (to_tsvector('english', content))"
+        )
+        op.execute(f"DROP INDEX IF EXISTS {new_index}")
+        op.execute(
+            f"DROP TRIGGER IF EXISTS {table_name}_content_tsv_update ON {table_name}"
+        )
+
+        columns = [col["name"] for col in inspector.get_columns(table_name)]
+        if "content_tsv" in columns:
+            op.drop_column(table_name, "content_tsv")
+
+    op.execute("DROP FUNCTION IF EXISTS content_tsv_trigger()")
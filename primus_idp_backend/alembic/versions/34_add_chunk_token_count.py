@@ -0,0 +1,50 @@
+"""Add token_count column to chunks
+
+Revision ID: 34
+Revises: 33
+
+Changes:
+1. Add token_count column (Integer, nullable) to chunks
+
+Existing chunks keep a NULL token_count and are tokenized on demand.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "34"
+down_revision: str | None = "33"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add token_count column to chunks table."""
+
+    from sqlalchemy import inspect
+
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    chunk_columns = [col["name"] for col in inspector.get_columns("chunks")]
+
+    if "token_count" not in chunk_columns:
+        op.add_column("chunks", sa.Column("token_count", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove token_count column from chunks table."""
+
+    from sqlalchemy import inspect
+
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    chunk_columns = [col["name"] for col in inspector.get_columns("chunks")]
+
+    if "token_count" in chunk_columns:
+        op.drop_column("chunks", "token_count")
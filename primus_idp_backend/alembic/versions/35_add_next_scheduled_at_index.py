@@ -0,0 +1,37 @@
+"""Add partial index on search_source_connectors.next_scheduled_at
+
+Revision ID: 35
+Revises: 34
+
+Changes:
+1. Add an index on next_scheduled_at covering only connectors with periodic
+   indexing enabled, used by the schedule checker to find due connectors
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "35"
+down_revision: str | None = "34"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEX_NAME = "search_source_connectors_next_scheduled_index"
+
+
+def upgrade() -> None:
+    """Add the partial next_scheduled_at index."""
+
+    op.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} "
+        "ON search_source_connectors (next_scheduled_at) "
+        "WHERE periodic_indexing_enabled"
+    )
+
+
+def downgrade() -> None:
+    """Remove the partial next_scheduled_at index."""
+
+    op.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
@@ -0,0 +1,168 @@
+"""Add document revisions and the Q&A answer cache table
+
+Revision ID: 36
+Revises: 35
+
+Changes:
+1. Add a documents_revision_seq sequence and a revision column on documents,
+   set from the sequence on insert and by a trigger on update, and backfill
+   it in batches
+2. Index documents on (search_space_id, revision) so the version of a search
+   space's documents is read without scanning them
+3. Add the qna_answer_cache table storing answers reused for similar questions
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "36"
+down_revision: str | None = "35"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Number of rows updated per backfill batch
+BACKFILL_BATCH_SIZE = 5000
+
+REVISION_INDEX = "documents_search_space_revision_index"
+REVISION_NOT_NULL = "documents_revision_not_null"
+LOOKUP_INDEX = "qna_answer_cache_lookup_index"
+
+
+def upgrade() -> None:
+    """Add document revisions and the qna_answer_cache table."""
+
+    from sqlalchemy import inspect
+
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    op.execute("CREATE SEQUENCE IF NOT EXISTS documents_revision_seq")
+
+    # Add the column without a default first: a volatile default would rewrite
+    # the whole table, while the default set afterwards only applies to new rows
+    columns = [col["name"] for col in inspector.get_columns("documents")]
+    if "revision" not in columns:
+        op.add_column(
+            "documents", sa.Column("revision", sa.BigInteger(), nullable=True)
+        )
+    op.execute(
+        "ALTER TABLE documents "
+        "ALTER COLUMN revision SET DEFAULT nextval('documents_revision_seq')"
+    )
+
+    # Backfill existing rows in batches of consecutive ids, committing each batch
+    with op.get_context().autocommit_block():
+        last_id = 0
+        total_updated = 0
+        while True:
+            batch_last_id = conn.execute(
+                sa.text(
+                    """
+                    SELECT max(id) FROM (
+                        SELECT id FROM documents
+                        WHERE id > :last_id
+                        ORDER BY id
+                        LIMIT :batch_size
+                    ) AS batch
+                    """
+                ),
+                {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE},
+            ).scalar()
+            if batch_last_id is None:
+                break
+
+            result = conn.execute(
+                sa.text(
+                    """
+                    UPDATE documents
+                    SET revision = nextval('documents_revision_seq')
+                    WHERE id > :last_id AND id <= :batch_last_id
+                    AND revision IS NULL
+                    """
+                ),
+                {"last_id": last_id, "batch_last_id": batch_last_id},
+            )
+            last_id = batch_last_id
+            total_updated += result.rowcount
+            print(f"Backfilled revision for {total_updated} documents rows")
+
+        # A check validated in its own transaction lets SET NOT NULL skip the
+        # table scan it would otherwise run under an exclusive lock
+        op.execute(
+            f"ALTER TABLE documents DROP CONSTRAINT IF EXISTS {REVISION_NOT_NULL}"
+        )
+        op.execute(
+            f"ALTER TABLE documents ADD CONSTRAINT {REVISION_NOT_NULL} "
+            "CHECK (revision IS NOT NULL) NOT VALID"
+        )
+        op.execute(f"ALTER TABLE documents VALIDATE CONSTRAINT {REVISION_NOT_NULL}")
+
+        # Build the index without blocking writes to documents
+        op.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {REVISION_INDEX} "
+            "ON documents (search_space_id, revision)"
+        )
+
+    op.execute("ALTER TABLE documents ALTER COLUMN revision SET NOT NULL")
+    op.execute(f"ALTER TABLE documents DROP CONSTRAINT {REVISION_NOT_NULL}")
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION document_revision_trigger() RETURNS trigger AS $$
+        BEGIN
+            NEW.revision := nextval('documents_revision_seq');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS documents_revision_update ON documents")
+    op.execute(
+        "CREATE TRIGGER documents_revision_update "
+        "BEFORE UPDATE ON documents "
+        "FOR EACH ROW EXECUTE FUNCTION document_revision_trigger()"
+    )
+    # The embedding dimension depends on the configured model, so it's left open
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS qna_answer_cache (
+            id SERIAL PRIMARY KEY,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            search_space_id INTEGER NOT NULL REFERENCES searchspaces(id) ON DELETE CASCADE,
+            scope_hash VARCHAR(64) NOT NULL,
+            corpus_version VARCHAR(64) NOT NULL,
+            query_text TEXT NOT NULL,
+            query_embedding vector,
+            answer TEXT NOT NULL,
+            document_ids JSON NOT NULL,
+            sources JSON NOT NULL,
+            further_questions JSON NOT NULL
+        );
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_qna_answer_cache_id ON qna_answer_cache (id)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_qna_answer_cache_created_at "
+        "ON qna_answer_cache (created_at)"
+    )
+    op.execute(
+        f"CREATE INDEX IF NOT EXISTS {LOOKUP_INDEX} "
+        "ON qna_answer_cache (search_space_id, scope_hash, corpus_version)"
+    )
+
+
+def downgrade() -> None:
+    """Remove the qna_answer_cache table and document revisions."""
+
+    op.execute("DROP TABLE IF EXISTS qna_answer_cache")
+    op.execute(f"DROP INDEX IF EXISTS {REVISION_INDEX}")
+    op.execute("DROP TRIGGER IF EXISTS documents_revision_update ON documents")
+    op.execute("DROP FUNCTION IF EXISTS document_revision_trigger()")
+    op.execute("ALTER TABLE documents DROP COLUMN IF EXISTS revision")
+    op.execute("DROP SEQUENCE IF EXISTS documents_revision_seq")
@@ -12,8 +12,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 # Additional imports for document fetching
 from sqlalchemy.future import select
 
-from app.db import Document, SearchSpace
+from app.config import config as app_config
+from app.db import Document, DocumentType, SearchSpace, async_session_maker
 from app.services.connector_service import ConnectorService
+from app.services.qna_answer_cache_service import get_qna_answer_cache
 from app.services.query_service import QueryService
 
 from .configuration import Configuration, SearchMode
@@ -128,19 +130,19 @@ async def fetch_documents_by_ids(
         )
         documents = result.scalars().all()
 
+        # Fetch the chunks of all documents in one query
+        from app.retriver.documents_hybrid_search import DocumentHybridSearchRetriever
+
+        chunks_by_document = await DocumentHybridSearchRetriever(
+            db_session
+        ).fetch_chunks_for_documents([doc.id for doc in documents])
+
         # Group documents by type for source object creation
         documents_by_type = {}
         formatted_documents = []
 
         for doc in documents:
-            # Fetch associated chunks for this document (similar to DocumentHybridSearchRetriever)
-            from app.db import Chunk
-
-            chunks_query = (
-                select(Chunk).where(Chunk.document_id == doc.id).order_by(Chunk.id)
-            )
-            chunks_result = await db_session.execute(chunks_query)
-            chunks = chunks_result.scalars().all()
+            chunks = chunks_by_document.get(doc.id, [])
 
             # Return individual chunks instead of concatenated content
             if chunks:
@@ -669,6 +671,147 @@ async def write_answer_outline(
         raise
 
 
+# Search method, whether it takes a search mode, and found-results message per connector
+CONNECTOR_SEARCHES: dict[str, tuple[str, bool, str]] = {
+    "YOUTUBE_VIDEO": (
+        "search_youtube",
+        True,
+        "📹 Found {count} YouTube chunks related to your query",
+    ),
+    "EXTENSION": (
+        "search_extension",
+        True,
+        "🧩 Found {count} Browser Extension chunks related to your query",
+    ),
+    "CRAWLED_URL": (
+        "search_crawled_urls",
+        True,
+        "🌐 Found {count} Web Pages chunks related to your query",
+    ),
+    "FILE": (
+        "search_files",
+        True,
+        "📄 Found {count} Files chunks related to your query",
+    ),
+    "SLACK_CONNECTOR": (
+        "search_slack",
+        True,
+        "💬 Found {count} Slack messages related to your query",
+    ),
+    "NOTION_CONNECTOR": (
+        "search_notion",
+        True,
+        "📘 Found {count} Notion pages/blocks related to your query",
+    ),
+    "GITHUB_CONNECTOR": (
+        "search_github",
+        True,
+        "🐙 Found {count} GitHub files/issues related to your query",
+    ),
+    "LINEAR_CONNECTOR": (
+        "search_linear",
+        True,
+        "📊 Found {count} Linear issues related to your query",
+    ),
+    "TAVILY_API": (
+        "search_tavily",
+        False,
+        "🔍 Found {count} Web Search results related to your query",
+    ),
+    "SEARXNG_API": (
+        "search_searxng",
+        False,
+        "🌐 Found {count} SearxNG results related to your query",
+    ),
+    "LINKUP_API": (
+        "search_linkup",
+        False,
+        "🔗 Found {count} Linkup results related to your query",
+    ),
+    "BAIDU_SEARCH_API": (
+        "search_baidu",
+        False,
+        "🇨🇳 Found {count} Baidu Search results related to your query",
+    ),
+    "DISCORD_CONNECTOR": (
+        "search_discord",
+        True,
+        "🗨️ Found {count} Discord messages related to your query",
+    ),
+    "JIRA_CONNECTOR": (
+        "search_jira",
+        True,
+        "🎫 Found {count} Jira issues related to your query",
+    ),
+    "GOOGLE_CALENDAR_CONNECTOR": (
+        "search_google_calendar",
+        True,
+        "📅 Found {count} calendar events related to your query",
+    ),
+    "AIRTABLE_CONNECTOR": (
+        "search_airtable",
+        True,
+        "🗃️ Found {count} Airtable records related to your query",
+    ),
+    "GOOGLE_GMAIL_CONNECTOR": (
+        "search_google_gmail",
+        True,
+        "📧 Found {count} Gmail messages related to your query",
+    ),
+    "CONFLUENCE_CONNECTOR": (
+        "search_confluence",
+        True,
+        "📚 Found {count} Confluence pages related to your query",
+    ),
+    "CLICKUP_CONNECTOR": (
+        "search_clickup",
+        True,
+        "📋 Found {count} ClickUp tasks related to your query",
+    ),
+    "LUMA_CONNECTOR": (
+        "search_luma",
+        True,
+        "🎯 Found {count} Luma events related to your query",
+    ),
+    "ELASTICSEARCH_CONNECTOR": (
+        "search_elasticsearch",
+        True,
+        "🔎 Found {count} Elasticsearch chunks related to your query",
+    ),
+}
+
+
+async def _search_connector(
+    connector_service: ConnectorService,
+    connector: str,
+    user_query: str,
+    user_id: str,
+    search_space_id: int,
+    top_k: int,
+    search_mode: SearchMode,
+) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
+    """
+    Search one connector for a query.
+
+    Returns:
+        Tuple of (source object, document chunks)
+    """
+    method_name, takes_search_mode, _ = CONNECTOR_SEARCHES[connector]
+    search_kwargs: dict[str, Any] = {
+        "user_query": user_query,
+        "user_id": user_id,
+        "search_space_id": search_space_id,
+    }
+    if connector == "LINKUP_API":
+        search_kwargs["mode"] = "standard"
+    else:
+        search_kwargs["top_k"] = top_k
+    if takes_search_mode:
+        search_kwargs["search_mode"] = search_mode
+
+    return await getattr(connector_service, method_name)(**search_kwargs)
+
+
 async def fetch_relevant_documents(
     research_questions: list[str],
     user_id: str,
@@ -737,593 +880,104 @@ async def fetch_relevant_documents(
             }
         )
 
-    all_raw_documents = []  # Store all raw documents
-    all_sources = []  # Store all sources
+    # Every (question, connector) search runs concurrently with its own database
+    # session, bounded per backend and cut off at a per-connector deadline
+    timeout = app_config.RESEARCH_CONNECTOR_TIMEOUT_SECONDS or None
+    semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def get_semaphore(connector: str) -> asyncio.Semaphore:
+        # Local searches share the database pool; each web search API gets its own limit
+        backend = "LOCAL" if connector in DocumentType.__members__ else connector
+        if backend not in semaphores:
+            limit = (
+                app_config.RESEARCH_LOCAL_SEARCH_CONCURRENCY
+                if backend == "LOCAL"
+                else app_config.RESEARCH_WEB_SEARCH_CONCURRENCY
+            )
+            semaphores[backend] = asyncio.Semaphore(max(1, limit))
+        return semaphores[backend]
 
-    for i, user_query in enumerate(research_questions):
-        # Stream question being researched
+    def stream_info(message: str) -> None:
         if streaming_service and writer:
             writer(
-                {
-                    "yield_value": streaming_service.format_terminal_info_delta(
-                        f'🧠 Researching question {i + 1}/{len(research_questions)}: "{user_query[:100]}..."'
-                    )
-                }
+                {"yield_value": streaming_service.format_terminal_info_delta(message)}
             )
 
-        # Use original research question as the query
-        reformulated_query = user_query
-
-        # Process each selected connector
-        for connector in connectors_to_search:
-            # Stream connector being searched
-            if streaming_service and writer:
-                connector_emoji = get_connector_emoji(connector)
-                friendly_name = get_connector_friendly_name(connector)
-                writer(
-                    {
-                        "yield_value": streaming_service.format_terminal_info_delta(
-                            f"{connector_emoji} Searching {friendly_name} for relevant information..."
-                        )
-                    }
-                )
-
-            try:
-                if connector == "YOUTUBE_VIDEO":
-                    (
-                        source_object,
-                        youtube_chunks,
-                    ) = await connector_service.search_youtube(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(youtube_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"📹 Found {len(youtube_chunks)} YouTube chunks related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "EXTENSION":
-                    (
-                        source_object,
-                        extension_chunks,
-                    ) = await connector_service.search_extension(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(extension_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🧩 Found {len(extension_chunks)} Browser Extension chunks related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "CRAWLED_URL":
-                    (
-                        source_object,
-                        crawled_urls_chunks,
-                    ) = await connector_service.search_crawled_urls(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(crawled_urls_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🌐 Found {len(crawled_urls_chunks)} Web Pages chunks related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "FILE":
-                    source_object, files_chunks = await connector_service.search_files(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(files_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"📄 Found {len(files_chunks)} Files chunks related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "SLACK_CONNECTOR":
-                    source_object, slack_chunks = await connector_service.search_slack(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(slack_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"💬 Found {len(slack_chunks)} Slack messages related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "NOTION_CONNECTOR":
-                    (
-                        source_object,
-                        notion_chunks,
-                    ) = await connector_service.search_notion(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(notion_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"📘 Found {len(notion_chunks)} Notion pages/blocks related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "GITHUB_CONNECTOR":
-                    (
-                        source_object,
-                        github_chunks,
-                    ) = await connector_service.search_github(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(github_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🐙 Found {len(github_chunks)} GitHub files/issues related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "LINEAR_CONNECTOR":
-                    (
-                        source_object,
-                        linear_chunks,
-                    ) = await connector_service.search_linear(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(linear_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"📊 Found {len(linear_chunks)} Linear issues related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "TAVILY_API":
-                    (
-                        source_object,
-                        tavily_chunks,
-                    ) = await connector_service.search_tavily(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(tavily_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🔍 Found {len(tavily_chunks)} Web Search results related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "SEARXNG_API":
-                    (
-                        source_object,
-                        searx_chunks,
-                    ) = await connector_service.search_searxng(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                    )
-
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(searx_chunks)
-
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🌐 Found {len(searx_chunks)} SearxNG results related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "LINKUP_API":
-                    linkup_mode = "standard"
-
-                    (
-                        source_object,
-                        linkup_chunks,
-                    ) = await connector_service.search_linkup(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        mode=linkup_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(linkup_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🔗 Found {len(linkup_chunks)} Linkup results related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "BAIDU_SEARCH_API":
-                    (
-                        source_object,
-                        baidu_chunks,
-                    ) = await connector_service.search_baidu(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(baidu_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🇨🇳 Found {len(baidu_chunks)} Baidu Search results related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "DISCORD_CONNECTOR":
-                    (
-                        source_object,
-                        discord_chunks,
-                    ) = await connector_service.search_discord(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(discord_chunks)
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🗨️ Found {len(discord_chunks)} Discord messages related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "JIRA_CONNECTOR":
-                    source_object, jira_chunks = await connector_service.search_jira(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(jira_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🎫 Found {len(jira_chunks)} Jira issues related to your query"
-                                )
-                            }
-                        )
-                elif connector == "GOOGLE_CALENDAR_CONNECTOR":
-                    (
-                        source_object,
-                        calendar_chunks,
-                    ) = await connector_service.search_google_calendar(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(calendar_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"📅 Found {len(calendar_chunks)} calendar events related to your query"
-                                )
-                            }
-                        )
-                elif connector == "AIRTABLE_CONNECTOR":
-                    (
-                        source_object,
-                        airtable_chunks,
-                    ) = await connector_service.search_airtable(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(airtable_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🗃️ Found {len(airtable_chunks)} Airtable records related to your query"
-                                )
-                            }
-                        )
-                elif connector == "GOOGLE_GMAIL_CONNECTOR":
-                    (
-                        source_object,
-                        gmail_chunks,
-                    ) = await connector_service.search_google_gmail(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(gmail_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"📧 Found {len(gmail_chunks)} Gmail messages related to your query"
-                                )
-                            }
-                        )
-                elif connector == "CONFLUENCE_CONNECTOR":
-                    (
-                        source_object,
-                        confluence_chunks,
-                    ) = await connector_service.search_confluence(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(confluence_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"📚 Found {len(confluence_chunks)} Confluence pages related to your query"
-                                )
-                            }
-                        )
-                elif connector == "CLICKUP_CONNECTOR":
-                    (
-                        source_object,
-                        clickup_chunks,
-                    ) = await connector_service.search_clickup(
-                        user_query=reformulated_query,
+    async def prefetch_local_searches(user_query: str) -> None:
+        # Search every local connector in a single database round trip
+        local_document_types = [
+            connector
+            for connector in connectors_to_search
+            if connector in DocumentType.__members__
+        ]
+        if len(local_document_types) < 2:
+            return
+        try:
+            async with (
+                get_semaphore(local_document_types[0]),
+                async_session_maker() as search_session,
+            ):
+                search_service = connector_service.fork(search_session)
+                await asyncio.wait_for(
+                    search_service.prefetch_chunk_searches(
+                        user_query=user_query,
                         user_id=user_id,
                         search_space_id=search_space_id,
+                        document_types=local_document_types,
                         top_k=top_k,
-                        search_mode=search_mode,
-                    )
+                    ),
+                    timeout,
+                )
+        except Exception as e:
+            # Fall back to searching each connector on its own
+            logging.warning(f"Batched connector search failed: {e!r}")
 
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(clickup_chunks)
+    async def search(
+        user_query: str, connector: str, prefetch: asyncio.Task | None
+    ) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
+        if prefetch is not None and connector in DocumentType.__members__:
+            await asyncio.shield(prefetch)
 
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"📋 Found {len(clickup_chunks)} ClickUp tasks related to your query"
-                                )
-                            }
-                        )
+        async with get_semaphore(connector):
+            # Stream connector being searched
+            connector_emoji = get_connector_emoji(connector)
+            friendly_name = get_connector_friendly_name(connector)
+            stream_info(
+                f"{connector_emoji} Searching {friendly_name} for relevant information..."
+            )
 
-                elif connector == "LUMA_CONNECTOR":
-                    (
-                        source_object,
-                        luma_chunks,
-                    ) = await connector_service.search_luma(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
+            try:
+                async with async_session_maker() as search_session:
+                    source_object, chunks = await asyncio.wait_for(
+                        _search_connector(
+                            connector_service.fork(search_session),
+                            connector,
+                            user_query=user_query,
+                            user_id=user_id,
+                            search_space_id=search_space_id,
+                            top_k=top_k,
+                            search_mode=search_mode,
+                        ),
+                        timeout,
                     )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(luma_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🎯 Found {len(luma_chunks)} Luma events related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "ELASTICSEARCH_CONNECTOR":
-                    (
-                        source_object,
-                        elasticsearch_chunks,
-                    ) = await connector_service.search_elasticsearch(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
+            except TimeoutError:
+                error_message = f"{friendly_name} didn't respond within {timeout} seconds, continuing without it"
+                print(error_message)
+                if streaming_service and writer:
+                    writer(
+                        {"yield_value": streaming_service.format_error(error_message)}
                     )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(elasticsearch_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🔎 Found {len(elasticsearch_chunks)} Elasticsearch chunks related to your query"
-                                )
-                            }
-                        )
-
+                return None, []
             except Exception as e:
-                logging.error("Error in search_airtable: %s", traceback.format_exc())
-                error_message = f"Error searching connector {connector}: {e!s}"
-                print(error_message)
+                logging.error(
+                    "Error searching connector %s: %s",
+                    connector,
+                    traceback.format_exc(),
+                )
+                print(f"Error searching connector {connector}: {e!s}")
 
-                # Stream error message
+                # Stream error message and continue with other connectors
                 if streaming_service and writer:
-                    friendly_name = get_connector_friendly_name(connector)
                     writer(
                         {
                             "yield_value": streaming_service.format_error(
@@ -1331,9 +985,38 @@ async def fetch_relevant_documents(
                             )
                         }
                     )
+                return None, []
+
+        # Stream found document count as soon as this connector answers
+        stream_info(CONNECTOR_SEARCHES[connector][2].format(count=len(chunks)))
+        return source_object, chunks
+
+    searches = []
+    for i, user_query in enumerate(research_questions):
+        # Stream question being researched
+        stream_info(
+            f'🧠 Researching question {i + 1}/{len(research_questions)}: "{user_query[:100]}..."'
+        )
 
-                # Continue with other connectors on error
-                continue
+        prefetch = None
+        if search_mode == SearchMode.CHUNKS:
+            prefetch = asyncio.create_task(prefetch_local_searches(user_query))
+
+        searches.extend(
+            asyncio.create_task(search(user_query, connector, prefetch))
+            for connector in connectors_to_search
+            if connector in CONNECTOR_SEARCHES
+        )
+
+    # Results are gathered in (question, connector) order so the documents passed
+    # on don't depend on which connector answered first
+    all_raw_documents = []  # Store all raw documents
+    all_sources = []  # Store all sources
+    for source_object, chunks in await asyncio.gather(*searches):
+        # Add to sources and raw documents
+        if source_object:
+            all_sources.append(source_object)
+        all_raw_documents.extend(chunks)
 
     # Deduplicate source objects by ID before streaming
     deduplicated_sources = []
@@ -1946,6 +1629,63 @@ async def handle_qna_workflow(
         }
     )
 
+    # Replay the answer to a similar question asked against unchanged documents.
+    # Answers to follow-up turns depend on the conversation, so they aren't cached
+    answer_cache = get_qna_answer_cache()
+    answer_cache_key = None
+    if (
+        answer_cache
+        and not state.chat_history
+        and not configuration.document_ids_to_add_in_context
+    ):
+        try:
+            cached_answer, answer_cache_key = await answer_cache.lookup(
+                search_space_id=configuration.search_space_id,
+                query_text=reformulated_query,
+                connectors=configuration.connectors_to_search,
+                search_mode=configuration.search_mode.value,
+                language=configuration.language,
+            )
+        except Exception as e:
+            logging.warning(f"Q&A answer cache lookup failed: {e!s}")
+            cached_answer = None
+
+        if cached_answer:
+            writer(
+                {
+                    "yield_value": streaming_service.format_terminal_info_delta(
+                        f"⚡ Found the answer to a similar question ({cached_answer.similarity:.0%} match) asked against the same sources"
+                    )
+                }
+            )
+            if cached_answer.sources:
+                writer(
+                    {
+                        "yield_value": streaming_service.format_sources_delta(
+                            cached_answer.sources
+                        )
+                    }
+                )
+            writer(
+                {
+                    "yield_value": streaming_service.format_text_chunk(
+                        cached_answer.answer
+                    )
+                }
+            )
+            writer(
+                {
+                    "yield_value": streaming_service.format_terminal_info_delta(
+                        "🎉 Q&A answer generated successfully!"
+                    )
+                }
+            )
+            return {
+                "final_written_report": cached_answer.answer,
+                "reranked_documents": [],
+                "cached_further_questions": cached_answer.further_questions,
+            }
+
     # Fetch relevant documents for the QNA query
     writer(
         {
@@ -2117,6 +1857,7 @@ async def handle_qna_workflow(
         return {
             "final_written_report": complete_content,
             "reranked_documents": captured_reranked_documents,
+            "answer_cache_key": answer_cache_key,
         }
 
     except Exception as e:
@@ -2127,6 +1868,42 @@ async def handle_qna_workflow(
         return {"final_written_report": f"Error generating answer: {e!s}"}
 
 
+async def store_answer_in_cache(
+    state: State, further_questions: list[dict[str, Any]]
+) -> None:
+    """
+    Store a Q&A answer in the Q&A answer cache, if it was looked up there.
+
+    Args:
+        state: The current state holding the answer, its reranked documents and
+            its answer cache key
+        further_questions: Follow-up questions generated for the answer
+    """
+    answer_cache = get_qna_answer_cache()
+    answer_cache_key = getattr(state, "answer_cache_key", None)
+    reranked_documents = getattr(state, "reranked_documents", None) or []
+
+    # Answers without documents (e.g. errors) aren't worth replaying
+    if (
+        answer_cache is None
+        or answer_cache_key is None
+        or not reranked_documents
+        or not state.final_written_report
+    ):
+        return
+
+    try:
+        await answer_cache.store(
+            answer_cache_key,
+            answer=state.final_written_report,
+            document_ids=[doc.get("chunk_id") for doc in reranked_documents],
+            sources=extract_sources_from_documents(reranked_documents),
+            further_questions=further_questions,
+        )
+    except Exception as e:
+        logging.warning(f"Failed to store Q&A answer in cache: {e!s}")
+
+
 async def generate_further_questions(
     state: State, config: RunnableConfig, writer: StreamWriter
 ) -> dict[str, Any]:
@@ -2149,6 +1926,18 @@ async def generate_further_questions(
     search_space_id = configuration.search_space_id
     streaming_service = state.streaming_service
 
+    # Replay the follow-up questions of an answer from the Q&A answer cache
+    cached_further_questions = getattr(state, "cached_further_questions", None)
+    if cached_further_questions is not None:
+        writer(
+            {
+                "yield_value": streaming_service.format_further_questions_delta(
+                    cached_further_questions
+                )
+            }
+        )
+        return {"further_questions": cached_further_questions}
+
     # Get reranked documents from the state (will be populated by sub-agents)
     reranked_documents = getattr(state, "reranked_documents", None) or []
 
@@ -2278,6 +2067,8 @@ async def generate_further_questions(
 
             print(f"Successfully generated {len(further_questions)} further questions")
 
+            await store_answer_in_cache(state, further_questions)
+
             return {"further_questions": further_questions}
         else:
             # If JSON structure not found, return empty list
@@ -3,7 +3,7 @@ from typing import Any
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 
-from app.services.reranker_service import RerankerService
+from app.services.reranker_service import get_reranker_service
 
 from ..utils import (
     calculate_token_count,
@@ -38,7 +38,7 @@ async def rerank_documents(state: State, config: RunnableConfig) -> dict[str, An
         return {"reranked_documents": []}
 
     # Get reranker service from app config
-    reranker_service = RerankerService.get_reranker_instance()
+    reranker_service = get_reranker_service()
 
     # Use documents as is if no reranker service is available
     reranked_docs = documents
@@ -64,13 +64,10 @@ async def rerank_documents(state: State, config: RunnableConfig) -> dict[str, An
             ]
 
             # Rerank documents using the user's query
-            reranked_docs = reranker_service.rerank_documents(
+            reranked_docs = await reranker_service.rerank(
                 user_query + "\n" + reformulated_query, reranker_input_docs
             )
 
-            # Sort by score in descending order
-            reranked_docs.sort(key=lambda x: x.get("score", 0), reverse=True)
-
             print(
                 f"Reranked {len(reranked_docs)} documents for Q&A query: {user_query}"
             )
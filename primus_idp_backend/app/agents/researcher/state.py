@@ -35,6 +35,11 @@ class State:
     # Temporary field to hold reranked documents from sub-agents for further question generation
     reranked_documents: list[Any] | None = field(default=None)
 
+    # Q&A answer cache key of the question, set when its answer should be stored
+    answer_cache_key: Any | None = field(default=None)
+    # Follow-up questions replayed from the Q&A answer cache
+    cached_further_questions: list[Any] | None = field(default=None)
+
     # OUTPUT: Populated by agent nodes
     # Using field to explicitly mark as part of state
     final_written_report: str | None = field(default=None)
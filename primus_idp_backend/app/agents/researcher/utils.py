@@ -1,5 +1,6 @@
 from typing import Any, NamedTuple
 
+import numpy as np
 from langchain.schema import AIMessage, HumanMessage, SystemMessage
 from langchain_core.messages import BaseMessage
 from litellm import get_model_info, token_counter
@@ -132,16 +133,39 @@ def format_documents_section(
 def calculate_document_token_costs(
     documents: list[dict[str, Any]], model: str
 ) -> list[DocumentTokenInfo]:
-    """Pre-calculate token costs for each document."""
-    document_token_info = []
+    """
+    Pre-calculate token costs for each document.
 
-    for i, doc in enumerate(documents):
-        formatted_doc = format_document_for_citation(doc)
+    Token counts persisted on chunks at ingest time are reused when the model
+    shares their tokenizer, so only the short citation wrapper is tokenized for
+    them. All remaining texts are tokenized in a single batch call. Each cost
+    includes the overhead litellm counts for the message holding the document.
+    """
+    from app.services.token_counting_service import get_token_counting_service
 
-        # Calculate token count for this document
-        token_count = token_counter(
-            messages=[{"role": "user", "content": formatted_doc}], model=model
-        )
+    token_service = get_token_counting_service()
+    use_stored_counts = token_service.uses_reference_tokenizer(model)
+    message_overhead = token_service.message_overhead(model)
+
+    formatted_docs = [format_document_for_citation(doc) for doc in documents]
+    texts_to_count = []
+    for doc, formatted_doc in zip(documents, formatted_docs, strict=True):
+        if use_stored_counts and doc.get("token_count") is not None:
+            # Only the wrapper around the content needs counting
+            texts_to_count.append(format_document_for_citation({**doc, "content": ""}))
+        else:
+            texts_to_count.append(formatted_doc)
+
+    text_token_counts = token_service.count_tokens_batch(texts_to_count, model)
+
+    document_token_info = []
+    for i, (doc, formatted_doc, text_tokens) in enumerate(
+        zip(documents, formatted_docs, text_token_counts, strict=True)
+    ):
+        token_count = text_tokens + message_overhead
+        if use_stored_counts and doc.get("token_count") is not None:
+            # Margin for tokens merging across the wrapper/content boundary
+            token_count += doc["token_count"] + 2
 
         document_token_info.append(
             DocumentTokenInfo(
@@ -158,25 +182,18 @@ def calculate_document_token_costs(
 def find_optimal_documents_with_binary_search(
     document_tokens: list[DocumentTokenInfo], available_tokens: int
 ) -> list[DocumentTokenInfo]:
-    """Use binary search to find the maximum number of documents that fit within token limit."""
+    """Find the maximum number of leading documents that fit within token limit using prefix sums."""
     if not document_tokens or available_tokens <= 0:
         return []
 
-    left, right = 0, len(document_tokens)
-    optimal_docs = []
-
-    while left <= right:
-        mid = (left + right) // 2
-        current_docs = document_tokens[:mid]
-        current_token_sum = sum(doc_info.token_count for doc_info in current_docs)
-
-        if current_token_sum <= available_tokens:
-            optimal_docs = current_docs
-            left = mid + 1
-        else:
-            right = mid - 1
+    cumulative_tokens = np.cumsum(
+        [doc_info.token_count for doc_info in document_tokens], dtype=np.int64
+    )
+    document_count = int(
+        np.searchsorted(cumulative_tokens, available_tokens, side="right")
+    )
 
-    return optimal_docs
+    return document_tokens[:document_count]
 
 
 def get_model_context_window(model_name: str) -> int:
@@ -1,8 +1,9 @@
 import os
 import shutil
+import tempfile
 from pathlib import Path
 
-from chonkie import AutoEmbeddings, CodeChunker, RecursiveChunker
+from chonkie import AutoEmbeddings, RecursiveChunker
 from dotenv import load_dotenv
 from rerankers import Reranker
 
@@ -39,6 +40,11 @@ class Config:
     # Database
     DATABASE_URL = os.getenv("DATABASE_URL")
 
+    # Celery worker database pool | Shared by all tasks of a worker process
+    CELERY_DB_POOL_SIZE = int(os.getenv("CELERY_DB_POOL_SIZE", "5"))
+    CELERY_DB_MAX_OVERFLOW = int(os.getenv("CELERY_DB_MAX_OVERFLOW", "5"))
+    CELERY_DB_POOL_RECYCLE = int(os.getenv("CELERY_DB_POOL_RECYCLE", "1800"))
+
     NEXT_FRONTEND_URL = os.getenv("NEXT_FRONTEND_URL")
 
     # Auth
@@ -69,9 +75,109 @@ class Config:
     chunker_instance = RecursiveChunker(
         chunk_size=getattr(embedding_model_instance, "max_seq_length", 512)
     )
-    code_chunker_instance = CodeChunker(
-        chunk_size=getattr(embedding_model_instance, "max_seq_length", 512)
+    # Source files and markdown get their own chunkers, created per language on first use
+    CHUNKING_MAX_WORKERS = int(os.getenv("CHUNKING_MAX_WORKERS", "2"))
+
+    # Embedding batching configuration for ingestion
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    EMBEDDING_BATCH_TOKEN_BUDGET = int(
+        os.getenv("EMBEDDING_BATCH_TOKEN_BUDGET", "16384")
+    )
+    EMBEDDING_MAX_WORKERS = int(os.getenv("EMBEDDING_MAX_WORKERS", "1"))
+
+    # Query embedding cache | Set QUERY_EMBEDDING_CACHE_REDIS_URL to share it across processes
+    QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+    QUERY_EMBEDDING_CACHE_TTL = int(os.getenv("QUERY_EMBEDDING_CACHE_TTL", "3600"))
+    QUERY_EMBEDDING_CACHE_REDIS_URL = os.getenv("QUERY_EMBEDDING_CACHE_REDIS_URL")
+
+    # LLM clients | Seconds a resolved user LLM client is reused (0 = resolve on every call)
+    # and resolved (user, search space, role) entries kept per process
+    LLM_CLIENT_CACHE_TTL = float(os.getenv("LLM_CLIENT_CACHE_TTL", "300"))
+    LLM_CLIENT_CACHE_SIZE = int(os.getenv("LLM_CLIENT_CACHE_SIZE", "1024"))
+
+    # Large document summarization | Concurrent LLM calls per LLM config, optional
+    # per-model overrides ("openai/gpt-4o=8,ollama/llama3=1") and chunk summary cache
+    SUMMARY_MAX_CONCURRENCY = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "4"))
+    SUMMARY_MAX_CONCURRENCY_OVERRIDES = os.getenv("SUMMARY_MAX_CONCURRENCY_OVERRIDES")
+    SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "4096"))
+    SUMMARY_CACHE_TTL = int(os.getenv("SUMMARY_CACHE_TTL", "2592000"))
+    SUMMARY_CACHE_REDIS_URL = os.getenv("SUMMARY_CACHE_REDIS_URL")
+
+    # DOCUMENTS search mode | Chunks returned per document, most relevant first (0 = all)
+    DOCUMENT_SEARCH_MAX_CHUNKS_PER_DOCUMENT = int(
+        os.getenv("DOCUMENT_SEARCH_MAX_CHUNKS_PER_DOCUMENT", "0")
+    )
+
+    # File uploads | Bytes streamed to disk at a time
+    FILE_UPLOAD_CHUNK_SIZE = int(os.getenv("FILE_UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+    # Connector indexing | Documents and chunks written per bulk insert statement
+    CONNECTOR_BULK_BATCH_SIZE = int(os.getenv("CONNECTOR_BULK_BATCH_SIZE", "500"))
+
+    # Slack connector | Channels fetched concurrently and optional users.list prefetch
+    SLACK_MAX_CONCURRENT_CHANNELS = int(os.getenv("SLACK_MAX_CONCURRENT_CHANNELS", "4"))
+    SLACK_PREFETCH_USERS = os.getenv("SLACK_PREFETCH_USERS", "FALSE").upper() == "TRUE"
+
+    # GitHub connector | Blobs downloaded concurrently and API calls kept in reserve
+    GITHUB_MAX_CONCURRENT_DOWNLOADS = int(
+        os.getenv("GITHUB_MAX_CONCURRENT_DOWNLOADS", "8")
+    )
+    GITHUB_RATE_LIMIT_RESERVE = int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "100"))
+
+    # Notion connector | Requests per second per integration and pages fetched concurrently
+    NOTION_REQUESTS_PER_SECOND = float(os.getenv("NOTION_REQUESTS_PER_SECOND", "3"))
+    NOTION_MAX_CONCURRENT_PAGES = int(os.getenv("NOTION_MAX_CONCURRENT_PAGES", "4"))
+
+    # Gmail connector | Messages per HTTP batch request (max 100) and batches in flight
+    GMAIL_BATCH_SIZE = int(os.getenv("GMAIL_BATCH_SIZE", "50"))
+    GMAIL_MAX_CONCURRENT_BATCHES = int(os.getenv("GMAIL_MAX_CONCURRENT_BATCHES", "2"))
+
+    # Connector leases | Redis URL (empty disables leases), lease time-to-live, parallel
+    # syncs per user and delay before retrying a sync over that limit
+    CONNECTOR_LEASE_REDIS_URL = os.getenv(
+        "CONNECTOR_LEASE_REDIS_URL",
+        os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"),
+    )
+    CONNECTOR_LEASE_TTL_SECONDS = int(os.getenv("CONNECTOR_LEASE_TTL_SECONDS", "120"))
+    CONNECTOR_MAX_CONCURRENT_PER_USER = int(
+        os.getenv("CONNECTOR_MAX_CONCURRENT_PER_USER", "2")
     )
+    CONNECTOR_LEASE_RETRY_SECONDS = int(
+        os.getenv("CONNECTOR_LEASE_RETRY_SECONDS", "60")
+    )
+
+    # Periodic indexing | Connectors claimed per schedule check and max dispatch delay
+    SCHEDULE_CHECKER_BATCH_SIZE = int(os.getenv("SCHEDULE_CHECKER_BATCH_SIZE", "500"))
+    SCHEDULE_CHECKER_JITTER_SECONDS = int(
+        os.getenv("SCHEDULE_CHECKER_JITTER_SECONDS", "60")
+    )
+
+    # Elasticsearch connector | Sliced point in time readers, hits per page and keep alive
+    ELASTICSEARCH_SLICES = int(os.getenv("ELASTICSEARCH_SLICES", "4"))
+    ELASTICSEARCH_PAGE_SIZE = int(os.getenv("ELASTICSEARCH_PAGE_SIZE", "500"))
+    ELASTICSEARCH_PIT_KEEP_ALIVE = os.getenv("ELASTICSEARCH_PIT_KEEP_ALIVE", "5m")
+
+    # Research | Concurrent local (database) searches, concurrent searches per web
+    # search API and seconds each connector search may take (0 = no limit)
+    RESEARCH_LOCAL_SEARCH_CONCURRENCY = int(
+        os.getenv("RESEARCH_LOCAL_SEARCH_CONCURRENCY", "4")
+    )
+    RESEARCH_WEB_SEARCH_CONCURRENCY = int(
+        os.getenv("RESEARCH_WEB_SEARCH_CONCURRENCY", "2")
+    )
+    RESEARCH_CONNECTOR_TIMEOUT_SECONDS = float(
+        os.getenv("RESEARCH_CONNECTOR_TIMEOUT_SECONDS", "20")
+    )
+
+    # Q&A answer cache | Opt-in reuse of answers to similar questions against unchanged
+    # documents, minimum cosine similarity between the questions and answer lifetime
+    QNA_ANSWER_CACHE_ENABLED = (
+        os.getenv("QNA_ANSWER_CACHE_ENABLED", "FALSE").upper() == "TRUE"
+    )
+    QNA_ANSWER_CACHE_SIMILARITY = float(
+        os.getenv("QNA_ANSWER_CACHE_SIMILARITY", "0.95")
+    )
+    QNA_ANSWER_CACHE_TTL = int(os.getenv("QNA_ANSWER_CACHE_TTL", "86400"))
 
     # Reranker's Configuration | Pinecode, Cohere etc. Read more at https://github.com/AnswerDotAI/rerankers?tab=readme-ov-file#usage
     RERANKERS_MODEL_NAME = os.getenv("RERANKERS_MODEL_NAME")
@@ -80,6 +186,11 @@ class Config:
         model_name=RERANKERS_MODEL_NAME,
         model_type=RERANKERS_MODEL_TYPE,
     )
+    # Reranker | Cached (model, query, chunk) scores and time concurrent requests wait to be batched
+    RERANKER_SCORE_CACHE_SIZE = int(os.getenv("RERANKER_SCORE_CACHE_SIZE", "10000"))
+    RERANKER_BATCH_WINDOW_MS = int(os.getenv("RERANKER_BATCH_WINDOW_MS", "5"))
+    # Reranker | Candidates kept by RRF/vector score before the reranker scores them (0 = all)
+    RERANKER_PREFILTER_TOP_K = int(os.getenv("RERANKER_PREFILTER_TOP_K", "0"))
 
     # OAuth JWT
     SECRET_KEY = os.getenv("SECRET_KEY")
@@ -95,10 +206,27 @@ class Config:
         # LlamaCloud API Key
         LLAMA_CLOUD_API_KEY = os.getenv("LLAMA_CLOUD_API_KEY")
 
+    elif ETL_SERVICE == "DOCLING":
+        # Docling conversion pool | Worker processes (0 converts in a thread), files
+        # converting or waiting before new ones are rejected, timeout in seconds per
+        # file or page range and PDF page range size for parallel splits
+        DOCLING_POOL_WORKERS = int(os.getenv("DOCLING_POOL_WORKERS", "2"))
+        DOCLING_POOL_MAX_PENDING = int(os.getenv("DOCLING_POOL_MAX_PENDING", "8"))
+        DOCLING_CONVERSION_TIMEOUT = int(os.getenv("DOCLING_CONVERSION_TIMEOUT", "900"))
+        DOCLING_PAGES_PER_SPLIT = int(os.getenv("DOCLING_PAGES_PER_SPLIT", "25"))
+
     elif ETL_SERVICE == "CHANDRA":
         # Chandra Configuration
         CHANDRA_METHOD = os.getenv("CHANDRA_METHOD", "hf")
 
+    # ETL result cache | Directory (empty disables), size limit in bytes and parser
+    # version mixed into keys (bump it to invalidate results after a parser upgrade)
+    ETL_CACHE_DIR = os.getenv(
+        "ETL_CACHE_DIR", os.path.join(tempfile.gettempdir(), "primus_etl_cache")
+    )
+    ETL_CACHE_MAX_BYTES = int(os.getenv("ETL_CACHE_MAX_BYTES", str(2 * 1024**3)))
+    ETL_CACHE_PARSER_VERSION = os.getenv("ETL_CACHE_PARSER_VERSION", "1")
+
     # Firecrawl API Key
     FIRECRAWL_API_KEY = os.getenv("FIRECRAWL_API_KEY", None)
 
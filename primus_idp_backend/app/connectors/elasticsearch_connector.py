@@ -234,6 +234,91 @@ class ElasticsearchConnector:
             logger.error(f"Scroll search failed: {e}", exc_info=True)
             raise
 
+    async def open_point_in_time(
+        self, index: str | list[str], keep_alive: str = "5m"
+    ) -> str:
+        """
+        Open a point in time, a consistent view of indices for paginated searches
+
+        Args:
+            index: Elasticsearch index name or list of indices
+            keep_alive: How long the point in time is kept between requests
+
+        Returns:
+            Point in time ID
+        """
+        response = await self.client.open_point_in_time(
+            index=index, keep_alive=keep_alive
+        )
+        return response["id"]
+
+    async def close_point_in_time(self, pit_id: str) -> None:
+        """
+        Close a point in time opened with open_point_in_time
+
+        Args:
+            pit_id: Point in time ID
+        """
+        try:
+            await self.client.close_point_in_time(id=pit_id)
+        except Exception:
+            logger.debug("Failed to close point in time (non-fatal)")
+
+    async def sliced_search(
+        self,
+        pit_id: str,
+        query: dict[str, Any],
+        slice_id: int = 0,
+        max_slices: int = 1,
+        size: int = 500,
+        keep_alive: str = "5m",
+        fields: list[str] | None = None,
+    ):
+        """
+        Page through one slice of a point in time with search_after
+
+        Slices of the same point in time are disjoint, so they can be consumed
+        concurrently to read a large index in parallel.
+
+        Args:
+            pit_id: Point in time ID from open_point_in_time
+            query: Elasticsearch query DSL
+            slice_id: Slice to read, from 0 to max_slices - 1
+            max_slices: Number of slices the results are split into
+            size: Number of hits per page
+            keep_alive: How long the point in time is kept between requests
+            fields: List of fields to include in response
+
+        Yields:
+            Pages of document hits from Elasticsearch
+        """
+        search_after = None
+        while True:
+            search_body: dict[str, Any] = {
+                "query": query,
+                "size": size,
+                "pit": {"id": pit_id, "keep_alive": keep_alive},
+                # Index order, the cheapest sort for search_after pagination
+                "sort": ["_shard_doc"],
+            }
+            if max_slices > 1:
+                search_body["slice"] = {"id": slice_id, "max": max_slices}
+            if fields:
+                search_body["_source"] = fields
+            if search_after:
+                search_body["search_after"] = search_after
+
+            response = await self.client.search(body=search_body)
+
+            # The point in time ID may change between requests
+            pit_id = response.get("pit_id", pit_id)
+            hits = response.get("hits", {}).get("hits", [])
+            if not hits:
+                return
+
+            yield hits
+            search_after = hits[-1]["sort"]
+
     async def count_documents(
         self, index: str | list[str], query: dict[str, Any] | None = None
     ) -> int:
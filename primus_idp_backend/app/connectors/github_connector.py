@@ -109,6 +109,57 @@ class GitHubConnector:
         except Exception as e:
             logger.error(f"Failed to initialize GitHub client: {e}")
             raise e
+        self._repositories: dict[str, Any] = {}
+
+    @staticmethod
+    def _get_file_type(file_name: str) -> str | None:
+        """Classify a file as 'code' or 'doc' by its extension, or None if irrelevant."""
+        file_extension = (
+            "." + file_name.split(".")[-1].lower() if "." in file_name else ""
+        )
+        if file_extension in CODE_EXTENSIONS:
+            return "code"
+        if file_extension in DOC_EXTENSIONS:
+            return "doc"
+        return None
+
+    @staticmethod
+    def _decode_content(encoded_content: str, label: str) -> str | None:
+        """Decode base64 file content as UTF-8, falling back to latin-1."""
+        try:
+            return base64.b64decode(encoded_content).decode("utf-8")
+        except UnicodeDecodeError:
+            logger.warning(f"Could not decode {label} as UTF-8. Trying with 'latin-1'.")
+            try:
+                # Try a fallback encoding
+                return base64.b64decode(encoded_content).decode("latin-1")
+            except Exception as decode_err:
+                logger.error(
+                    f"Failed to decode {label} with fallback encoding: {decode_err}"
+                )
+                return None  # Give up if fallback fails
+
+    def _get_repository(self, repo_full_name: str):
+        """Fetch a repository once and reuse it for later calls."""
+        if repo_full_name not in self._repositories:
+            owner, repo_name = repo_full_name.split("/")
+            self._repositories[repo_full_name] = self.gh.repository(owner, repo_name)
+        return self._repositories[repo_full_name]
+
+    def get_rate_limit_remaining(self) -> int | None:
+        """
+        Fetches the number of core API calls left in the current rate limit window.
+
+        Checking the rate limit does not count against it.
+
+        Returns:
+            Remaining core API calls, or None if the rate limit could not be read.
+        """
+        try:
+            return self.gh.rate_limit()["resources"]["core"]["remaining"]
+        except Exception as e:
+            logger.warning(f"Failed to read GitHub rate limit: {e}")
+            return None
 
     def get_user_repositories(self) -> list[dict[str, Any]]:
         """Fetches repositories accessible by the authenticated user."""
@@ -136,7 +187,10 @@ class GitHubConnector:
             return []  # Return empty list on error
 
     def get_repository_files(
-        self, repo_full_name: str, path: str = ""
+        self,
+        repo_full_name: str,
+        path: str = "",
+        failed_paths: list[str] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Recursively fetches details of relevant files (code, docs) within a repository path.
@@ -144,6 +198,8 @@ class GitHubConnector:
         Args:
             repo_full_name: The full name of the repository (e.g., 'owner/repo').
             path: The starting path within the repository (default is root).
+            failed_paths: Optional list the paths that could not be listed are
+                appended to, telling callers the returned list is partial.
 
         Returns:
             A list of dictionaries, each containing file details (path, sha, url, size).
@@ -174,27 +230,23 @@ class GitHubConnector:
                     # Recursively fetch contents of subdirectory
                     files_list.extend(
                         self.get_repository_files(
-                            repo_full_name, path=content_item.path
+                            repo_full_name,
+                            path=content_item.path,
+                            failed_paths=failed_paths,
                         )
                     )
                 elif content_item.type == "file":
                     # Check if the file extension is relevant and size is within limits
-                    file_extension = (
-                        "." + content_item.name.split(".")[-1].lower()
-                        if "." in content_item.name
-                        else ""
-                    )
-                    is_code = file_extension in CODE_EXTENSIONS
-                    is_doc = file_extension in DOC_EXTENSIONS
+                    file_type = self._get_file_type(content_item.name)
 
-                    if (is_code or is_doc) and content_item.size <= MAX_FILE_SIZE:
+                    if file_type and content_item.size <= MAX_FILE_SIZE:
                         files_list.append(
                             {
                                 "path": content_item.path,
                                 "sha": content_item.sha,
                                 "url": content_item.html_url,
                                 "size": content_item.size,
-                                "type": "code" if is_code else "doc",
+                                "type": file_type,
                             }
                         )
                     elif content_item.size > MAX_FILE_SIZE:
@@ -208,11 +260,15 @@ class GitHubConnector:
 
         except (NotFoundError, ForbiddenError) as e:
             logger.warning(f"Cannot access path '{path}' in '{repo_full_name}': {e}")
+            if failed_paths is not None:
+                failed_paths.append(path)
         except Exception as e:
             logger.error(
                 f"Failed to get files for {repo_full_name} at path '{path}': {e}"
             )
             # Return what we have collected so far in case of partial failure
+            if failed_paths is not None:
+                failed_paths.append(path)
 
         return files_list
 
@@ -258,26 +314,10 @@ class GitHubConnector:
 
             # Content is base64 encoded
             if content_item.content:
-                try:
-                    decoded_content = base64.b64decode(content_item.content).decode(
-                        "utf-8"
-                    )
-                    return decoded_content
-                except UnicodeDecodeError:
-                    logger.warning(
-                        f"Could not decode file '{file_path}' in '{repo_full_name}' as UTF-8. Trying with 'latin-1'."
-                    )
-                    try:
-                        # Try a fallback encoding
-                        decoded_content = base64.b64decode(content_item.content).decode(
-                            "latin-1"
-                        )
-                        return decoded_content
-                    except Exception as decode_err:
-                        logger.error(
-                            f"Failed to decode file '{file_path}' with fallback encoding: {decode_err}"
-                        )
-                        return None  # Give up if fallback fails
+                return self._decode_content(
+                    content_item.content,
+                    f"file '{file_path}' in '{repo_full_name}'",
+                )
             else:
                 logger.warning(
                     f"No content returned for file '{file_path}' in '{repo_full_name}'. It might be empty."
@@ -295,3 +335,122 @@ class GitHubConnector:
             )
             return None
 
+    def get_repository_tree(
+        self, repo_full_name: str, branch: str | None = None
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """
+        Lists relevant files (code, docs) of a branch with one recursive Git Trees API call.
+
+        Unlike get_repository_files, which makes one API call per directory, the whole
+        tree is fetched at once. If GitHub truncates the tree because the repository
+        is too large, the files are listed with get_repository_files instead.
+
+        Args:
+            repo_full_name: The full name of the repository (e.g., 'owner/repo').
+            branch: The branch to list (default is the repository's default branch).
+
+        Returns:
+            Tuple of (files, complete). Files is a list of dictionaries, each containing
+            file details (path, sha, url, size, type), in the format of
+            get_repository_files. Complete is False when any part of the repository
+            could not be listed, in which case the list must not be used to tell which
+            files were removed. Returns ([], False) on error.
+        """
+        try:
+            repo = self._get_repository(repo_full_name)
+            if not repo:
+                logger.warning(f"Repository '{repo_full_name}' not found.")
+                return [], False
+            branch = branch or repo.default_branch
+
+            tree = repo.tree(branch, recursive=True)
+            if tree.as_dict().get("truncated"):
+                logger.warning(
+                    f"Tree of '{repo_full_name}' is truncated, listing files per directory instead."
+                )
+                failed_paths: list[str] = []
+                files_list = self.get_repository_files(
+                    repo_full_name, failed_paths=failed_paths
+                )
+                if failed_paths:
+                    logger.warning(
+                        f"Could not list {len(failed_paths)} directories of '{repo_full_name}', "
+                        "the file listing is partial."
+                    )
+                return files_list, not failed_paths
+
+            files_list = []
+            for entry in tree.tree:
+                if entry.type != "blob":
+                    continue
+
+                # Skip files below irrelevant directories
+                *directories, file_name = entry.path.split("/")
+                if any(directory in self.SKIPPED_DIRS for directory in directories):
+                    continue
+
+                file_type = self._get_file_type(file_name)
+                if not file_type:
+                    continue
+                if (entry.size or 0) > MAX_FILE_SIZE:
+                    logger.debug(
+                        f"Skipping large file: {entry.path} ({entry.size} bytes)"
+                    )
+                    continue
+
+                files_list.append(
+                    {
+                        "path": entry.path,
+                        "sha": entry.sha,
+                        "url": f"{repo.html_url}/blob/{branch}/{entry.path}",
+                        "size": entry.size,
+                        "type": file_type,
+                    }
+                )
+            return files_list, True
+
+        except (NotFoundError, ForbiddenError) as e:
+            logger.warning(f"Cannot access tree of '{repo_full_name}': {e}")
+        except Exception as e:
+            logger.error(f"Failed to get tree for {repo_full_name}: {e}")
+        return [], False
+
+    def get_blob_content(self, repo_full_name: str, blob_sha: str) -> str | None:
+        """
+        Fetches the decoded content of a file by its blob SHA.
+
+        Args:
+            repo_full_name: The full name of the repository (e.g., 'owner/repo').
+            blob_sha: The SHA of the file's blob, as listed by get_repository_tree.
+
+        Returns:
+            The decoded file content as a string, or None if fetching fails.
+        """
+        try:
+            repo = self._get_repository(repo_full_name)
+            if not repo:
+                logger.warning(
+                    f"Repository '{repo_full_name}' not found when fetching blob '{blob_sha}'."
+                )
+                return None
+
+            blob = repo.blob(blob_sha)
+            if not blob.content:
+                return ""  # Return empty string for empty files
+            if blob.encoding != "base64":
+                return blob.content
+            return self._decode_content(
+                blob.content, f"blob '{blob_sha}' in '{repo_full_name}'"
+            )
+
+        except (NotFoundError, ForbiddenError) as e:
+            logger.warning(
+                f"Cannot access blob '{blob_sha}' in '{repo_full_name}': {e}"
+            )
+            return None
+        except Exception as e:
+            logger.error(
+                f"Failed to get content for blob '{blob_sha}' in '{repo_full_name}': {e}"
+            )
+            return None
+
@@ -4,14 +4,19 @@ A module for retrieving emails from Gmail using Google OAuth credentials.
 Allows fetching emails from Gmail mailbox using Google OAuth credentials.
 """
 
+import asyncio
 import base64
 import json
+import logging
 import re
 from typing import Any
 
+import httplib2
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm.attributes import flag_modified
@@ -21,6 +26,24 @@ from app.db import (
     SearchSourceConnectorType,
 )
 
+logger = logging.getLogger(__name__)
+
+# Gmail accepts at most 100 calls per HTTP batch request
+GMAIL_MAX_BATCH_SIZE = 100
+
+# Statuses of batched calls that are retried (rate limits and server errors)
+GMAIL_RETRYABLE_STATUSES = {403, 429, 500, 503}
+
+
+def _is_retryable_error(error: Exception) -> bool:
+    """Check whether a failed Gmail call should be retried."""
+    if not isinstance(error, HttpError):
+        return True  # Connection errors
+    if error.resp.status == 403:
+        # Only quota errors are retried, not permission errors
+        return "ratelimitexceeded" in str(error).lower()
+    return error.resp.status in GMAIL_RETRYABLE_STATUSES
+
 
 class GoogleGmailConnector:
     """Class for retrieving emails from Gmail using Google OAuth credentials."""
@@ -108,7 +131,11 @@ class GoogleGmailConnector:
                         raise RuntimeError(
                             "GMAIL connector not found; cannot persist refreshed token."
                         )
-                    connector.config = json.loads(self._credentials.to_json())
+                    # Keep sync state (e.g. the history ID) stored next to the credentials
+                    connector.config = {
+                        **(connector.config or {}),
+                        **json.loads(self._credentials.to_json()),
+                    }
                     flag_modified(connector, "config")
                     await self._session.commit()
             except Exception as e:
@@ -145,7 +172,9 @@ class GoogleGmailConnector:
         """
         try:
             service = await self._get_service()
-            profile = service.users().getProfile(userId="me").execute()
+            profile = await asyncio.to_thread(
+                service.users().getProfile(userId="me").execute
+            )
 
             return {
                 "email_address": profile.get("emailAddress"),
@@ -190,7 +219,9 @@ class GoogleGmailConnector:
                 request_params["labelIds"] = label_ids
 
             # Get messages list
-            result = service.users().messages().list(**request_params).execute()
+            result = await asyncio.to_thread(
+                service.users().messages().list(**request_params).execute
+            )
             messages = result.get("messages", [])
 
             return messages, None
@@ -212,11 +243,11 @@ class GoogleGmailConnector:
             service = await self._get_service()
 
             # Get full message details
-            message = (
+            message = await asyncio.to_thread(
                 service.users()
                 .messages()
                 .get(userId="me", id=message_id, format="full")
-                .execute()
+                .execute
             )
 
             return message, None
@@ -224,11 +255,240 @@ class GoogleGmailConnector:
         except Exception as e:
             return {}, f"Error fetching message details: {e!s}"
 
+    async def list_message_ids(
+        self, query: str = "", max_results: int = 1000
+    ) -> tuple[list[str], str | None]:
+        """
+        List the IDs of messages matching a query, following nextPageToken.
+
+        Args:
+            query: Gmail search query (e.g., "after:2024/01/01")
+            max_results: Maximum number of message IDs to return
+
+        Returns:
+            Tuple containing (message IDs, error message or None)
+        """
+        try:
+            service = await self._get_service()
+
+            message_ids: list[str] = []
+            page_token = None
+            while len(message_ids) < max_results:
+                request_params = {
+                    "userId": "me",
+                    "maxResults": min(500, max_results - len(message_ids)),
+                    "includeSpamTrash": False,
+                }
+                if query:
+                    request_params["q"] = query
+                if page_token:
+                    request_params["pageToken"] = page_token
+
+                result = await asyncio.to_thread(
+                    service.users().messages().list(**request_params).execute
+                )
+                message_ids.extend(
+                    message["id"] for message in result.get("messages", [])
+                )
+
+                page_token = result.get("nextPageToken")
+                if not page_token:
+                    break
+
+            return message_ids, None
+
+        except Exception as e:
+            return [], f"Error listing messages: {e!s}"
+
+    async def get_messages_batch(
+        self,
+        message_ids: list[str],
+        batch_size: int = 50,
+        max_concurrent_batches: int = 2,
+        max_retries: int = 3,
+    ) -> tuple[list[dict[str, Any]], list[str]]:
+        """
+        Fetch the full details of many messages with HTTP batch requests.
+
+        Batches run concurrently on worker threads, each with its own HTTP
+        connection. Calls rejected by rate limits or server errors are retried
+        with exponential backoff; messages that no longer exist are skipped.
+
+        Args:
+            message_ids: IDs of the messages to fetch
+            batch_size: Number of messages per batch request (at most 100)
+            max_concurrent_batches: Maximum number of batch requests in flight
+            max_retries: Number of retries for failed messages
+
+        Returns:
+            Tuple containing (message details in input order, IDs of messages that
+            could not be fetched after all retries)
+        """
+        service = await self._get_service()
+        credentials = await self._get_credentials()
+        batch_size = max(1, min(batch_size, GMAIL_MAX_BATCH_SIZE))
+        semaphore = asyncio.Semaphore(max(1, max_concurrent_batches))
+
+        def execute_batch(
+            batch_ids: list[str],
+        ) -> tuple[dict[str, Any], dict[str, Exception]]:
+            results: dict[str, Any] = {}
+            errors: dict[str, Exception] = {}
+
+            def callback(request_id, response, exception):
+                if exception is None:
+                    results[request_id] = response
+                else:
+                    errors[request_id] = exception
+
+            batch = service.new_batch_http_request(callback=callback)
+            for message_id in batch_ids:
+                batch.add(
+                    service.users()
+                    .messages()
+                    .get(userId="me", id=message_id, format="full"),
+                    request_id=message_id,
+                )
+            # httplib2 connections are not thread safe, so each batch gets its own
+            batch.execute(http=AuthorizedHttp(credentials, http=httplib2.Http()))
+            return results, errors
+
+        async def run_batch(
+            batch_ids: list[str],
+        ) -> tuple[dict[str, Any], dict[str, Exception]]:
+            async with semaphore:
+                try:
+                    return await asyncio.to_thread(execute_batch, batch_ids)
+                except Exception as e:
+                    return {}, dict.fromkeys(batch_ids, e)
+
+        fetched: dict[str, Any] = {}
+        pending = list(dict.fromkeys(message_ids))
+        for attempt in range(max_retries + 1):
+            if attempt:
+                await asyncio.sleep(2**attempt)
+
+            outcomes = await asyncio.gather(
+                *(
+                    run_batch(pending[start : start + batch_size])
+                    for start in range(0, len(pending), batch_size)
+                )
+            )
+
+            pending = []
+            for results, errors in outcomes:
+                fetched.update(results)
+                for message_id, error in errors.items():
+                    if _is_retryable_error(error):
+                        pending.append(message_id)
+                    else:
+                        logger.warning(
+                            f"Skipping Gmail message {message_id}: {error!s}"
+                        )
+            if not pending:
+                break
+
+        if pending:
+            logger.warning(
+                f"Failed to fetch {len(pending)} Gmail messages after {max_retries} retries"
+            )
+
+        return [
+            fetched[message_id] for message_id in message_ids if message_id in fetched
+        ], pending
+
+    async def get_history_changes(
+        self, start_history_id: str
+    ) -> tuple[dict[str, Any] | None, str | None]:
+        """
+        Fetch the messages changed since a mailbox history ID with the History API.
+
+        Args:
+            start_history_id: History ID stored by the previous sync
+
+        Returns:
+            Tuple containing (changes dict, error message or None). The changes dict
+            has "changed_ids" (added or relabeled messages), "deleted_ids" (deleted,
+            trashed or spam messages) and "history_id" (the mailbox's current history
+            ID). Changes are None if the start history ID is too old to be used, in
+            which case a full sync is needed.
+        """
+        try:
+            service = await self._get_service()
+
+            # Latest state of every message touched since the start history ID
+            message_states: dict[str, bool] = {}
+            history_id = start_history_id
+            page_token = None
+            while True:
+                request_params = {
+                    "userId": "me",
+                    "startHistoryId": start_history_id,
+                    "historyTypes": [
+                        "messageAdded",
+                        "messageDeleted",
+                        "labelAdded",
+                        "labelRemoved",
+                    ],
+                    "maxResults": 500,
+                }
+                if page_token:
+                    request_params["pageToken"] = page_token
+
+                result = await asyncio.to_thread(
+                    service.users().history().list(**request_params).execute
+                )
+
+                for record in result.get("history", []):
+                    for change_type in (
+                        "messagesAdded",
+                        "labelsAdded",
+                        "labelsRemoved",
+                    ):
+                        for change in record.get(change_type, []):
+                            message = change.get("message", {})
+                            label_ids = set(message.get("labelIds", []))
+                            message_states[message["id"]] = not (
+                                label_ids & {"SPAM", "TRASH"}
+                            )
+                    for change in record.get("messagesDeleted", []):
+                        message_states[change["message"]["id"]] = False
+
+                history_id = result.get("historyId", history_id)
+                page_token = result.get("nextPageToken")
+                if not page_token:
+                    break
+
+            return {
+                "changed_ids": [
+                    message_id
+                    for message_id, exists in message_states.items()
+                    if exists
+                ],
+                "deleted_ids": [
+                    message_id
+                    for message_id, exists in message_states.items()
+                    if not exists
+                ],
+                "history_id": history_id,
+            }, None
+
+        except HttpError as e:
+            if e.resp.status == 404:
+                # The history ID is older than the history Gmail keeps
+                return None, None
+            return None, f"Error fetching mailbox history: {e!s}"
+        except Exception as e:
+            return None, f"Error fetching mailbox history: {e!s}"
+
     async def get_recent_messages(
         self,
         max_results: int = 50,
         start_date: str | None = None,
         end_date: str | None = None,
+        batch_size: int = 50,
+        max_concurrent_batches: int = 2,
+        failed_ids: list[str] | None = None,
     ) -> tuple[list[dict[str, Any]], str | None]:
         """
         Fetch recent messages from Gmail within specified date range.
@@ -236,6 +496,10 @@ class GoogleGmailConnector:
             max_results: Maximum number of messages to fetch (default: 50)
             start_date: Start date in YYYY-MM-DD format (default: 30 days ago)
             end_date: End date in YYYY-MM-DD format (default: today)
+            batch_size: Number of messages fetched per batch request
+            max_concurrent_batches: Maximum number of batch requests in flight
+            failed_ids: If given, receives the IDs of messages that could not be
+                fetched after all retries
         Returns:
             Tuple containing (messages list with details, error message or None)
         """
@@ -264,23 +528,22 @@ class GoogleGmailConnector:
 
             query = " ".join(query_parts)
 
-            # Get messages list
-            messages_list, error = await self.get_messages_list(
-                max_results=max_results, query=query
+            # Get message IDs, following pagination
+            message_ids, error = await self.list_message_ids(
+                query=query, max_results=max_results
             )
 
             if error:
                 return [], error
 
-            # Get detailed information for each message
-            detailed_messages = []
-            for msg in messages_list:
-                message_details, detail_error = await self.get_message_details(
-                    msg["id"]
-                )
-                if detail_error:
-                    continue  # Skip messages that can't be fetched
-                detailed_messages.append(message_details)
+            # Get detailed information for the messages in batch requests
+            detailed_messages, batch_failed_ids = await self.get_messages_batch(
+                message_ids,
+                batch_size=batch_size,
+                max_concurrent_batches=max_concurrent_batches,
+            )
+            if failed_ids is not None:
+                failed_ids.extend(batch_failed_ids)
 
             return detailed_messages, None
 
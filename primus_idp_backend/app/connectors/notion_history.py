@@ -1,15 +1,66 @@
-from notion_client import AsyncClient
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any
+
+from notion_client import APIResponseError, AsyncClient
+
+from app.utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Notion allows an average of three requests per second per integration.
+# See https://developers.notion.com/reference/request-limits
+NOTION_REQUESTS_PER_SECOND = 3
+
+_rate_limiters: dict[str, TokenBucket] = {}
+
+
+def get_notion_rate_limiter(
+    token: str, requests_per_second: float = NOTION_REQUESTS_PER_SECOND
+) -> TokenBucket:
+    """
+    Get the rate limiter shared by every client of an integration in this process.
+
+    Args:
+        token: Notion integration token
+        requests_per_second: Sustained number of requests allowed per second
+
+    Returns:
+        TokenBucket: The integration's rate limiter
+    """
+    integration_key = hashlib.sha256(token.encode()).hexdigest()
+    if integration_key not in _rate_limiters:
+        _rate_limiters[integration_key] = TokenBucket(requests_per_second * 60)
+    return _rate_limiters[integration_key]
+
+
+def _parse_notion_time(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp of the Notion API."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
 
 
 class NotionHistoryConnector:
-    def __init__(self, token):
+    def __init__(
+        self,
+        token,
+        requests_per_second: float = NOTION_REQUESTS_PER_SECOND,
+        max_concurrent_pages: int = 4,
+    ):
         """
         Initialize the NotionPageFetcher with a token.
 
         Args:
             token (str): Notion integration token
+            requests_per_second (float): Requests per second shared by all clients
+                of the integration
+            max_concurrent_pages (int): Maximum number of pages whose blocks are
+                fetched at the same time
         """
         self.notion = AsyncClient(auth=token)
+        self.rate_limiter = get_notion_rate_limiter(token, requests_per_second)
+        self.max_concurrent_pages = max(1, max_concurrent_pages)
 
     async def close(self):
         """Close the async client connection."""
@@ -23,62 +74,124 @@ class NotionHistoryConnector:
         """Async context manager exit."""
         await self.close()
 
-    async def get_all_pages(self, start_date=None, end_date=None):
+    async def _request(self, endpoint, **kwargs) -> dict[str, Any]:
         """
-        Fetches all pages shared with your integration and their content.
+        Call a Notion API endpoint within the integration's rate limit.
+
+        Rate-limited calls wait for the Retry-After duration and are retried.
 
         Args:
-            start_date (str, optional): ISO 8601 date string (e.g., "2023-01-01T00:00:00Z")
-            end_date (str, optional): ISO 8601 date string (e.g., "2023-12-31T23:59:59Z")
+            endpoint: Bound method of the Notion client, e.g. self.notion.search
+            **kwargs: Arguments for the endpoint
 
         Returns:
-            list: List of dictionaries containing page data
+            dict: The Notion API response
         """
-        # Build the filter for the search
-        # Note: Notion API requires specific filter structure
-        search_params = {}
+        while True:
+            await self.rate_limiter.acquire()
+            try:
+                return await endpoint(**kwargs)
+            except APIResponseError as e:
+                if e.status != 429:
+                    raise
+
+                headers = getattr(e, "headers", None) or {}
+                retry_after_str = headers.get("retry-after")
+                wait_time = 1  # Default
+                if retry_after_str and str(retry_after_str).isdigit():
+                    wait_time = int(retry_after_str)
+                logger.warning(
+                    f"Rate limited by Notion. Retrying after {wait_time} seconds."
+                )
+                self.rate_limiter.block_for(wait_time)
 
-        # Filter for pages only (not databases)
-        search_params["filter"] = {"value": "page", "property": "object"}
+    async def search_pages(self, start_date=None, end_date=None):
+        """
+        Lists all pages shared with your integration, without their content.
 
-        # Add date filters if provided
-        if start_date or end_date:
-            date_filter = {}
+        Search results are followed through every result page, newest edits first,
+        and pages last edited outside the date range are left out.
 
-            if start_date:
-                date_filter["on_or_after"] = start_date
+        Args:
+            start_date (str, optional): ISO 8601 date string (e.g., "2023-01-01T00:00:00Z")
+            end_date (str, optional): ISO 8601 date string (e.g., "2023-12-31T23:59:59Z")
 
-            if end_date:
-                date_filter["on_or_before"] = end_date
+        Returns:
+            list: List of Notion page objects
+        """
+        start = _parse_notion_time(start_date) if start_date else None
+        end = _parse_notion_time(end_date) if end_date else None
 
-            # Add the date filter to the search params
-            if date_filter:
-                search_params["sort"] = {
-                    "direction": "descending",
-                    "timestamp": "last_edited_time",
-                }
+        pages = []
+        cursor = None
+        while True:
+            # The search endpoint has no date filter, so results are sorted by
+            # edit time and the listing stops at the first page that is too old
+            search_params = {
+                "filter": {"value": "page", "property": "object"},
+                "sort": {"direction": "descending", "timestamp": "last_edited_time"},
+                "page_size": 100,
+            }
+            if cursor:
+                search_params["start_cursor"] = cursor
+            response = await self._request(self.notion.search, **search_params)
+
+            for page in response["results"]:
+                last_edited = _parse_notion_time(page["last_edited_time"])
+                if start and last_edited < start:
+                    return pages
+                if end and last_edited > end:
+                    continue
+                pages.append(page)
+
+            if not response.get("has_more"):
+                return pages
+            cursor = response["next_cursor"]
+
+    async def get_pages_content(self, pages):
+        """
+        Fetches the content of several pages concurrently.
 
-        # First, get a list of all pages the integration has access to
-        search_results = await self.notion.search(**search_params)
+        Pages whose content could not be fetched are logged and left out.
 
-        pages = search_results["results"]
-        all_page_data = []
+        Args:
+            pages (list): Notion page objects, as returned by search_pages
 
-        for page in pages:
-            page_id = page["id"]
+        Returns:
+            list: List of dictionaries containing page data
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_pages)
 
-            # Get detailed page information
-            page_content = await self.get_page_content(page_id)
+        async def fetch_page(page):
+            async with semaphore:
+                try:
+                    page_content = await self.get_page_content(page["id"])
+                except Exception as e:
+                    logger.error(f"Failed to fetch Notion page {page['id']}: {e!s}")
+                    return None
+            return {
+                "page_id": page["id"],
+                "title": self.get_page_title(page),
+                "content": page_content,
+                "last_edited_time": page.get("last_edited_time"),
+            }
+
+        results = await asyncio.gather(*(fetch_page(page) for page in pages))
+        return [page_data for page_data in results if page_data is not None]
 
-            all_page_data.append(
-                {
-                    "page_id": page_id,
-                    "title": self.get_page_title(page),
-                    "content": page_content,
-                }
-            )
+    async def get_all_pages(self, start_date=None, end_date=None):
+        """
+        Fetches all pages shared with your integration and their content.
 
-        return all_page_data
+        Args:
+            start_date (str, optional): ISO 8601 date string (e.g., "2023-01-01T00:00:00Z")
+            end_date (str, optional): ISO 8601 date string (e.g., "2023-12-31T23:59:59Z")
+
+        Returns:
+            list: List of dictionaries containing page data
+        """
+        pages = await self.search_pages(start_date=start_date, end_date=end_date)
+        return await self.get_pages_content(pages)
 
     def get_page_title(self, page):
         """
@@ -102,42 +215,45 @@ class NotionHistoryConnector:
         # If no title found, return the page ID as fallback
         return f"Untitled page ({page['id']})"
 
-    async def get_page_content(self, page_id):
+    async def _list_children(self, block_id):
         """
-        Fetches the content (blocks) of a specific page.
+        Fetches all child blocks of a page or block, following pagination.
 
         Args:
-            page_id (str): The ID of the page to fetch
+            block_id (str): The ID of the page or block
 
         Returns:
-            list: List of processed blocks from the page
+            list: List of child blocks
         """
         blocks = []
-        has_more = True
         cursor = None
 
         # Paginate through all blocks
-        while has_more:
+        while True:
+            params = {"block_id": block_id}
             if cursor:
-                response = await self.notion.blocks.children.list(
-                    block_id=page_id, start_cursor=cursor
-                )
-            else:
-                response = await self.notion.blocks.children.list(block_id=page_id)
+                params["start_cursor"] = cursor
+            response = await self._request(self.notion.blocks.children.list, **params)
 
             blocks.extend(response["results"])
-            has_more = response["has_more"]
+            if not response["has_more"]:
+                return blocks
+            cursor = response["next_cursor"]
+
+    async def get_page_content(self, page_id):
+        """
+        Fetches the content (blocks) of a specific page.
 
-            if has_more:
-                cursor = response["next_cursor"]
+        Args:
+            page_id (str): The ID of the page to fetch
 
-        # Process nested blocks recursively
-        processed_blocks = []
-        for block in blocks:
-            processed_block = await self.process_block(block)
-            processed_blocks.append(processed_block)
+        Returns:
+            list: List of processed blocks from the page
+        """
+        blocks = await self._list_children(page_id)
 
-        return processed_blocks
+        # Process nested blocks concurrently, within the rate limit
+        return list(await asyncio.gather(*(self.process_block(b) for b in blocks)))
 
     async def process_block(self, block):
         """
@@ -161,11 +277,10 @@ class NotionHistoryConnector:
 
         if has_children:
             # Fetch and process child blocks
-            children_response = await self.notion.blocks.children.list(
-                block_id=block_id
+            children = await self._list_children(block_id)
+            child_blocks = list(
+                await asyncio.gather(*(self.process_block(c) for c in children))
             )
-            for child_block in children_response["results"]:
-                child_blocks.append(await self.process_block(child_block))
 
         return {
             "id": block_id,
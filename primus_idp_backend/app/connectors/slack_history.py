@@ -5,28 +5,105 @@ A module for retrieving conversation history from Slack channels.
 Allows fetching channel lists and message history with date range filtering.
 """
 
-import logging  # Added import
-import time  # Added import
+import asyncio
+import hashlib
+import logging
 from datetime import datetime
 from typing import Any
 
-from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
 
-logger = logging.getLogger(__name__)  # Added logger
+from app.utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Slack Web API rate limit tiers used by this module, in requests per minute.
+# See https://api.slack.com/apis/rate-limits
+SLACK_TIER_RATE_LIMITS = {
+    2: 20,
+    3: 50,
+    4: 100,
+}
+
+SLACK_METHOD_TIERS = {
+    "conversations.list": 2,
+    "users.list": 2,
+    "conversations.history": 3,
+    "users.info": 4,
+}
+
+
+class SlackRateLimiter:
+    """Per-workspace rate limiter with one token bucket per Slack API tier."""
+
+    def __init__(self):
+        self._buckets = {
+            tier: TokenBucket(rate_per_minute)
+            for tier, rate_per_minute in SLACK_TIER_RATE_LIMITS.items()
+        }
+
+    def _bucket_for(self, method: str) -> TokenBucket:
+        return self._buckets[SLACK_METHOD_TIERS.get(method, 3)]
+
+    async def acquire(self, method: str) -> None:
+        """
+        Wait until the given Slack API method may be called.
+
+        Args:
+            method: Slack API method name, e.g. "conversations.history"
+        """
+        await self._bucket_for(method).acquire()
+
+    def block_for(self, method: str, seconds: float) -> None:
+        """
+        Pause calls of the given method's tier.
+
+        Args:
+            method: Slack API method name that was rate limited
+            seconds: Value of the Retry-After header
+        """
+        self._bucket_for(method).block_for(seconds)
+
+
+_rate_limiters: dict[str, SlackRateLimiter] = {}
+
+
+def get_slack_rate_limiter(token: str) -> SlackRateLimiter:
+    """
+    Get the rate limiter shared by every client of a workspace in this process.
+
+    Args:
+        token: Slack API token identifying the workspace
+
+    Returns:
+        SlackRateLimiter: The workspace's rate limiter
+    """
+    workspace_key = hashlib.sha256(token.encode()).hexdigest()
+    if workspace_key not in _rate_limiters:
+        _rate_limiters[workspace_key] = SlackRateLimiter()
+    return _rate_limiters[workspace_key]
 
 
 class SlackHistory:
     """Class for retrieving conversation history from Slack channels."""
 
-    def __init__(self, token: str | None = None):
+    def __init__(self, token: str | None = None, max_concurrent_channels: int = 4):
         """
         Initialize the SlackHistory class.
 
         Args:
             token: Slack API token (optional, can be set later with set_token)
+            max_concurrent_channels: Maximum number of channels whose history is
+                fetched at the same time
         """
-        self.client = WebClient(token=token) if token else None
+        self.client = None
+        self.rate_limiter = None
+        self._channel_semaphore = asyncio.Semaphore(max(1, max_concurrent_channels))
+        self._user_cache: dict[str, dict[str, Any]] = {}
+        self._user_fetches: dict[str, asyncio.Future] = {}
+        if token:
+            self.set_token(token)
 
     def set_token(self, token: str) -> None:
         """
@@ -35,9 +112,52 @@ class SlackHistory:
         Args:
             token: Slack API token
         """
-        self.client = WebClient(token=token)
+        self.client = AsyncWebClient(token=token)
+        self.rate_limiter = get_slack_rate_limiter(token)
+        self._user_cache.clear()
 
-    def get_all_channels(self, include_private: bool = True) -> list[dict[str, Any]]:
+    async def _call(self, method: str, **kwargs) -> Any:
+        """
+        Call a Slack API method within the workspace rate budget.
+
+        Rate-limited calls wait for the Retry-After duration and are retried.
+
+        Args:
+            method: Slack API method name, e.g. "conversations.history"
+            **kwargs: Arguments for the API method
+
+        Returns:
+            The Slack API response
+
+        Raises:
+            ValueError: If no Slack client has been initialized
+            SlackApiError: If there's an error calling the Slack API
+        """
+        if not self.client:
+            raise ValueError("Slack client not initialized. Call set_token() first.")
+
+        while True:
+            await self.rate_limiter.acquire(method)
+            try:
+                return await self.client.api_call(
+                    method, http_verb="GET", params=kwargs
+                )
+            except SlackApiError as e:
+                if e.response is None or e.response.status_code != 429:
+                    raise
+
+                retry_after_str = e.response.headers.get("Retry-After")
+                wait_time = 60  # Default
+                if retry_after_str and str(retry_after_str).isdigit():
+                    wait_time = int(retry_after_str)
+                logger.warning(
+                    f"Rate limited by Slack on {method}. Retrying after {wait_time} seconds."
+                )
+                self.rate_limiter.block_for(method, wait_time)
+
+    async def get_all_channels(
+        self, include_private: bool = True
+    ) -> list[dict[str, Any]]:
         """
         Fetch all channels that the bot has access to, with rate limit handling.
 
@@ -55,71 +175,24 @@ class SlackHistory:
         if not self.client:
             raise ValueError("Slack client not initialized. Call set_token() first.")
 
-        channels_list = []  # Changed from dict to list
+        channels_list = []
         types = "public_channel"
         if include_private:
             types += ",private_channel"
 
         next_cursor = None
-        is_first_request = True
 
-        while is_first_request or next_cursor:
+        while True:
             try:
-                if not is_first_request:  # Add delay only for paginated requests
-                    logger.info(
-                        f"Paginating for channels, waiting 3 seconds before next call. Cursor: {next_cursor}"
-                    )
-                    time.sleep(3)
-
-                current_limit = 1000  # Max limit
-                api_result = self.client.conversations_list(
-                    types=types, cursor=next_cursor, limit=current_limit
-                )
-
-                channels_on_page = api_result["channels"]
-                for channel in channels_on_page:
-                    if "name" in channel and "id" in channel:
-                        channel_data = {
-                            "id": channel.get("id"),
-                            "name": channel.get("name"),
-                            "is_private": channel.get("is_private", False),
-                            # is_member is often part of the channel object from conversations.list
-                            # It indicates if the authenticated user (bot) is a member.
-                            # For public channels, this might be true or the API might not focus on it
-                            # if the bot can read it anyway. For private, it's crucial.
-                            "is_member": channel.get("is_member", False),
-                        }
-                        channels_list.append(channel_data)
-                    else:
-                        logger.warning(
-                            f"Channel found with missing name or id. Data: {channel}"
-                        )
-
-                next_cursor = api_result.get("response_metadata", {}).get("next_cursor")
-                is_first_request = False  # Subsequent requests are not the first
-
-                if not next_cursor:  # All pages processed
-                    break
-
+                kwargs = {"types": types, "limit": 1000}  # Max limit
+                if next_cursor:
+                    kwargs["cursor"] = next_cursor
+                api_result = await self._call("conversations.list", **kwargs)
             except SlackApiError as e:
-                if e.response is not None and e.response.status_code == 429:
-                    retry_after_header = e.response.headers.get("Retry-After")
-                    wait_duration = 60  # Default wait time
-                    if retry_after_header and retry_after_header.isdigit():
-                        wait_duration = int(retry_after_header)
-
-                    logger.warning(
-                        f"Slack API rate limit hit while fetching channels. Waiting for {wait_duration} seconds. Cursor: {next_cursor}"
-                    )
-                    time.sleep(wait_duration)
-                    # The loop will continue, retrying with the same cursor
-                else:
-                    # Not a 429 error, or no response object, re-raise
-                    raise SlackApiError(
-                        f"Error retrieving channels: {e}", e.response
-                    ) from e
+                raise SlackApiError(
+                    f"Error retrieving channels: {e}", e.response
+                ) from e
             except Exception as general_error:
-                # Handle other potential errors like network issues if necessary, or re-raise
                 logger.error(
                     f"An unexpected error occurred during channel fetching: {general_error}"
                 )
@@ -127,9 +200,29 @@ class SlackHistory:
                     f"An unexpected error occurred during channel fetching: {general_error}"
                 ) from general_error
 
+            for channel in api_result["channels"]:
+                if "name" in channel and "id" in channel:
+                    channel_data = {
+                        "id": channel.get("id"),
+                        "name": channel.get("name"),
+                        "is_private": channel.get("is_private", False),
+                        # is_member indicates if the authenticated user (bot) is a member.
+                        # For private channels it decides whether history is readable.
+                        "is_member": channel.get("is_member", False),
+                    }
+                    channels_list.append(channel_data)
+                else:
+                    logger.warning(
+                        f"Channel found with missing name or id. Data: {channel}"
+                    )
+
+            next_cursor = api_result.get("response_metadata", {}).get("next_cursor")
+            if not next_cursor:  # All pages processed
+                break
+
         return channels_list
 
-    def get_conversation_history(
+    async def get_conversation_history(
         self,
         channel_id: str,
         limit: int = 1000,
@@ -158,11 +251,8 @@ class SlackHistory:
         messages = []
         next_cursor = None
 
-        while True:
-            try:
-                # Proactive delay for conversations.history (Tier 3)
-                time.sleep(1.2)  # Wait 1.2 seconds before each history call.
-
+        async with self._channel_semaphore:
+            while True:
                 kwargs = {
                     "channel": channel_id,
                     "limit": min(limit, 1000),  # API max is 1000
@@ -174,65 +264,32 @@ class SlackHistory:
                 if next_cursor:
                     kwargs["cursor"] = next_cursor
 
-                current_api_call_successful = False
-                result = None  # Ensure result is defined
                 try:
-                    result = self.client.conversations_history(**kwargs)
-                    current_api_call_successful = True
-                except SlackApiError as e_history:
+                    result = await self._call("conversations.history", **kwargs)
+                except SlackApiError as e:
                     if (
-                        e_history.response is not None
-                        and e_history.response.status_code == 429
+                        e.response is not None
+                        and hasattr(e.response, "data")
+                        and isinstance(e.response.data, dict)
+                        and e.response.data.get("error") == "not_in_channel"
                     ):
-                        retry_after_str = e_history.response.headers.get("Retry-After")
-                        wait_time = 60  # Default
-                        if retry_after_str and retry_after_str.isdigit():
-                            wait_time = int(retry_after_str)
                         logger.warning(
-                            f"Rate limited by Slack on conversations.history for channel {channel_id}. "
-                            f"Retrying after {wait_time} seconds. Cursor: {next_cursor}"
+                            f"Bot is not in channel '{channel_id}'. Cannot fetch history. "
+                            "Please add the bot to this channel."
                         )
-                        time.sleep(wait_time)
-                        # current_api_call_successful remains False, loop will retry this page
-                    else:
-                        raise  # Re-raise to outer handler for not_in_channel or other SlackApiErrors
-
-                if not current_api_call_successful:
-                    continue  # Retry the current page fetch due to handled rate limit
+                        return []
+                    raise SlackApiError(
+                        f"Error retrieving history for channel {channel_id}: {e}",
+                        e.response,
+                    ) from e
 
-                # Process result if successful
-                batch = result["messages"]
-                messages.extend(batch)
+                messages.extend(result["messages"])
 
                 if result.get("has_more", False) and len(messages) < limit:
                     next_cursor = result["response_metadata"]["next_cursor"]
                 else:
                     break  # Exit pagination loop
 
-            except SlackApiError as e:  # Outer catch for not_in_channel or unhandled SlackApiErrors from inner try
-                if (
-                    e.response is not None
-                    and hasattr(e.response, "data")
-                    and isinstance(e.response.data, dict)
-                    and e.response.data.get("error") == "not_in_channel"
-                ):
-                    logger.warning(
-                        f"Bot is not in channel '{channel_id}'. Cannot fetch history. "
-                        "Please add the bot to this channel."
-                    )
-                    return []
-                # For other SlackApiErrors from inner block or this level
-                raise SlackApiError(
-                    f"Error retrieving history for channel {channel_id}: {e}",
-                    e.response,
-                ) from e
-            except Exception as general_error:  # Catch any other unexpected errors
-                logger.error(
-                    f"Unexpected error in get_conversation_history for channel {channel_id}: {general_error}"
-                )
-                # Re-raise the general error to allow higher-level handling or visibility
-                raise general_error from general_error
-
         return messages[:limit]
 
     @staticmethod
@@ -252,7 +309,7 @@ class SlackHistory:
         except ValueError:
             return None
 
-    def get_history_by_date_range(
+    async def get_history_by_date_range(
         self, channel_id: str, start_date: str, end_date: str, limit: int = 1000
     ) -> tuple[list[dict[str, Any]], str | None]:
         """
@@ -282,7 +339,7 @@ class SlackHistory:
         latest += 86400  # seconds in a day
 
         try:
-            messages = self.get_conversation_history(
+            messages = await self.get_conversation_history(
                 channel_id=channel_id, limit=limit, oldest=oldest, latest=latest
             )
             return messages, None
@@ -291,10 +348,48 @@ class SlackHistory:
         except ValueError as e:
             return [], str(e)
 
-    def get_user_info(self, user_id: str) -> dict[str, Any]:
+    async def prefetch_users(self) -> int:
+        """
+        Load every workspace user into the user cache with users.list.
+
+        Worth it when a sync touches many distinct authors: one page of
+        users.list replaces up to 200 users.info calls.
+
+        Returns:
+            Number of users cached
+
+        Raises:
+            ValueError: If no Slack client has been initialized
+            SlackApiError: If there's an error calling the Slack API
+        """
+        if not self.client:
+            raise ValueError("Slack client not initialized. Call set_token() first.")
+
+        next_cursor = None
+        while True:
+            kwargs = {"limit": 200}
+            if next_cursor:
+                kwargs["cursor"] = next_cursor
+            result = await self._call("users.list", **kwargs)
+
+            for member in result.get("members", []):
+                if "id" in member:
+                    self._user_cache[member["id"]] = member
+
+            next_cursor = result.get("response_metadata", {}).get("next_cursor")
+            if not next_cursor:
+                break
+
+        logger.info(f"Prefetched {len(self._user_cache)} Slack users")
+        return len(self._user_cache)
+
+    async def get_user_info(self, user_id: str) -> dict[str, Any]:
         """
         Get information about a user.
 
+        Profiles are cached for the lifetime of the client, and concurrent
+        lookups of the same user share a single users.info call.
+
         Args:
             user_id: The ID of the user to get info for
 
@@ -305,45 +400,37 @@ class SlackHistory:
             ValueError: If no Slack client has been initialized
             SlackApiError: If there's an error calling the Slack API
         """
-        if not self.client:
-            raise ValueError("Slack client not initialized. Call set_token() first.")
+        if user_id in self._user_cache:
+            return self._user_cache[user_id]
 
-        while True:
-            try:
-                # Proactive delay for users.info (Tier 4) - generally not needed unless called extremely rapidly.
-                # For now, we are only adding Retry-After as per plan.
-                # time.sleep(0.6) # Optional: ~100 req/min if ever needed.
-
-                result = self.client.users_info(user=user_id)
-                return result["user"]  # Success, return and exit loop implicitly
-
-            except SlackApiError as e_user_info:
-                if (
-                    e_user_info.response is not None
-                    and e_user_info.response.status_code == 429
-                ):
-                    retry_after_str = e_user_info.response.headers.get("Retry-After")
-                    wait_time = 30  # Default for Tier 4, can be adjusted
-                    if retry_after_str and retry_after_str.isdigit():
-                        wait_time = int(retry_after_str)
-                    logger.warning(
-                        f"Rate limited by Slack on users.info for user {user_id}. Retrying after {wait_time} seconds."
-                    )
-                    time.sleep(wait_time)
-                    continue  # Retry the API call
-                else:
-                    # Not a 429 error, or no response object, re-raise
-                    raise SlackApiError(
-                        f"Error retrieving user info for {user_id}: {e_user_info}",
-                        e_user_info.response,
-                    ) from e_user_info
-            except Exception as general_error:  # Catch any other unexpected errors
-                logger.error(
-                    f"Unexpected error in get_user_info for user {user_id}: {general_error}"
+        in_flight = self._user_fetches.get(user_id)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.ensure_future(self._fetch_user_info(user_id))
+        self._user_fetches[user_id] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._user_fetches.pop(user_id, None)
+            else:
+                future.add_done_callback(
+                    lambda _: self._user_fetches.pop(user_id, None)
                 )
-                raise general_error from general_error  # Re-raise unexpected errors
 
-    def format_message(
+    async def _fetch_user_info(self, user_id: str) -> dict[str, Any]:
+        try:
+            result = await self._call("users.info", user=user_id)
+        except SlackApiError as e:
+            raise SlackApiError(
+                f"Error retrieving user info for {user_id}: {e}", e.response
+            ) from e
+
+        self._user_cache[user_id] = result["user"]
+        return result["user"]
+
+    async def format_message(
         self, msg: dict[str, Any], include_user_info: bool = False
     ) -> dict[str, Any]:
         """
@@ -371,7 +458,7 @@ class SlackHistory:
 
         if include_user_info and "user" in msg and self.client:
             try:
-                user_info = self.get_user_info(msg["user"])
+                user_info = await self.get_user_info(msg["user"])
                 formatted["user_name"] = user_info.get("real_name", "Unknown")
                 formatted["user_email"] = user_info.get("profile", {}).get("email", "")
             except Exception:
@@ -9,19 +9,28 @@ from sqlalchemy import (
     ARRAY,
     JSON,
     TIMESTAMP,
+    BigInteger,
     Boolean,
     Column,
     Enum as SQLAlchemyEnum,
     ForeignKey,
+    Index,
     Integer,
+    Sequence,
     String,
     Text,
     UniqueConstraint,
     text,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, relationship
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    declared_attr,
+    deferred,
+    relationship,
+)
 
 from app.config import config
 from app.retriver.chunks_hybrid_search import ChucksHybridSearchRetriever
@@ -168,17 +177,33 @@ class Chat(BaseModel, TimestampMixin):
     search_space = relationship("SearchSpace", back_populates="chats")
 
 
+DOCUMENT_REVISION_SEQUENCE = Sequence("documents_revision_seq")
+
+
 class Document(BaseModel, TimestampMixin):
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("documents_search_space_revision_index", "search_space_id", "revision"),
+    )
 
     title = Column(String, nullable=False, index=True)
     document_type = Column(SQLAlchemyEnum(DocumentType), nullable=False)
     document_metadata = Column(JSON, nullable=True)
 
     content = Column(Text, nullable=False)
+    # Maintained by the content_tsv trigger, see setup_indexes
+    content_tsv = deferred(Column(TSVECTOR, nullable=True))
     content_hash = Column(String, nullable=False, index=True, unique=True)
     unique_identifier_hash = Column(String, nullable=True, index=True, unique=True)
     embedding = Column(Vector(config.embedding_model_instance.dimension))
+    # Increases on every insert and update (see setup_indexes); used to tell
+    # whether the documents of a search space changed
+    revision = Column(
+        BigInteger,
+        DOCUMENT_REVISION_SEQUENCE,
+        server_default=DOCUMENT_REVISION_SEQUENCE.next_value(),
+        nullable=False,
+    )
 
     search_space_id = Column(
         Integer, ForeignKey("searchspaces.id", ondelete="CASCADE"), nullable=False
@@ -193,7 +218,11 @@ class Chunk(BaseModel, TimestampMixin):
     __tablename__ = "chunks"
 
     content = Column(Text, nullable=False)
+    # Maintained by the content_tsv trigger, see setup_indexes
+    content_tsv = deferred(Column(TSVECTOR, nullable=True))
     embedding = Column(Vector(config.embedding_model_instance.dimension))
+    # Token count of content with the reference tokenizer, computed at ingest
+    token_count = Column(Integer, nullable=True)
 
     document_id = Column(
         Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
@@ -327,6 +356,37 @@ class LLMConfig(BaseModel, TimestampMixin):
     search_space = relationship("SearchSpace", back_populates="llm_configs")
 
 
+class QnaAnswerCacheEntry(BaseModel, TimestampMixin):
+    """A Q&A answer reused for similar questions, see qna_answer_cache_service."""
+
+    __tablename__ = "qna_answer_cache"
+    __table_args__ = (
+        Index(
+            "qna_answer_cache_lookup_index",
+            "search_space_id",
+            "scope_hash",
+            "corpus_version",
+        ),
+    )
+
+    search_space_id = Column(
+        Integer, ForeignKey("searchspaces.id", ondelete="CASCADE"), nullable=False
+    )
+    # Hash of the connectors, search mode and language the answer was made with
+    scope_hash = Column(String(64), nullable=False)
+    # Version of the search space's documents the answer was made from
+    corpus_version = Column(String(64), nullable=False)
+
+    query_text = Column(Text, nullable=False)
+    query_embedding = Column(Vector(config.embedding_model_instance.dimension))
+
+    answer = Column(Text, nullable=False)
+    # Chunk IDs of the reranked documents the answer cites
+    document_ids = Column(JSON, nullable=False, default=list)
+    sources = Column(JSON, nullable=False, default=list)
+    further_questions = Column(JSON, nullable=False, default=list)
+
+
 class UserSearchSpacePreference(BaseModel, TimestampMixin):
     __tablename__ = "user_search_space_preferences"
     __table_args__ = (
@@ -421,6 +481,57 @@ async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
 async def setup_indexes():
     async with engine.begin() as conn:
+        # Keep the stored tsvector columns in sync with content
+        await conn.execute(
+            text(
+                """
+                CREATE OR REPLACE FUNCTION content_tsv_trigger() RETURNS trigger AS $$
+                BEGIN
+                    NEW.content_tsv := to_tsvector('english', coalesce(NEW.content, ''));
+                    RETURN NEW;
+                END
+                $$ LANGUAGE plpgsql
+                """
+            )
+        )
+        for table_name in ("documents", "chunks"):
+            await conn.execute(
+                text(
+                    f"DROP TRIGGER IF EXISTS {table_name}_content_tsv_update ON {table_name}"
+                )
+            )
+            await conn.execute(
+                text(
+                    f"CREATE TRIGGER {table_name}_content_tsv_update "
+                    f"BEFORE INSERT OR UPDATE OF content ON {table_name} "
+                    "FOR EACH ROW EXECUTE FUNCTION content_tsv_trigger()"
+                )
+            )
+
+        # Bump the revision of updated documents
+        await conn.execute(
+            text(
+                """
+                CREATE OR REPLACE FUNCTION document_revision_trigger() RETURNS trigger AS $$
+                BEGIN
+                    NEW.revision := nextval('documents_revision_seq');
+                    RETURN NEW;
+                END
+                $$ LANGUAGE plpgsql
+                """
+            )
+        )
+        await conn.execute(
+            text("DROP TRIGGER IF EXISTS documents_revision_update ON documents")
+        )
+        await conn.execute(
+            text(
+                "CREATE TRIGGER documents_revision_update "
+                "BEFORE UPDATE ON documents "
+                "FOR EACH ROW EXECUTE FUNCTION document_revision_trigger()"
+            )
+        )
+
         # Create indexes
         # Document Summary Indexes
         await conn.execute(
@@ -430,7 +541,7 @@ async def setup_indexes():
         )
         await conn.execute(
             text(
-                "CREATE INDEX IF NOT EXISTS document_search_index ON documents USING gin (to_tsvector('english', content))"
+                "CREATE INDEX IF NOT EXISTS document_content_tsv_index ON documents USING gin (content_tsv)"
             )
         )
         # Document Chuck Indexes
@@ -441,7 +552,13 @@ async def setup_indexes():
         )
         await conn.execute(
             text(
-                "CREATE INDEX IF NOT EXISTS chucks_search_index ON chunks USING gin (to_tsvector('english', content))"
+                "CREATE INDEX IF NOT EXISTS chucks_content_tsv_index ON chunks USING gin (content_tsv)"
+            )
+        )
+        # Connectors due for periodic indexing
+        await conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS search_source_connectors_next_scheduled_index ON search_source_connectors (next_scheduled_at) WHERE periodic_indexing_enabled"
             )
         )
 
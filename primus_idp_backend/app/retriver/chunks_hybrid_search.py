@@ -30,12 +30,11 @@ class ChucksHybridSearchRetriever:
         from sqlalchemy import select
         from sqlalchemy.orm import joinedload
 
-        from app.config import config
         from app.db import Chunk, Document, SearchSpace
+        from app.services.query_embedding_cache import get_query_embedding_cache
 
-        # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        # Get embedding for the query (cached across connector searches)
+        query_embedding = await get_query_embedding_cache().get_embedding(query_text)
 
         # Build the base query with user ownership check
         query = (
@@ -83,8 +82,8 @@ class ChucksHybridSearchRetriever:
 
         from app.db import Chunk, Document, SearchSpace
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Chunk.content)
+        # Use the stored tsvector column and create tsquery for PostgreSQL full-text search
+        tsvector = Chunk.content_tsv
         tsquery = func.plainto_tsquery("english", query_text)
 
         # Build the base query with user ownership check
@@ -136,19 +135,18 @@ class ChucksHybridSearchRetriever:
         from sqlalchemy import func, select, text
         from sqlalchemy.orm import joinedload
 
-        from app.config import config
         from app.db import Chunk, Document, DocumentType, SearchSpace
+        from app.services.query_embedding_cache import get_query_embedding_cache
 
-        # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        # Get embedding for the query (cached across connector searches)
+        query_embedding = await get_query_embedding_cache().get_embedding(query_text)
 
         # Constants for RRF calculation
         k = 60  # Constant for RRF calculation
         n_results = top_k * 2  # Get more results for better fusion
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Chunk.content)
+        # Use the stored tsvector column and create tsquery for PostgreSQL full-text search
+        tsvector = Chunk.content_tsv
         tsquery = func.plainto_tsquery("english", query_text)
 
         # Base conditions for document filtering
@@ -245,23 +243,187 @@ class ChucksHybridSearchRetriever:
             return []
 
         # Convert to serializable dictionaries if no reranker is available or if reranking failed
-        serialized_results = []
-        for chunk, score in chunks_with_scores:
-            serialized_results.append(
-                {
-                    "chunk_id": chunk.id,
-                    "content": chunk.content,
-                    "score": float(score),  # Ensure score is a Python float
-                    "document": {
-                        "id": chunk.document.id,
-                        "title": chunk.document.title,
-                        "document_type": chunk.document.document_type.value
-                        if hasattr(chunk.document, "document_type")
-                        else None,
-                        "metadata": chunk.document.document_metadata,
-                    },
-                }
+        return [
+            self._serialize_chunk(chunk, score) for chunk, score in chunks_with_scores
+        ]
+
+    async def hybrid_search_many(
+        self,
+        query_text: str,
+        top_k: int,
+        user_id: str,
+        document_types: list[str],
+        search_space_id: int | None = None,
+    ) -> dict[str, list]:
+        """
+        Run hybrid search for several document types in a single SQL statement.
+
+        The query is embedded once. Per document type, the semantic and keyword
+        candidate lists are fetched as separate index-backed branches of a
+        UNION ALL, fused with Reciprocal Rank Fusion, and cut to the top_k results
+        of each type with a window partitioned by document type.
+
+        Args:
+            query_text: The search query text
+            top_k: Number of results to return per document type
+            user_id: The ID of the user performing the search
+            document_types: Document types to search (e.g., ["FILE", "SLACK_CONNECTOR"])
+            search_space_id: Optional search space ID to filter results
+
+        Returns:
+            Dictionary mapping each requested document type to its list of chunk
+            dictionaries, in the same format as hybrid_search
+        """
+        from sqlalchemy import func, select, union_all
+        from sqlalchemy.orm import joinedload
+
+        from app.db import Chunk, Document, DocumentType, SearchSpace
+        from app.services.query_embedding_cache import get_query_embedding_cache
+
+        results: dict[str, list] = {
+            document_type: [] for document_type in document_types
+        }
+
+        # Ignore document types that don't exist in the enum
+        doc_type_enums = [
+            DocumentType[document_type]
+            for document_type in dict.fromkeys(document_types)
+            if document_type in DocumentType.__members__
+        ]
+        if not doc_type_enums:
+            return results
+
+        # Get embedding for the query once for every document type
+        query_embedding = await get_query_embedding_cache().get_embedding(query_text)
+
+        # Constants for RRF calculation
+        k = 60  # Constant for RRF calculation
+        n_results = top_k * 2  # Get more results for better fusion
+
+        # Use the stored tsvector column and create tsquery for PostgreSQL full-text search
+        tsvector = Chunk.content_tsv
+        tsquery = func.plainto_tsquery("english", query_text)
+        distance = Chunk.embedding.op("<=>")(query_embedding)
+        text_rank = func.ts_rank_cd(tsvector, tsquery)
+
+        # Base conditions for document filtering
+        base_conditions = [SearchSpace.user_id == user_id]
+
+        # Add search space filter if provided
+        if search_space_id is not None:
+            base_conditions.append(Document.search_space_id == search_space_id)
+
+        semantic_branches = []
+        keyword_branches = []
+        for doc_type_enum in doc_type_enums:
+            # Each branch keeps its own ORDER BY/LIMIT so the per-type scan stays index-backed
+            semantic_branch = (
+                select(
+                    Chunk.id,
+                    func.rank().over(order_by=distance).label("rank"),
+                )
+                .join(Document, Chunk.document_id == Document.id)
+                .join(SearchSpace, Document.search_space_id == SearchSpace.id)
+                .where(*base_conditions)
+                .where(Document.document_type == doc_type_enum)
+                .order_by(distance)
+                .limit(n_results)
+                .subquery()
+            )
+            semantic_branches.append(
+                select(semantic_branch.c.id, semantic_branch.c.rank)
+            )
+
+            keyword_branch = (
+                select(
+                    Chunk.id,
+                    func.rank().over(order_by=text_rank.desc()).label("rank"),
+                )
+                .join(Document, Chunk.document_id == Document.id)
+                .join(SearchSpace, Document.search_space_id == SearchSpace.id)
+                .where(*base_conditions)
+                .where(Document.document_type == doc_type_enum)
+                .where(tsvector.op("@@")(tsquery))
+                .order_by(text_rank.desc())
+                .limit(n_results)
+                .subquery()
+            )
+            keyword_branches.append(select(keyword_branch.c.id, keyword_branch.c.rank))
+
+        semantic_search_cte = union_all(*semantic_branches).cte("semantic_search")
+        keyword_search_cte = union_all(*keyword_branches).cte("keyword_search")
+
+        # Fuse both rankings; a chunk belongs to exactly one document type
+        fused_cte = (
+            select(
+                func.coalesce(semantic_search_cte.c.id, keyword_search_cte.c.id).label(
+                    "id"
+                ),
+                (
+                    func.coalesce(1.0 / (k + semantic_search_cte.c.rank), 0.0)
+                    + func.coalesce(1.0 / (k + keyword_search_cte.c.rank), 0.0)
+                ).label("score"),
             )
+            .select_from(
+                semantic_search_cte.outerjoin(
+                    keyword_search_cte,
+                    semantic_search_cte.c.id == keyword_search_cte.c.id,
+                    full=True,
+                )
+            )
+            .cte("fused_search")
+        )
+
+        # Keep the top_k fused results of every document type
+        ranked_subquery = (
+            select(
+                fused_cte.c.id,
+                fused_cte.c.score,
+                func.row_number()
+                .over(
+                    partition_by=Document.document_type,
+                    order_by=fused_cte.c.score.desc(),
+                )
+                .label("type_rank"),
+            )
+            .join(Chunk, Chunk.id == fused_cte.c.id)
+            .join(Document, Chunk.document_id == Document.id)
+            .subquery("ranked_search")
+        )
+
+        final_query = (
+            select(Chunk, ranked_subquery.c.score)
+            .join(ranked_subquery, Chunk.id == ranked_subquery.c.id)
+            .where(ranked_subquery.c.type_rank <= top_k)
+            .options(joinedload(Chunk.document))
+            .order_by(ranked_subquery.c.score.desc())
+        )
+
+        # Execute the query
+        result = await self.db_session.execute(final_query)
 
-        return serialized_results
+        for chunk, score in result.all():
+            document_type = chunk.document.document_type.value
+            if document_type in results:
+                results[document_type].append(self._serialize_chunk(chunk, score))
+
+        return results
+
+    @staticmethod
+    def _serialize_chunk(chunk, score) -> dict:
+        """Convert a chunk and its fused score to a serializable dictionary."""
+        return {
+            "chunk_id": chunk.id,
+            "content": chunk.content,
+            "token_count": chunk.token_count,
+            "score": float(score),  # Ensure score is a Python float
+            "document": {
+                "id": chunk.document.id,
+                "title": chunk.document.title,
+                "document_type": chunk.document.document_type.value
+                if hasattr(chunk.document, "document_type")
+                else None,
+                "metadata": chunk.document.document_metadata,
+            },
+        }
 
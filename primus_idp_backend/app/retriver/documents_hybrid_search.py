@@ -8,6 +8,63 @@ class DocumentHybridSearchRetriever:
         """
         self.db_session = db_session
 
+    async def fetch_chunks_for_documents(
+        self,
+        document_ids: list[int],
+        query_embedding=None,
+        max_chunks_per_document: int | None = None,
+    ) -> dict[int, list]:
+        """
+        Fetch the chunks of several documents in a single query.
+
+        Args:
+            document_ids: IDs of the documents whose chunks to fetch
+            query_embedding: Optional query embedding ranking chunks within a document
+            max_chunks_per_document: Optional cap on chunks per document; with a
+                query embedding, the chunks most similar to the query are kept
+
+        Returns:
+            Dict mapping document ID to its chunks, in document order
+        """
+        from sqlalchemy import func, select
+
+        from app.db import Chunk
+
+        if not document_ids:
+            return {}
+
+        chunks_query = select(Chunk).where(Chunk.document_id.in_(document_ids))
+
+        if max_chunks_per_document:
+            # Rank chunks within each document and keep the best of each
+            relevance_order = (
+                Chunk.embedding.op("<=>")(query_embedding)
+                if query_embedding is not None
+                else Chunk.id
+            )
+            ranked_chunks = (
+                select(
+                    Chunk.id,
+                    func.row_number()
+                    .over(partition_by=Chunk.document_id, order_by=relevance_order)
+                    .label("chunk_rank"),
+                )
+                .where(Chunk.document_id.in_(document_ids))
+                .subquery("ranked_chunks")
+            )
+            chunks_query = chunks_query.join(
+                ranked_chunks, ranked_chunks.c.id == Chunk.id
+            ).where(ranked_chunks.c.chunk_rank <= max_chunks_per_document)
+
+        chunks_result = await self.db_session.execute(
+            chunks_query.order_by(Chunk.document_id, Chunk.id)
+        )
+
+        chunks_by_document = {document_id: [] for document_id in document_ids}
+        for chunk in chunks_result.scalars().all():
+            chunks_by_document[chunk.document_id].append(chunk)
+        return chunks_by_document
+
     async def vector_search(
         self,
         query_text: str,
@@ -30,12 +87,11 @@ class DocumentHybridSearchRetriever:
         from sqlalchemy import select
         from sqlalchemy.orm import joinedload
 
-        from app.config import config
         from app.db import Document, SearchSpace
+        from app.services.query_embedding_cache import get_query_embedding_cache
 
-        # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        # Get embedding for the query (cached across connector searches)
+        query_embedding = await get_query_embedding_cache().get_embedding(query_text)
 
         # Build the base query with user ownership check
         query = (
@@ -84,8 +140,8 @@ class DocumentHybridSearchRetriever:
 
         from app.db import Document, SearchSpace
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Document.content)
+        # Use the stored tsvector column and create tsquery for PostgreSQL full-text search
+        tsvector = Document.content_tsv
         tsquery = func.plainto_tsquery("english", query_text)
 
         # Build the base query with user ownership check
@@ -119,6 +175,7 @@ class DocumentHybridSearchRetriever:
         user_id: str,
         search_space_id: int | None = None,
         document_type: str | None = None,
+        max_chunks_per_document: int | None = None,
     ) -> list:
         """
         Combine vector similarity and full-text search results using Reciprocal Rank Fusion.
@@ -129,6 +186,9 @@ class DocumentHybridSearchRetriever:
             user_id: The ID of the user performing the search
             search_space_id: Optional search space ID to filter results
             document_type: Optional document type to filter results (e.g., "FILE", "CRAWLED_URL")
+            max_chunks_per_document: Optional cap on the chunks returned per document,
+                keeping those most relevant to the query (defaults to
+                DOCUMENT_SEARCH_MAX_CHUNKS_PER_DOCUMENT, 0 returns all chunks)
 
         """
         from sqlalchemy import func, select, text
@@ -136,17 +196,20 @@ class DocumentHybridSearchRetriever:
 
         from app.config import config
         from app.db import Document, DocumentType, SearchSpace
+        from app.services.query_embedding_cache import get_query_embedding_cache
 
-        # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        if max_chunks_per_document is None:
+            max_chunks_per_document = config.DOCUMENT_SEARCH_MAX_CHUNKS_PER_DOCUMENT
+
+        # Get embedding for the query (cached across connector searches)
+        query_embedding = await get_query_embedding_cache().get_embedding(query_text)
 
         # Constants for RRF calculation
         k = 60  # Constant for RRF calculation
         n_results = top_k * 2  # Get more results for better fusion
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Document.content)
+        # Use the stored tsvector column and create tsquery for PostgreSQL full-text search
+        tsvector = Document.content_tsv
         tsquery = func.plainto_tsquery("english", query_text)
 
         # Base conditions for document filtering
@@ -240,19 +303,17 @@ class DocumentHybridSearchRetriever:
         if not documents_with_scores:
             return []
 
+        # Fetch the chunks of all ranked documents in one query
+        chunks_by_document = await self.fetch_chunks_for_documents(
+            [document.id for document, _ in documents_with_scores],
+            query_embedding=query_embedding,
+            max_chunks_per_document=max_chunks_per_document,
+        )
+
         # Convert to serializable dictionaries - return individual chunks
         serialized_results = []
         for document, score in documents_with_scores:
-            # Fetch associated chunks for this document
-            from sqlalchemy import select
-
-            from app.db import Chunk
-
-            chunks_query = (
-                select(Chunk).where(Chunk.document_id == document.id).order_by(Chunk.id)
-            )
-            chunks_result = await self.db_session.execute(chunks_query)
-            chunks = chunks_result.scalars().all()
+            chunks = chunks_by_document.get(document.id, [])
 
             # Return individual chunks instead of concatenated content
             if chunks:
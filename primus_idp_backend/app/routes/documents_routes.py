@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
+from app.config import config
 from app.db import (
     Chunk,
     Document,
@@ -23,6 +24,7 @@ from app.schemas import (
 )
 from app.users import current_active_user
 from app.utils.check_ownership import check_ownership
+from app.utils.file_uploads import get_file_document_by_hash, save_upload_to_temp_file
 
 try:
     asyncio.set_event_loop_policy(asyncio.DefaultEventLoopPolicy())
@@ -106,29 +108,15 @@ async def create_documents_file_upload(
         if not files:
             raise HTTPException(status_code=400, detail="No files provided")
 
+        from app.tasks.celery_tasks.document_tasks import process_file_upload_task
+
+        skipped_duplicates = []
+        uploaded_hashes = set()
         for file in files:
             try:
-                # Save file to a temporary location to avoid stream issues
-                import os
-                import tempfile
-
-                # Create temp file
-                with tempfile.NamedTemporaryFile(
-                    delete=False, suffix=os.path.splitext(file.filename)[1]
-                ) as temp_file:
-                    temp_path = temp_file.name
-
-                # Write uploaded file to temp file
-                content = await file.read()
-                with open(temp_path, "wb") as f:
-                    f.write(content)
-
-                from app.tasks.celery_tasks.document_tasks import (
-                    process_file_upload_task,
-                )
-
-                process_file_upload_task.delay(
-                    temp_path, file.filename, search_space_id, str(user.id)
+                # Stream the file to a temporary location, hashing it on the way
+                temp_path, file_hash = await save_upload_to_temp_file(
+                    file, chunk_size=config.FILE_UPLOAD_CHUNK_SIZE
                 )
             except Exception as e:
                 raise HTTPException(
@@ -136,8 +124,24 @@ async def create_documents_file_upload(
                     detail=f"Failed to process file {file.filename}: {e!s}",
                 ) from e
 
+            # Files already in the search space (or in this request) are not processed again
+            if file_hash in uploaded_hashes or await get_file_document_by_hash(
+                session, search_space_id, file_hash
+            ):
+                os.unlink(temp_path)
+                skipped_duplicates.append(file.filename)
+                continue
+            uploaded_hashes.add(file_hash)
+
+            process_file_upload_task.delay(
+                temp_path, file.filename, search_space_id, str(user.id), file_hash
+            )
+
         await session.commit()
-        return {"message": "Files uploaded for processing"}
+        return {
+            "message": "Files uploaded for processing",
+            "skipped_duplicates": skipped_duplicates,
+        }
     except HTTPException:
         raise
     except Exception as e:
@@ -12,6 +12,7 @@ from app.db import (
     get_async_session,
 )
 from app.schemas import LLMConfigCreate, LLMConfigRead, LLMConfigUpdate
+from app.services.llm_service import get_llm_client_registry
 from app.users import current_active_user
 
 router = APIRouter()
@@ -196,6 +197,7 @@ async def update_llm_config(
             setattr(db_llm_config, key, value)
 
         await session.commit()
+        get_llm_client_registry().invalidate(llm_config_id=llm_config_id)
         await session.refresh(db_llm_config)
         return db_llm_config
     except HTTPException:
@@ -229,6 +231,7 @@ async def delete_llm_config(
 
         await session.delete(db_llm_config)
         await session.commit()
+        get_llm_client_registry().invalidate(llm_config_id=llm_config_id)
         return {"message": "LLM configuration deleted successfully"}
     except HTTPException:
         raise
@@ -334,6 +337,9 @@ async def update_user_llm_preferences(
             setattr(preference, key, value)
 
         await session.commit()
+        get_llm_client_registry().invalidate(
+            user_id=user.id, search_space_id=search_space_id
+        )
         await session.refresh(preference)
 
         # Reload relationships
@@ -1345,7 +1345,7 @@ async def run_google_gmail_indexing_with_new_session(
     search_space_id: int,
     user_id: str,
     max_messages: int,
-    days_back: int,
+    days_back: int | None,
 ):
     """Wrapper to run Google Gmail indexing with its own database session."""
     logger.info(
@@ -1366,15 +1366,22 @@ async def run_google_gmail_indexing(
     search_space_id: int,
     user_id: str,
     max_messages: int,
-    days_back: int,
+    days_back: int | None,
 ):
-    """Runs the Google Gmail indexing task and updates the timestamp."""
+    """
+    Runs the Google Gmail indexing task and updates the timestamp.
+
+    Without days_back, the indexer fetches the changes made since the mailbox
+    history ID stored by the previous sync, or the last 30 days on a first sync.
+    """
     try:
         # Convert days_back to start_date string in YYYY-MM-DD format
         from datetime import datetime, timedelta
 
-        start_date_obj = datetime.now() - timedelta(days=days_back)
-        start_date = start_date_obj.strftime("%Y-%m-%d")
+        start_date = None
+        if days_back is not None:
+            start_date_obj = datetime.now() - timedelta(days=days_back)
+            start_date = start_date_obj.strftime("%Y-%m-%d")
         end_date = None  # No end date, index up to current time
 
         indexed_count, error_message = await index_google_gmail_messages(
@@ -0,0 +1,217 @@
+import asyncio
+import contextlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Content types chunks can be split for
+CONTENT_TYPE_CODE = "code"
+CONTENT_TYPE_MARKDOWN = "markdown"
+CONTENT_TYPE_PROSE = "prose"
+
+# tree-sitter-language-pack language of each source file extension
+CODE_LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "tsx",
+    ".java": "java",
+    ".c": "c",
+    ".h": "c",
+    ".cpp": "cpp",
+    ".hpp": "cpp",
+    ".cs": "csharp",
+    ".go": "go",
+    ".rb": "ruby",
+    ".php": "php",
+    ".swift": "swift",
+    ".kt": "kotlin",
+    ".scala": "scala",
+    ".rs": "rust",
+    ".m": "objc",
+    ".sh": "bash",
+    ".bash": "bash",
+    ".ps1": "powershell",
+    ".lua": "lua",
+    ".pl": "perl",
+    ".pm": "perl",
+    ".r": "r",
+    ".dart": "dart",
+    ".sql": "sql",
+}
+
+MARKDOWN_EXTENSIONS = {".md", ".markdown", ".mdx"}
+
+# Markdown headers split first, top level headers before deeper ones
+MARKDOWN_HEADER_LEVELS = [
+    ["\n# "],
+    ["\n## "],
+    ["\n### "],
+    ["\n#### ", "\n##### ", "\n###### "],
+]
+
+
+def detect_content_type(file_path: str | None) -> tuple[str, str | None]:
+    """
+    Detect how a file should be chunked from its extension.
+
+    Args:
+        file_path: Path or name of the file
+
+    Returns:
+        Tuple of (content type, code language or None)
+    """
+    if not file_path or "." not in file_path.rsplit("/", 1)[-1]:
+        return CONTENT_TYPE_PROSE, None
+
+    file_extension = "." + file_path.rsplit(".", 1)[-1].lower()
+    if file_extension in CODE_LANGUAGES:
+        return CONTENT_TYPE_CODE, CODE_LANGUAGES[file_extension]
+    if file_extension in MARKDOWN_EXTENSIONS:
+        return CONTENT_TYPE_MARKDOWN, None
+    return CONTENT_TYPE_PROSE, None
+
+
+class ChunkingService:
+    """
+    Service splitting documents into chunks with a chunker suited to their content.
+
+    Source code is split on syntax tree boundaries by a chonkie CodeChunker for
+    its language, markdown on headers first, and prose with the recursive
+    chunker. Chunkers are created once per content type and language, and
+    chunking runs on a dedicated thread pool so it never blocks the event loop.
+    """
+
+    def __init__(self, prose_chunker, max_workers: int = 2):
+        """
+        Initialize the chunking service
+
+        Args:
+            prose_chunker: The chonkie chunker used for prose and as fallback
+            max_workers: Number of threads running chunking
+        """
+        self.prose_chunker = prose_chunker
+        self.chunk_size = getattr(prose_chunker, "chunk_size", 512)
+        self._chunkers: dict[tuple[str, str | None], Any] = {}
+        self._parser_locks: dict[tuple[str, str | None], threading.Lock] = {}
+        self._chunkers_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="chunking"
+        )
+
+    def _create_chunker(self, content_type: str, language: str | None):
+        """Create the chunker of a content type, or None if it is unavailable."""
+        try:
+            if content_type == CONTENT_TYPE_CODE:
+                from chonkie import CodeChunker
+
+                return CodeChunker(chunk_size=self.chunk_size, language=language)
+
+            if content_type == CONTENT_TYPE_MARKDOWN:
+                from chonkie import RecursiveChunker, RecursiveLevel, RecursiveRules
+
+                header_levels = [
+                    RecursiveLevel(delimiters=delimiters, include_delim="next")
+                    for delimiters in MARKDOWN_HEADER_LEVELS
+                ]
+                return RecursiveChunker(
+                    chunk_size=self.chunk_size,
+                    rules=RecursiveRules(
+                        levels=header_levels + RecursiveRules().levels
+                    ),
+                )
+        except Exception as e:
+            logger.warning(
+                f"No {content_type} chunker for {language or 'text'}, using prose chunker: {e!s}"
+            )
+        return None
+
+    def _get_chunker(self, content_type: str, language: str | None) -> Any:
+        """Get the cached chunker of a content type, creating it on first use."""
+        if content_type == CONTENT_TYPE_PROSE:
+            return self.prose_chunker
+
+        key = (content_type, language)
+        with self._chunkers_lock:
+            if key not in self._chunkers:
+                chunker = self._create_chunker(content_type, language)
+                self._chunkers[key] = chunker or self.prose_chunker
+                if content_type == CONTENT_TYPE_CODE:
+                    self._parser_locks[key] = threading.Lock()
+            return self._chunkers[key]
+
+    def _chunk_sync(
+        self, content: str, content_type: str, language: str | None
+    ) -> list[str]:
+        """Split content into chunk texts synchronously."""
+        chunker = self._get_chunker(content_type, language)
+        if chunker is self.prose_chunker:
+            return [chunk.text for chunk in chunker.chunk(content)]
+
+        try:
+            # Code chunkers keep a tree-sitter parser, which is not thread safe
+            lock = self._parser_locks.get((content_type, language))
+            with lock or contextlib.nullcontext():
+                return [chunk.text for chunk in chunker.chunk(content)]
+        except Exception as e:
+            logger.warning(
+                f"{content_type} chunking failed for {language or 'text'}, using prose chunker: {e!s}"
+            )
+            return [chunk.text for chunk in self.prose_chunker.chunk(content)]
+
+    async def chunk(
+        self,
+        content: str,
+        file_path: str | None = None,
+        content_type: str | None = None,
+    ) -> list[str]:
+        """
+        Split content into chunk texts on the chunking thread pool.
+
+        Args:
+            content: Content to chunk
+            file_path: Path or name of the source file, used to pick the chunker
+            content_type: Content type overriding the one detected from file_path
+
+        Returns:
+            List of chunk texts in document order
+        """
+        if not content or not content.strip():
+            return []
+
+        detected_type, language = detect_content_type(file_path)
+        content_type = content_type or detected_type
+        if content_type != CONTENT_TYPE_CODE:
+            language = None
+        elif language is None:
+            content_type = CONTENT_TYPE_PROSE
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._chunk_sync, content, content_type, language
+        )
+
+
+_chunking_service: ChunkingService | None = None
+
+
+def get_chunking_service() -> ChunkingService:
+    """
+    Get the process-wide chunking service built from the global configuration.
+
+    Returns:
+        ChunkingService: The shared chunking service instance
+    """
+    global _chunking_service
+
+    if _chunking_service is None:
+        from app.config import config
+
+        _chunking_service = ChunkingService(
+            config.chunker_instance, max_workers=config.CHUNKING_MAX_WORKERS
+        )
+    return _chunking_service
@@ -0,0 +1,264 @@
+"""
+Redis leases serializing the indexing runs of each connector.
+
+An indexing task holds its connector's lease while it runs, so two workers never
+index the same connector at the same time. Requests arriving while a connector
+is running are coalesced into a single follow-up run, and the number of
+connectors indexed at once per user is capped so one tenant can't take every
+worker.
+
+Leases expire unless the running task keeps extending them with a heartbeat,
+so a lost worker releases its connector automatically.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Lease acquisition results
+LEASE_ACQUIRED = "acquired"
+LEASE_COALESCED = "coalesced"
+LEASE_USER_LIMIT = "user_limit"
+
+# Time after which a coalesced run that was never started is dropped
+PENDING_RUN_TTL_MS = 24 * 60 * 60 * 1000
+
+# A new lease drops the pending run: the run it starts covers that request too
+# KEYS: lease, user leases, pending run
+# ARGV: token, ttl ms, now ms, user cap, pending run payload, pending run ttl ms
+_ACQUIRE_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 1 then
+    redis.call('set', KEYS[3], ARGV[5], 'PX', ARGV[6])
+    return 0
+end
+redis.call('zremrangebyscore', KEYS[2], '-inf', ARGV[3])
+local cap = tonumber(ARGV[4])
+if cap > 0 and redis.call('zcard', KEYS[2]) >= cap then
+    return -1
+end
+redis.call('set', KEYS[1], ARGV[1], 'PX', ARGV[2])
+redis.call('zadd', KEYS[2], ARGV[3] + ARGV[2], ARGV[1])
+redis.call('pexpire', KEYS[2], ARGV[2])
+redis.call('del', KEYS[3])
+return 1
+"""
+
+# KEYS: lease, user leases
+# ARGV: token, ttl ms, now ms
+_EXTEND_SCRIPT = """
+if redis.call('get', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('pexpire', KEYS[1], ARGV[2])
+redis.call('zadd', KEYS[2], ARGV[3] + ARGV[2], ARGV[1])
+redis.call('pexpire', KEYS[2], ARGV[2])
+return 1
+"""
+
+# The pending run is handed back even if the lease already expired, unless
+# another task took the lease since and will hand it back itself
+# KEYS: lease, user leases, pending run
+# ARGV: token
+_RELEASE_SCRIPT = """
+redis.call('zrem', KEYS[2], ARGV[1])
+local holder = redis.call('get', KEYS[1])
+if holder == ARGV[1] then
+    redis.call('del', KEYS[1])
+elseif holder then
+    return false
+end
+local pending = redis.call('get', KEYS[3])
+redis.call('del', KEYS[3])
+return pending
+"""
+
+
+class ConnectorLease:
+    """A held connector lease, extended by a heartbeat thread until released."""
+
+    def __init__(
+        self,
+        service: "ConnectorLeaseService",
+        connector_id: int,
+        user_id: str,
+        token: str,
+    ):
+        self.service = service
+        self.connector_id = connector_id
+        self.user_id = user_id
+        self.token = token
+        self._stop = threading.Event()
+        self._heartbeat = threading.Thread(
+            target=self._extend_until_released,
+            name=f"connector-lease-{connector_id}",
+            daemon=True,
+        )
+        self._heartbeat.start()
+
+    def _extend_until_released(self) -> None:
+        """Extend the lease every third of its time-to-live."""
+        interval = self.service.ttl_seconds / 3
+        while not self._stop.wait(interval):
+            try:
+                if not self.service.extend(self.connector_id, self.user_id, self.token):
+                    logger.warning(
+                        f"Lease of connector {self.connector_id} was lost while indexing"
+                    )
+                    return
+            except Exception as e:
+                logger.warning(
+                    f"Failed to extend lease of connector {self.connector_id}: {e!s}"
+                )
+
+    def release(self) -> list[Any] | None:
+        """
+        Stop the heartbeat and release the lease.
+
+        Returns:
+            Arguments of a run requested while the lease was held, if any
+        """
+        self._stop.set()
+        self._heartbeat.join()
+        return self.service.release(self.connector_id, self.user_id, self.token)
+
+
+class ConnectorLeaseService:
+    """
+    Service granting connector leases from Redis.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        ttl_seconds: int = 120,
+        max_concurrent_per_user: int = 2,
+    ):
+        """
+        Initialize the connector lease service
+
+        Args:
+            redis_url: Redis URL storing the leases
+            ttl_seconds: Time after which a lease that isn't extended expires
+            max_concurrent_per_user: Maximum connectors indexed at once per user
+                (0 = unlimited)
+        """
+        import redis
+
+        self.redis = redis.Redis.from_url(redis_url)
+        self.ttl_seconds = max(3, ttl_seconds)
+        self.max_concurrent_per_user = max(0, max_concurrent_per_user)
+
+        self._acquire = self.redis.register_script(_ACQUIRE_SCRIPT)
+        self._extend = self.redis.register_script(_EXTEND_SCRIPT)
+        self._release = self.redis.register_script(_RELEASE_SCRIPT)
+
+    @staticmethod
+    def _keys(connector_id: int, user_id: str) -> list[str]:
+        """Build the lease, user leases and pending run keys."""
+        return [
+            f"connector_lease:{connector_id}",
+            f"connector_lease:user:{user_id}",
+            f"connector_lease:pending:{connector_id}",
+        ]
+
+    def acquire(
+        self,
+        connector_id: int,
+        user_id: str,
+        token: str,
+        pending_args: list[Any],
+    ) -> tuple[str, ConnectorLease | None]:
+        """
+        Try to take the lease of a connector.
+
+        If the connector is already being indexed, pending_args are stored so the
+        running task enqueues one more run when it finishes; later requests
+        replace the stored arguments instead of adding runs.
+
+        Args:
+            connector_id: ID of the connector
+            user_id: ID of the user owning the connector
+            token: Unique ID of the requesting task
+            pending_args: Task arguments of the run to coalesce
+
+        Returns:
+            Tuple of (LEASE_ACQUIRED, LEASE_COALESCED or LEASE_USER_LIMIT, the held
+            lease or None)
+        """
+        result = self._acquire(
+            keys=self._keys(connector_id, user_id),
+            args=[
+                token,
+                self.ttl_seconds * 1000,
+                int(time.time() * 1000),
+                self.max_concurrent_per_user,
+                json.dumps(pending_args),
+                PENDING_RUN_TTL_MS,
+            ],
+        )
+        if result == 1:
+            return LEASE_ACQUIRED, ConnectorLease(self, connector_id, user_id, token)
+        if result == 0:
+            return LEASE_COALESCED, None
+        return LEASE_USER_LIMIT, None
+
+    def extend(self, connector_id: int, user_id: str, token: str) -> bool:
+        """
+        Extend a held lease by its time-to-live.
+
+        Returns:
+            bool: False if the lease expired or belongs to another task
+        """
+        keys = self._keys(connector_id, user_id)[:2]
+        return bool(
+            self._extend(
+                keys=keys,
+                args=[token, self.ttl_seconds * 1000, int(time.time() * 1000)],
+            )
+        )
+
+    def release(self, connector_id: int, user_id: str, token: str) -> list[Any] | None:
+        """
+        Release a held lease.
+
+        Returns:
+            Arguments of a run requested while the lease was held, if any, also
+            when the lease expired meanwhile and no other task took it
+        """
+        pending = self._release(keys=self._keys(connector_id, user_id), args=[token])
+        return json.loads(pending) if pending else None
+
+
+_connector_lease_service: ConnectorLeaseService | None = None
+_connector_lease_service_disabled = False
+
+
+def get_connector_lease_service() -> ConnectorLeaseService | None:
+    """
+    Get the process-wide connector lease service built from the global configuration.
+
+    Returns:
+        ConnectorLeaseService: The shared lease service, or None if leases are
+        disabled or Redis is unavailable
+    """
+    global _connector_lease_service, _connector_lease_service_disabled
+    if _connector_lease_service is None and not _connector_lease_service_disabled:
+        from app.config import config
+
+        if not config.CONNECTOR_LEASE_REDIS_URL:
+            _connector_lease_service_disabled = True
+            return None
+        try:
+            _connector_lease_service = ConnectorLeaseService(
+                redis_url=config.CONNECTOR_LEASE_REDIS_URL,
+                ttl_seconds=config.CONNECTOR_LEASE_TTL_SECONDS,
+                max_concurrent_per_user=config.CONNECTOR_MAX_CONCURRENT_PER_USER,
+            )
+        except Exception as e:
+            logger.warning(f"Connector leases disabled: {e!s}")
+            _connector_lease_service_disabled = True
+    return _connector_lease_service
@@ -27,12 +27,43 @@ class ConnectorService:
         self.chunk_retriever = ChucksHybridSearchRetriever(session)
         self.document_retriever = DocumentHybridSearchRetriever(session)
         self.user_id = user_id
-        self.source_id_counter = (
+        # Next source ID, boxed so services forked from this one share it
+        self._source_id_state = [
             100000  # High starting value to avoid collisions with existing IDs
-        )
+        ]
         self.counter_lock = (
             asyncio.Lock()
         )  # Lock to protect counter in multithreaded environments
+        # Chunk search results fetched ahead of time by prefetch_chunk_searches
+        self._prefetched_chunk_results: dict[tuple, list[dict[str, Any]]] = {}
+
+    @property
+    def source_id_counter(self) -> int:
+        return self._source_id_state[0]
+
+    @source_id_counter.setter
+    def source_id_counter(self, value: int) -> None:
+        self._source_id_state[0] = value
+
+    def fork(self, session: AsyncSession) -> "ConnectorService":
+        """
+        Create a service searching with another database session.
+
+        An AsyncSession can't run queries concurrently, so concurrent searches each
+        use a fork with its own session. Forks share the source ID counter, its
+        lock and the prefetched search results with this service.
+
+        Args:
+            session: The database session of the fork
+
+        Returns:
+            ConnectorService: The forked service
+        """
+        service = ConnectorService(session, self.user_id)
+        service._source_id_state = self._source_id_state
+        service.counter_lock = self.counter_lock
+        service._prefetched_chunk_results = self._prefetched_chunk_results
+        return service
 
     async def initialize_counter(self):
         """
@@ -74,7 +105,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            crawled_urls_chunks = await self.chunk_retriever.hybrid_search(
+            crawled_urls_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -148,7 +179,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            files_chunks = await self.chunk_retriever.hybrid_search(
+            files_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -207,6 +238,67 @@ class ConnectorService:
 
         return result_object, files_chunks
 
+    async def prefetch_chunk_searches(
+        self,
+        user_query: str,
+        user_id: str,
+        search_space_id: int,
+        document_types: list[str],
+        top_k: int = 20,
+    ) -> None:
+        """
+        Run the chunk searches of several local connectors in one database round trip.
+
+        The results are kept on the service so the following search_* calls for the
+        same query and parameters are served without hitting the database again.
+
+        Args:
+            user_query: The user's query
+            user_id: The user's ID
+            search_space_id: The search space ID to search in
+            document_types: Document types of the connectors that will be searched
+            top_k: Maximum number of results per document type
+        """
+        if len(document_types) < 2:
+            return
+
+        # Savepoint so a failed batched search leaves the session usable for fallbacks
+        async with self.session.begin_nested():
+            results_by_type = await self.chunk_retriever.hybrid_search_many(
+                query_text=user_query,
+                top_k=top_k,
+                user_id=user_id,
+                search_space_id=search_space_id,
+                document_types=document_types,
+            )
+
+        for document_type, chunks in results_by_type.items():
+            key = (user_query, user_id, search_space_id, top_k, document_type)
+            self._prefetched_chunk_results[key] = chunks
+
+    async def _search_chunks(
+        self,
+        query_text: str,
+        top_k: int,
+        user_id: str,
+        search_space_id: int,
+        document_type: str,
+    ) -> list[dict[str, Any]]:
+        """
+        Search chunks of one document type, using prefetched results when available.
+        """
+        key = (query_text, user_id, search_space_id, top_k, document_type)
+        if key in self._prefetched_chunk_results:
+            return self._prefetched_chunk_results.pop(key)
+
+        return await self.chunk_retriever.hybrid_search(
+            query_text=query_text,
+            top_k=top_k,
+            user_id=user_id,
+            search_space_id=search_space_id,
+            document_type=document_type,
+        )
+
     def _transform_document_results(
         self, document_results: list[dict[str, Any]]
     ) -> list[dict[str, Any]]:
@@ -801,7 +893,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            slack_chunks = await self.chunk_retriever.hybrid_search(
+            slack_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -895,7 +987,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            notion_chunks = await self.chunk_retriever.hybrid_search(
+            notion_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -992,7 +1084,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            extension_chunks = await self.chunk_retriever.hybrid_search(
+            extension_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -1113,7 +1205,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            youtube_chunks = await self.chunk_retriever.hybrid_search(
+            youtube_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -1204,7 +1296,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            github_chunks = await self.chunk_retriever.hybrid_search(
+            github_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -1285,7 +1377,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            linear_chunks = await self.chunk_retriever.hybrid_search(
+            linear_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -1395,7 +1487,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            jira_chunks = await self.chunk_retriever.hybrid_search(
+            jira_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -1516,7 +1608,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            calendar_chunks = await self.chunk_retriever.hybrid_search(
+            calendar_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -1649,7 +1741,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            airtable_chunks = await self.chunk_retriever.hybrid_search(
+            airtable_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -1737,7 +1829,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            gmail_chunks = await self.chunk_retriever.hybrid_search(
+            gmail_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -1861,7 +1953,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            confluence_chunks = await self.chunk_retriever.hybrid_search(
+            confluence_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -1956,7 +2048,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            clickup_chunks = await self.chunk_retriever.hybrid_search(
+            clickup_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -2194,7 +2286,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            discord_chunks = await self.chunk_retriever.hybrid_search(
+            discord_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -2292,7 +2384,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            luma_chunks = await self.chunk_retriever.hybrid_search(
+            luma_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
@@ -2450,7 +2542,7 @@ class ConnectorService:
             tuple: (sources_info, langchain_documents)
         """
         if search_mode == SearchMode.CHUNKS:
-            elasticsearch_chunks = await self.chunk_retriever.hybrid_search(
+            elasticsearch_chunks = await self._search_chunks(
                 query_text=user_query,
                 top_k=top_k,
                 user_id=user_id,
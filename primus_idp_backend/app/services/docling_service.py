@@ -4,6 +4,7 @@ Docling Document Processing Service for Primus IDP
 SSL-safe implementation with pre-downloaded models
 """
 
+import asyncio
 import logging
 import os
 import ssl
@@ -164,6 +165,49 @@ class DoclingService:
             logger.warning(f"⚠️ EasyOCR configuration failed: {e}")
             return None
 
+    def convert_to_markdown(
+        self, file_path: str, page_range: tuple[int, int] | None = None
+    ) -> str:
+        """
+        Convert a document to markdown synchronously.
+
+        Args:
+            file_path: Path to the document
+            page_range: Optional 1-based inclusive (first, last) page range
+
+        Returns:
+            Markdown content of the document (or of the page range)
+        """
+        if self.converter is None:
+            raise RuntimeError("Docling converter not initialized")
+
+        # Process document with local models
+        if page_range is not None:
+            result = self.converter.convert(file_path, page_range=page_range)
+        else:
+            result = self.converter.convert(file_path)
+
+        # Extract content using version-safe methods
+        content = None
+        if hasattr(result, "document") and result.document:
+            # Try different export methods (version compatibility)
+            if hasattr(result.document, "export_to_markdown"):
+                content = result.document.export_to_markdown()
+                logger.info("📄 Used export_to_markdown method")
+            elif hasattr(result.document, "to_markdown"):
+                content = result.document.to_markdown()
+                logger.info("📄 Used to_markdown method")
+            elif hasattr(result.document, "text"):
+                content = result.document.text
+                logger.info("📄 Used text property")
+            elif hasattr(result.document, "__str__"):
+                content = str(result.document)
+                logger.info("📄 Used string conversion")
+        else:
+            raise ValueError("No document object returned by Docling")
+
+        return content or ""
+
     async def process_document(
         self, file_path: str, filename: str | None = None
     ) -> dict[str, Any]:
@@ -177,42 +221,23 @@ class DoclingService:
                 f"🔄 Processing {filename} with Docling (using local models)..."
             )
 
-            # Process document with local models
-            result = self.converter.convert(file_path)
+            # Run the CPU-bound conversion off the event loop
+            content = await asyncio.to_thread(self.convert_to_markdown, file_path)
 
-            # Extract content using version-safe methods
-            content = None
-            if hasattr(result, "document") and result.document:
-                # Try different export methods (version compatibility)
-                if hasattr(result.document, "export_to_markdown"):
-                    content = result.document.export_to_markdown()
-                    logger.info("📄 Used export_to_markdown method")
-                elif hasattr(result.document, "to_markdown"):
-                    content = result.document.to_markdown()
-                    logger.info("📄 Used to_markdown method")
-                elif hasattr(result.document, "text"):
-                    content = result.document.text
-                    logger.info("📄 Used text property")
-                elif hasattr(result.document, "__str__"):
-                    content = str(result.document)
-                    logger.info("📄 Used string conversion")
-
-                if content:
-                    logger.info(
-                        f"✅ Docling SUCCESS - {filename}: {len(content)} chars (local models)"
-                    )
-
-                    return {
-                        "content": content,
-                        "full_text": content,
-                        "service_used": "docling",
-                        "status": "success",
-                        "processing_notes": "Processed with Docling using pre-downloaded models",
-                    }
-                else:
-                    raise ValueError("No content could be extracted from document")
-            else:
-                raise ValueError("No document object returned by Docling")
+            if not content:
+                raise ValueError("No content could be extracted from document")
+
+            logger.info(
+                f"✅ Docling SUCCESS - {filename}: {len(content)} chars (local models)"
+            )
+
+            return {
+                "content": content,
+                "full_text": content,
+                "service_used": "docling",
+                "status": "success",
+                "processing_notes": "Processed with Docling using pre-downloaded models",
+            }
 
         except Exception as e:
             logger.error(f"❌ Docling processing failed for {filename}: {e}")
@@ -226,7 +251,7 @@ class DoclingService:
         self, content: str, llm, document_title: str = "Document"
     ) -> str:
         """
-        Process large documents using chunked LLM summarization.
+        Process large documents using concurrent map-reduce LLM summarization.
 
         Args:
             content: The full document content
@@ -236,135 +261,12 @@ class DoclingService:
         Returns:
             Final summary of the document
         """
-        # Large document threshold (100K characters ≈ 25K tokens)
-        large_document_threshold = 100_000
-
-        if len(content) <= large_document_threshold:
-            # For smaller documents, use direct processing
-            logger.info(
-                f"📄 Document size: {len(content)} chars - using direct processing"
-            )
-            from app.prompts import SUMMARY_PROMPT_TEMPLATE
-
-            summary_chain = SUMMARY_PROMPT_TEMPLATE | llm
-            result = await summary_chain.ainvoke({"document": content})
-            return result.content
-
-        logger.info(
-            f"📚 Large document detected: {len(content)} chars - using chunked processing"
-        )
-
-        # Import chunker from config
-        # Create LLM-optimized chunks (8K tokens max for safety)
-        from chonkie import OverlapRefinery, RecursiveChunker
-        from langchain_core.prompts import PromptTemplate
-
-        llm_chunker = RecursiveChunker(
-            chunk_size=8000  # Conservative for most LLMs
-        )
+        from app.services.document_summary_service import get_document_summarizer
 
-        # Apply overlap refinery for context preservation (10% overlap = 800 tokens)
-        overlap_refinery = OverlapRefinery(
-            context_size=0.1,  # 10% overlap for context preservation
-            method="suffix",  # Add next chunk context to current chunk
+        return await get_document_summarizer().summarize(
+            content, llm, document_title=document_title
         )
 
-        # First chunk the content, then apply overlap refinery
-        initial_chunks = llm_chunker.chunk(content)
-        chunks = overlap_refinery.refine(initial_chunks)
-        total_chunks = len(chunks)
-
-        logger.info(f"📄 Split into {total_chunks} chunks for LLM processing")
-
-        # Template for chunk processing
-        chunk_template = PromptTemplate(
-            input_variables=["chunk", "chunk_number", "total_chunks"],
-            template="""<INSTRUCTIONS>
-You are summarizing chunk {chunk_number} of {total_chunks} from a large document.
-
-Create a comprehensive summary of this document chunk. Focus on:
-- Key concepts, facts, and information
-- Important details and context
-- Main topics and themes
-
-Provide a clear, structured summary that captures the essential content.
-
-Chunk {chunk_number}/{total_chunks}:
-<document_chunk>
-{chunk}
-</document_chunk>
-</INSTRUCTIONS>""",
-        )
-
-        # Process each chunk individually
-        chunk_summaries = []
-        for i, chunk in enumerate(chunks, 1):
-            try:
-                logger.info(
-                    f"🔄 Processing chunk {i}/{total_chunks} ({len(chunk.text)} chars)"
-                )
-
-                chunk_chain = chunk_template | llm
-                chunk_result = await chunk_chain.ainvoke(
-                    {
-                        "chunk": chunk.text,
-                        "chunk_number": i,
-                        "total_chunks": total_chunks,
-                    }
-                )
-
-                chunk_summary = chunk_result.content
-                chunk_summaries.append(f"=== Section {i} ===\n{chunk_summary}")
-
-                logger.info(f"✅ Completed chunk {i}/{total_chunks}")
-
-            except Exception as e:
-                logger.error(f"❌ Failed to process chunk {i}/{total_chunks}: {e}")
-                chunk_summaries.append(f"=== Section {i} ===\n[Processing failed]")
-
-        # Combine summaries into final document summary
-        logger.info(f"🔄 Combining {len(chunk_summaries)} chunk summaries")
-
-        try:
-            combine_template = PromptTemplate(
-                input_variables=["summaries", "document_title"],
-                template="""<INSTRUCTIONS>
-You are combining multiple section summaries into a final comprehensive document summary.
-
-Create a unified, coherent summary from the following section summaries of "{document_title}".
-Ensure:
-- Logical flow and organization
-- No redundancy or repetition  
-- Comprehensive coverage of all key points
-- Professional, objective tone
-
-<section_summaries>
-{summaries}
-</section_summaries>
-</INSTRUCTIONS>""",
-            )
-
-            combined_summaries = "\n\n".join(chunk_summaries)
-            combine_chain = combine_template | llm
-
-            final_result = await combine_chain.ainvoke(
-                {"summaries": combined_summaries, "document_title": document_title}
-            )
-
-            final_summary = final_result.content
-            logger.info(
-                f"✅ Large document processing complete: {len(final_summary)} chars summary"
-            )
-
-            return final_summary
-
-        except Exception as e:
-            logger.error(f"❌ Failed to combine summaries: {e}")
-            # Fallback: return concatenated chunk summaries
-            fallback_summary = "\n\n".join(chunk_summaries)
-            logger.warning("⚠️ Using fallback combined summary")
-            return fallback_summary
-
 
 def create_docling_service() -> DoclingService:
     """Create a Docling service instance."""
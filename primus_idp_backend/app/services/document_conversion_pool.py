@@ -0,0 +1,351 @@
+"""
+Document conversion worker pool for Docling.
+
+Docling conversion is CPU-bound and can take minutes for large PDFs. Running it
+in the event loop blocks every other coroutine of the API process or Celery
+worker, so conversions run in a pool of worker processes that each keep an
+initialized DocumentConverter. Large PDFs are split into page ranges that are
+converted in parallel and stitched back together in order.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Docling service of the current worker process, created by the pool initializer
+_worker_service = None
+
+
+def _init_worker() -> None:
+    """Initialize a pool worker with its own Docling converter."""
+    global _worker_service
+
+    from app.services.docling_service import DoclingService
+
+    _worker_service = DoclingService()
+
+
+def _convert_in_worker(file_path: str, page_range: tuple[int, int] | None) -> str:
+    """Convert a document (or a page range of it) inside a pool worker."""
+    return _worker_service.convert_to_markdown(file_path, page_range=page_range)
+
+
+def _count_pdf_pages(file_path: str) -> int | None:
+    """
+    Count the pages of a PDF without converting it.
+
+    Args:
+        file_path: Path to the document
+
+    Returns:
+        Number of pages, or None if the file is not a readable PDF
+    """
+    if not file_path.lower().endswith(".pdf"):
+        return None
+    try:
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    except Exception as e:
+        logger.warning(f"Could not count pages of {file_path}: {e!s}")
+        return None
+
+
+class DocumentConversionPool:
+    """
+    Process pool converting documents to markdown with Docling.
+
+    Each worker process is a lane of its own, started lazily and kept warm
+    across conversions. A conversion waits for a free lane before its timeout
+    starts, and a conversion that times out (or is abandoned) only stops the
+    worker of its own lane, so the other conversions keep running. The number
+    of files converting or waiting at once is bounded; files past the bound are
+    rejected instead of queueing without limit.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 8,
+        timeout_seconds: float = 900,
+        pages_per_split: int = 25,
+    ):
+        """
+        Initialize the document conversion pool
+
+        Args:
+            max_workers: Number of worker processes (0 converts in a thread instead)
+            max_pending: Maximum number of files converting or waiting at once
+            timeout_seconds: Maximum time to convert a file or page range, counted
+                from when a worker starts on it
+            pages_per_split: Page range size PDFs are split into (0 disables splitting)
+        """
+        self.max_workers = max(0, max_workers)
+        self.max_pending = max(1, max_pending)
+        self.timeout_seconds = timeout_seconds
+        self.pages_per_split = max(0, pages_per_split)
+
+        lane_count = max(1, self.max_workers)
+        self._executors: list[ProcessPoolExecutor | None] = [None] * lane_count
+        self._executor_lock = threading.Lock()
+        self._local_service = None
+        self._local_lock = threading.Lock()
+
+        # Free lanes and the coroutines waiting for one, possibly on other loops
+        self._lane_lock = threading.Lock()
+        self._free_lanes: list[int] = list(range(lane_count))
+        self._lane_waiters: deque[
+            tuple[asyncio.AbstractEventLoop, asyncio.Future[int]]
+        ] = deque()
+        self._pending_files = 0
+
+    async def _acquire_lane(self) -> int:
+        """Wait until a lane is free and take it."""
+        with self._lane_lock:
+            if self._free_lanes:
+                return self._free_lanes.pop()
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            self._lane_waiters.append((loop, waiter))
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            # Pass on a lane handed over just before the cancellation
+            if waiter.done() and not waiter.cancelled():
+                self._release_lane(waiter.result())
+            raise
+
+    def _hand_over_lane(self, waiter: asyncio.Future[int], lane: int) -> None:
+        """Give a released lane to a waiter, on the waiter's loop."""
+        if waiter.done():
+            self._release_lane(lane)
+        else:
+            waiter.set_result(lane)
+
+    def _release_lane(self, lane: int) -> None:
+        """Hand a lane to the next waiter, or mark it free."""
+        with self._lane_lock:
+            while self._lane_waiters:
+                loop, waiter = self._lane_waiters.popleft()
+                if waiter.done():
+                    continue
+                try:
+                    loop.call_soon_threadsafe(self._hand_over_lane, waiter, lane)
+                    return
+                except RuntimeError:
+                    # The waiter's loop is closed
+                    continue
+            self._free_lanes.append(lane)
+
+    def _get_executor(self, lane: int) -> ProcessPoolExecutor | None:
+        """Get the worker of a lane, starting it on first use."""
+        if self.max_workers == 0:
+            return None
+
+        with self._executor_lock:
+            if self._executors[lane] is None:
+                try:
+                    # Spawn workers so they don't inherit model threads of the parent
+                    self._executors[lane] = ProcessPoolExecutor(
+                        max_workers=1,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Document conversion pool unavailable, converting in a thread: {e!s}"
+                    )
+                    self.max_workers = 0
+            return self._executors[lane]
+
+    def _reset_executor(self, lane: int) -> None:
+        """Stop the worker of a lane, terminating its conversion if still running."""
+        with self._executor_lock:
+            executor, self._executors[lane] = self._executors[lane], None
+        if executor is None:
+            return
+
+        if hasattr(executor, "terminate_workers"):
+            executor.terminate_workers()
+            return
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _convert_locally(
+        self, file_path: str, page_range: tuple[int, int] | None
+    ) -> str:
+        """Convert in the current process, used when no worker pool is available."""
+        # Threads can't be stopped, so a timed out conversion still holds the lock
+        with self._local_lock:
+            if self._local_service is None:
+                from app.services.docling_service import DoclingService
+
+                self._local_service = DoclingService()
+            return self._local_service.convert_to_markdown(
+                file_path, page_range=page_range
+            )
+
+    async def _convert_part(
+        self, file_path: str, page_range: tuple[int, int] | None
+    ) -> str:
+        """Convert a document or a page range once a lane is free."""
+        lane = await self._acquire_lane()
+        try:
+            executor = self._get_executor(lane)
+            if executor is None:
+                return await asyncio.wait_for(
+                    asyncio.to_thread(self._convert_locally, file_path, page_range),
+                    timeout=self.timeout_seconds,
+                )
+
+            # The lane's worker is idle, so the timeout only counts conversion time
+            future = executor.submit(_convert_in_worker, file_path, page_range)
+            try:
+                return await asyncio.wait_for(
+                    asyncio.wrap_future(future), timeout=self.timeout_seconds
+                )
+            except (TimeoutError, asyncio.CancelledError, BrokenProcessPool):
+                # Stop the stuck, abandoned or dead worker of this lane only; a
+                # fresh one is started for the next conversion
+                self._reset_executor(lane)
+                raise
+        finally:
+            self._release_lane(lane)
+
+    def _split_pages(self, file_path: str) -> list[tuple[int, int] | None]:
+        """Split a document into the page ranges converted in parallel."""
+        if not self.pages_per_split or self.max_workers < 2:
+            return [None]
+
+        page_count = _count_pdf_pages(file_path)
+        if not page_count or page_count <= self.pages_per_split:
+            return [None]
+
+        return [
+            (first, min(first + self.pages_per_split - 1, page_count))
+            for first in range(1, page_count + 1, self.pages_per_split)
+        ]
+
+    async def convert(
+        self, file_path: str, filename: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Convert a document to markdown with Docling.
+
+        Args:
+            file_path: Path to the document
+            filename: Original filename, used for logging
+
+        Returns:
+            Dict with the markdown content, in the format of DoclingService.process_document
+
+        Raises:
+            RuntimeError: If the conversion fails, times out or the pool is full
+        """
+        with self._lane_lock:
+            if self._pending_files >= self.max_pending:
+                logger.error(
+                    f"❌ Docling pool full ({self.max_pending} files pending), rejecting {filename}"
+                )
+                raise RuntimeError(
+                    f"Docling processing rejected: {self.max_pending} files are "
+                    "already being converted or waiting"
+                )
+            self._pending_files += 1
+
+        try:
+            return await self._convert_file(file_path, filename)
+        finally:
+            with self._lane_lock:
+                self._pending_files -= 1
+
+    async def _convert_file(
+        self, file_path: str, filename: str | None
+    ) -> dict[str, Any]:
+        """Convert the parts of an admitted document and join them."""
+        page_ranges = self._split_pages(file_path)
+        logger.info(
+            f"🔄 Processing {filename} with Docling in {len(page_ranges)} part(s)..."
+        )
+
+        tasks = [
+            asyncio.ensure_future(self._convert_part(file_path, page_range))
+            for page_range in page_ranges
+        ]
+        try:
+            parts = await asyncio.gather(*tasks)
+        except TimeoutError as e:
+            logger.error(
+                f"❌ Docling processing timed out after {self.timeout_seconds}s for {filename}"
+            )
+            raise RuntimeError(
+                f"Docling processing timed out after {self.timeout_seconds} seconds"
+            ) from e
+        except Exception as e:
+            logger.error(f"❌ Docling processing failed for {filename}: {e}")
+            raise RuntimeError(f"Docling processing failed: {e}") from e
+        finally:
+            # Parts of a failed document that are still waiting or converting
+            # are not needed anymore
+            for task in tasks:
+                task.cancel()
+
+        content = "\n\n".join(part for part in parts if part)
+        if not content:
+            raise RuntimeError(
+                "Docling processing failed: No content could be extracted from document"
+            )
+
+        logger.info(f"✅ Docling SUCCESS - {filename}: {len(content)} chars")
+
+        return {
+            "content": content,
+            "full_text": content,
+            "service_used": "docling",
+            "status": "success",
+            "processing_notes": "Processed with Docling using pre-downloaded models",
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker pool."""
+        with self._executor_lock:
+            executors, self._executors = self._executors, [None] * len(self._executors)
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+
+_document_conversion_pool: DocumentConversionPool | None = None
+
+
+def get_document_conversion_pool() -> DocumentConversionPool:
+    """
+    Get the process-wide document conversion pool built from the global configuration.
+
+    Returns:
+        DocumentConversionPool: The shared document conversion pool instance
+    """
+    global _document_conversion_pool
+
+    if _document_conversion_pool is None:
+        from app.config import config
+
+        _document_conversion_pool = DocumentConversionPool(
+            max_workers=config.DOCLING_POOL_WORKERS,
+            max_pending=config.DOCLING_POOL_MAX_PENDING,
+            timeout_seconds=config.DOCLING_CONVERSION_TIMEOUT,
+            pages_per_split=config.DOCLING_PAGES_PER_SPLIT,
+        )
+    return _document_conversion_pool
@@ -0,0 +1,440 @@
+"""
+Map-reduce summarization of large documents.
+
+Large documents are split into chunks that are summarized concurrently (map),
+then the chunk summaries are combined into a single summary (reduce). When the
+joined summaries do not fit the model's context window, they are combined in
+groups over several levels until they do. Chunk summaries are cached by content
+hash, so re-uploading an edited document only re-summarizes changed chunks.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import weakref
+from collections import OrderedDict
+
+from langchain_core.prompts import PromptTemplate
+
+logger = logging.getLogger(__name__)
+
+# Large document threshold (100K characters ≈ 25K tokens)
+LARGE_DOCUMENT_THRESHOLD = 100_000
+
+# Tokens reserved for the combine prompt and the generated summary
+REDUCE_RESERVED_TOKENS = 4000
+
+CHUNK_SUMMARY_PROMPT = PromptTemplate(
+    input_variables=["chunk", "chunk_number", "total_chunks"],
+    template="""<INSTRUCTIONS>
+You are summarizing chunk {chunk_number} of {total_chunks} from a large document.
+
+Create a comprehensive summary of this document chunk. Focus on:
+- Key concepts, facts, and information
+- Important details and context
+- Main topics and themes
+
+Provide a clear, structured summary that captures the essential content.
+
+Chunk {chunk_number}/{total_chunks}:
+<document_chunk>
+{chunk}
+</document_chunk>
+</INSTRUCTIONS>""",
+)
+
+COMBINE_SUMMARIES_PROMPT = PromptTemplate(
+    input_variables=["summaries", "document_title"],
+    template="""<INSTRUCTIONS>
+You are combining multiple section summaries into a final comprehensive document summary.
+
+Create a unified, coherent summary from the following section summaries of "{document_title}".
+Ensure:
+- Logical flow and organization
+- No redundancy or repetition
+- Comprehensive coverage of all key points
+- Professional, objective tone
+
+<section_summaries>
+{summaries}
+</section_summaries>
+</INSTRUCTIONS>""",
+)
+
+
+class ChunkSummaryCache:
+    """
+    Cache of chunk summaries keyed by model and chunk content hash.
+
+    Summaries are kept in an in-process LRU and, when a Redis URL is configured,
+    in Redis so every worker reuses them.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4096,
+        ttl_seconds: int = 2592000,
+        redis_url: str | None = None,
+    ):
+        """
+        Initialize the chunk summary cache
+
+        Args:
+            max_size: Maximum number of summaries kept in the in-process tier
+            ttl_seconds: Time-to-live of cached summaries in both tiers
+            redis_url: Optional Redis URL enabling the shared tier
+        """
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = max(1, ttl_seconds)
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+        self._redis_url = redis_url
+        self._redis_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def make_key(model_name: str, chunk_text: str) -> str:
+        """Build the cache key from the model name and chunk content."""
+        digest = hashlib.sha256(f"{model_name}:{chunk_text}".encode()).hexdigest()
+        return f"chunk_summary:{digest}"
+
+    def _get_redis(self):
+        """Get a Redis client bound to the running event loop, if configured."""
+        if not self._redis_url:
+            return None
+
+        loop = asyncio.get_running_loop()
+        client = self._redis_clients.get(loop)
+        if client is None:
+            try:
+                import redis.asyncio as aioredis
+
+                client = aioredis.from_url(self._redis_url)
+            except Exception as e:
+                logger.warning(f"Chunk summary Redis tier disabled: {e!s}")
+                self._redis_url = None
+                return None
+            self._redis_clients[loop] = client
+        return client
+
+    async def get(self, key: str) -> str | None:
+        """
+        Get a cached chunk summary.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            The cached summary, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, summary = entry
+            if expires_at >= time.monotonic():
+                self._entries.move_to_end(key)
+                return summary
+            del self._entries[key]
+
+        redis_client = self._get_redis()
+        if redis_client is None:
+            return None
+        try:
+            payload = await redis_client.get(key)
+        except Exception as e:
+            logger.warning(f"Chunk summary Redis lookup failed: {e!s}")
+            return None
+        if payload is None:
+            return None
+
+        summary = payload.decode()
+        self._set_local(key, summary)
+        return summary
+
+    def _set_local(self, key: str, summary: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, summary)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def set(self, key: str, summary: str) -> None:
+        """
+        Store a chunk summary.
+
+        Args:
+            key: Cache key from make_key
+            summary: Summary of the chunk
+        """
+        self._set_local(key, summary)
+
+        redis_client = self._get_redis()
+        if redis_client is None:
+            return
+        try:
+            await redis_client.set(key, summary.encode(), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Chunk summary Redis store failed: {e!s}")
+
+
+class MapReduceSummarizer:
+    """Concurrent map-reduce summarizer for large documents."""
+
+    def __init__(
+        self,
+        cache: ChunkSummaryCache,
+        max_concurrency: int = 4,
+        concurrency_overrides: dict[str, int] | None = None,
+    ):
+        """
+        Initialize the summarizer
+
+        Args:
+            cache: Cache of chunk summaries
+            max_concurrency: Default number of concurrent LLM calls per LLM config
+            concurrency_overrides: Concurrent LLM call limits by litellm model string
+        """
+        self.cache = cache
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency_overrides = concurrency_overrides or {}
+
+        # Semaphores per event loop, then per LLM config
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _get_semaphore(self, llm) -> asyncio.Semaphore:
+        """Get the semaphore limiting concurrent calls to an LLM config."""
+        model_name = getattr(llm, "model", "") or ""
+        llm_key = f"{model_name}|{getattr(llm, 'api_base', '') or ''}"
+
+        loop_semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        if llm_key not in loop_semaphores:
+            limit = self.concurrency_overrides.get(model_name, self.max_concurrency)
+            loop_semaphores[llm_key] = asyncio.Semaphore(max(1, limit))
+        return loop_semaphores[llm_key]
+
+    async def _invoke(self, llm, prompt: PromptTemplate, inputs: dict) -> str:
+        """Invoke the LLM within its concurrency limit."""
+        async with self._get_semaphore(llm):
+            result = await (prompt | llm).ainvoke(inputs)
+        return result.content
+
+    async def _summarize_chunk(
+        self, llm, chunk_text: str, chunk_number: int, total_chunks: int
+    ) -> str:
+        """Summarize one chunk, reusing the cached summary of unchanged content."""
+        cache_key = self.cache.make_key(getattr(llm, "model", ""), chunk_text)
+        cached_summary = await self.cache.get(cache_key)
+        if cached_summary is not None:
+            logger.info(
+                f"♻️ Reused cached summary for chunk {chunk_number}/{total_chunks}"
+            )
+            return f"=== Section {chunk_number} ===\n{cached_summary}"
+
+        try:
+            logger.info(
+                f"🔄 Processing chunk {chunk_number}/{total_chunks} ({len(chunk_text)} chars)"
+            )
+            chunk_summary = await self._invoke(
+                llm,
+                CHUNK_SUMMARY_PROMPT,
+                {
+                    "chunk": chunk_text,
+                    "chunk_number": chunk_number,
+                    "total_chunks": total_chunks,
+                },
+            )
+            await self.cache.set(cache_key, chunk_summary)
+            logger.info(f"✅ Completed chunk {chunk_number}/{total_chunks}")
+            return f"=== Section {chunk_number} ===\n{chunk_summary}"
+        except Exception as e:
+            logger.error(
+                f"❌ Failed to process chunk {chunk_number}/{total_chunks}: {e}"
+            )
+            return f"=== Section {chunk_number} ===\n[Processing failed]"
+
+    @staticmethod
+    def _group_summaries(
+        summaries: list[str], summary_token_counts: list[int], token_budget: int
+    ) -> list[list[str]]:
+        """Group consecutive summaries so each group fits the token budget."""
+        groups: list[list[str]] = []
+        current: list[str] = []
+        current_tokens = 0
+
+        for summary, summary_tokens in zip(
+            summaries, summary_token_counts, strict=True
+        ):
+            # Every group needs at least two summaries so each level shrinks
+            if (
+                current
+                and len(current) >= 2
+                and current_tokens + summary_tokens > token_budget
+            ):
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(summary)
+            current_tokens += summary_tokens
+
+        if current:
+            if len(current) == 1 and groups:
+                groups[-1].extend(current)
+            else:
+                groups.append(current)
+        return groups
+
+    async def _reduce(self, llm, summaries: list[str], document_title: str) -> str:
+        """Combine summaries, reducing hierarchically until they fit the context window."""
+        from app.services.token_counting_service import get_token_counting_service
+        from app.utils.document_converters import get_model_context_window
+
+        token_service = get_token_counting_service()
+        model_name = getattr(llm, "model", "gpt-3.5-turbo")
+        token_budget = max(
+            1000, get_model_context_window(model_name) - REDUCE_RESERVED_TOKENS
+        )
+
+        level = 1
+        while len(summaries) > 1:
+            summary_token_counts = token_service.count_tokens_batch(
+                summaries, model_name
+            )
+            if sum(summary_token_counts) <= token_budget:
+                break
+
+            groups = self._group_summaries(
+                summaries, summary_token_counts, token_budget
+            )
+            if len(groups) == 1:
+                break
+            logger.info(
+                f"🔄 Reduce level {level}: combining {len(summaries)} summaries in {len(groups)} groups"
+            )
+            summaries = await asyncio.gather(
+                *(
+                    self._invoke(
+                        llm,
+                        COMBINE_SUMMARIES_PROMPT,
+                        {
+                            "summaries": "\n\n".join(group),
+                            "document_title": document_title,
+                        },
+                    )
+                    for group in groups
+                )
+            )
+            level += 1
+
+        return await self._invoke(
+            llm,
+            COMBINE_SUMMARIES_PROMPT,
+            {"summaries": "\n\n".join(summaries), "document_title": document_title},
+        )
+
+    async def summarize(
+        self, content: str, llm, document_title: str = "Document"
+    ) -> str:
+        """
+        Summarize a document, using map-reduce for large documents.
+
+        Args:
+            content: The full document content
+            llm: The language model to use for summarization
+            document_title: Title of the document for context
+
+        Returns:
+            Final summary of the document
+        """
+        if len(content) <= LARGE_DOCUMENT_THRESHOLD:
+            # For smaller documents, use direct processing
+            logger.info(
+                f"📄 Document size: {len(content)} chars - using direct processing"
+            )
+            from app.prompts import SUMMARY_PROMPT_TEMPLATE
+
+            return await self._invoke(
+                llm, SUMMARY_PROMPT_TEMPLATE, {"document": content}
+            )
+
+        logger.info(
+            f"📚 Large document detected: {len(content)} chars - using chunked processing"
+        )
+
+        # Create LLM-optimized chunks (8K tokens max for safety)
+        from chonkie import OverlapRefinery, RecursiveChunker
+
+        llm_chunker = RecursiveChunker(
+            chunk_size=8000  # Conservative for most LLMs
+        )
+
+        # Apply overlap refinery for context preservation (10% overlap = 800 tokens)
+        overlap_refinery = OverlapRefinery(
+            context_size=0.1,  # 10% overlap for context preservation
+            method="suffix",  # Add next chunk context to current chunk
+        )
+
+        # First chunk the content, then apply overlap refinery
+        chunks = overlap_refinery.refine(llm_chunker.chunk(content))
+        total_chunks = len(chunks)
+
+        logger.info(f"📄 Split into {total_chunks} chunks for LLM processing")
+
+        # Map: summarize all chunks concurrently, keeping document order
+        chunk_summaries = await asyncio.gather(
+            *(
+                self._summarize_chunk(llm, chunk.text, i, total_chunks)
+                for i, chunk in enumerate(chunks, 1)
+            )
+        )
+
+        # Reduce: combine chunk summaries into the final document summary
+        logger.info(f"🔄 Combining {len(chunk_summaries)} chunk summaries")
+
+        try:
+            final_summary = await self._reduce(llm, chunk_summaries, document_title)
+            logger.info(
+                f"✅ Large document processing complete: {len(final_summary)} chars summary"
+            )
+            return final_summary
+
+        except Exception as e:
+            logger.error(f"❌ Failed to combine summaries: {e}")
+            # Fallback: return concatenated chunk summaries
+            logger.warning("⚠️ Using fallback combined summary")
+            return "\n\n".join(chunk_summaries)
+
+
+def _parse_concurrency_overrides(value: str | None) -> dict[str, int]:
+    """Parse "model=limit,model=limit" into a dict of concurrency limits."""
+    overrides = {}
+    for item in (value or "").split(","):
+        model_name, _, limit = item.strip().rpartition("=")
+        if model_name and limit.isdigit():
+            overrides[model_name] = int(limit)
+    return overrides
+
+
+_document_summarizer: MapReduceSummarizer | None = None
+
+
+def get_document_summarizer() -> MapReduceSummarizer:
+    """
+    Get the process-wide document summarizer built from the global configuration.
+
+    Returns:
+        MapReduceSummarizer: The shared summarizer instance
+    """
+    global _document_summarizer
+
+    if _document_summarizer is None:
+        from app.config import config
+
+        _document_summarizer = MapReduceSummarizer(
+            ChunkSummaryCache(
+                max_size=config.SUMMARY_CACHE_SIZE,
+                ttl_seconds=config.SUMMARY_CACHE_TTL,
+                redis_url=config.SUMMARY_CACHE_REDIS_URL,
+            ),
+            max_concurrency=config.SUMMARY_MAX_CONCURRENCY,
+            concurrency_overrides=_parse_concurrency_overrides(
+                config.SUMMARY_MAX_CONCURRENCY_OVERRIDES
+            ),
+        )
+    return _document_summarizer
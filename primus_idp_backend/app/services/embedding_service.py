@@ -0,0 +1,144 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingService:
+    """
+    Service for computing embeddings in batches off the event loop.
+
+    Texts are grouped into batches bounded by both a maximum number of texts and
+    a token budget, and each batch is embedded with a single ``embed_batch`` call
+    on a dedicated thread pool so ingestion never blocks the event loop.
+    """
+
+    def __init__(
+        self,
+        embedding_model_instance,
+        batch_size: int = 64,
+        token_budget: int = 16384,
+        max_workers: int = 1,
+    ):
+        """
+        Initialize the embedding service
+
+        Args:
+            embedding_model_instance: The chonkie embeddings instance to use
+            batch_size: Maximum number of texts embedded in a single forward pass
+            token_budget: Maximum number of tokens embedded in a single forward pass
+            max_workers: Number of threads running embedding batches
+        """
+        self.embedding_model_instance = embedding_model_instance
+        self.batch_size = max(1, batch_size)
+        self.token_budget = max(1, token_budget)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="embedding"
+        )
+
+    def _count_tokens(self, texts: list[str]) -> list[int]:
+        """Count tokens per text, falling back to a character estimate."""
+        try:
+            if hasattr(self.embedding_model_instance, "count_tokens_batch"):
+                return list(self.embedding_model_instance.count_tokens_batch(texts))
+        except Exception as e:
+            logger.debug(f"Token counting failed, using estimate: {e!s}")
+        return [max(1, len(text) // 4) for text in texts]
+
+    def _build_batches(self, texts: list[str]) -> list[list[int]]:
+        """
+        Group text indices into batches bounded by batch size and token budget.
+
+        A single text larger than the token budget gets a batch of its own.
+        """
+        batches: list[list[int]] = []
+        current: list[int] = []
+        current_tokens = 0
+
+        for index, token_count in enumerate(self._count_tokens(texts)):
+            if current and (
+                len(current) >= self.batch_size
+                or current_tokens + token_count > self.token_budget
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(index)
+            current_tokens += token_count
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _embed_batch_sync(self, texts: list[str]) -> list[Any]:
+        """Embed a list of texts synchronously using batched forward passes."""
+        model = self.embedding_model_instance
+        embeddings: list[Any] = [None] * len(texts)
+
+        for batch in self._build_batches(texts):
+            batch_texts = [texts[i] for i in batch]
+            if hasattr(model, "embed_batch"):
+                batch_embeddings = model.embed_batch(batch_texts)
+            else:
+                batch_embeddings = [model.embed(text) for text in batch_texts]
+            for index, embedding in zip(batch, batch_embeddings, strict=True):
+                embeddings[index] = embedding
+
+        return embeddings
+
+    async def embed_batch(self, texts: list[str]) -> list[Any]:
+        """
+        Embed a list of texts in batches on the embedding thread pool.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embeddings in the same order as the input texts
+        """
+        if not texts:
+            return []
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._embed_batch_sync, list(texts)
+        )
+
+    async def embed(self, text: str) -> Any:
+        """
+        Embed a single text on the embedding thread pool.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            The embedding for the text
+        """
+        embeddings = await self.embed_batch([text])
+        return embeddings[0]
+
+
+_embedding_service: EmbeddingService | None = None
+
+
+def get_embedding_service() -> EmbeddingService:
+    """
+    Get the process-wide embedding service built from the global configuration.
+
+    Returns:
+        EmbeddingService: The shared embedding service instance
+    """
+    global _embedding_service
+
+    if _embedding_service is None:
+        from app.config import config
+
+        _embedding_service = EmbeddingService(
+            config.embedding_model_instance,
+            batch_size=config.EMBEDDING_BATCH_SIZE,
+            token_budget=config.EMBEDDING_BATCH_TOKEN_BUDGET,
+            max_workers=config.EMBEDDING_MAX_WORKERS,
+        )
+    return _embedding_service
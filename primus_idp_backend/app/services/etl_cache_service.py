@@ -0,0 +1,227 @@
+"""
+Content-addressed cache of ETL results.
+
+Parsing a file with Unstructured, LlamaCloud, Docling or Chandra is the most
+expensive step of file processing, and the same file is often uploaded more than
+once. Results are stored gzip-compressed on local disk, keyed on the SHA-256 of
+the file's raw bytes, the ETL service and its parser options, and the least
+recently used entries are evicted once the cache grows over its size limit.
+
+The total size is tracked as entries are written, so the cache directory is
+only scanned when the limit is crossed, or periodically to count the entries
+written by other processes sharing it.
+"""
+
+import asyncio
+import contextlib
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Time after which the cache directory is scanned again to count the entries
+# written by other processes
+SIZE_RESCAN_SECONDS = 600
+
+# Share of the size limit eviction goes down to, so the next scans are only
+# needed once that much has been written again
+EVICTION_TARGET_RATIO = 0.9
+
+
+class EtlResultCache:
+    """
+    Disk cache of ETL results keyed by file content and parser configuration.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, parser_version: str = "1"):
+        """
+        Initialize the ETL result cache
+
+        Args:
+            cache_dir: Directory storing the cached results
+            max_bytes: Total size of cached results above which entries are evicted
+            parser_version: Version mixed into every key; change it to invalidate
+                results after a parser upgrade
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max(1, max_bytes)
+        self.parser_version = parser_version
+        self._evict_lock = threading.Lock()
+        # Size of the cached entries as of the last scan plus this process's writes
+        self._total_bytes: int | None = None
+        self._scanned_at = 0.0
+
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def make_key(
+        self, file_hash: str, etl_service: str, options: dict[str, Any] | None = None
+    ) -> str:
+        """
+        Build the cache key of a file parsed by an ETL service.
+
+        Args:
+            file_hash: SHA-256 hex digest of the file's raw bytes
+            etl_service: Name of the ETL service (e.g. "DOCLING")
+            options: Parser options affecting the result
+
+        Returns:
+            str: The cache key
+        """
+        options_json = json.dumps(options or {}, sort_keys=True)
+        return hashlib.sha256(
+            f"{file_hash}:{etl_service}:{options_json}:{self.parser_version}".encode()
+        ).hexdigest()
+
+    def _path(self, key: str) -> str:
+        """Get the file path of a cache entry, sharded by key prefix."""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json.gz")
+
+    def _read(self, key: str) -> Any | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                payload = f.read()
+            # Reads refresh the modification time used for LRU eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return json.loads(gzip.decompress(payload))
+
+    def _write(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = gzip.compress(json.dumps(value).encode())
+        try:
+            replaced_bytes = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced_bytes = 0
+
+        # Write to a temporary file first so readers never see partial entries
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        with self._evict_lock:
+            if (
+                self._total_bytes is None
+                or time.monotonic() - self._scanned_at >= SIZE_RESCAN_SECONDS
+            ):
+                self._evict()
+                return
+
+            self._total_bytes += len(payload) - replaced_bytes
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """
+        Delete the least recently used entries until the cache fits its limit.
+
+        Scans the whole cache directory; the caller holds the eviction lock.
+        """
+        entries = []
+        total_bytes = 0
+        for root, _, file_names in os.walk(self.cache_dir):
+            for file_name in file_names:
+                if not file_name.endswith(".json.gz"):
+                    continue
+                path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_bytes += stat.st_size
+
+        if total_bytes > self.max_bytes:
+            target_bytes = self.max_bytes * EVICTION_TARGET_RATIO
+            for _, size, path in sorted(entries):
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(path)
+                total_bytes -= size
+                if total_bytes <= target_bytes:
+                    break
+
+        self._total_bytes = total_bytes
+        self._scanned_at = time.monotonic()
+
+    async def get(self, key: str) -> Any | None:
+        """
+        Get a cached ETL result.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            The cached result, or None on a miss
+        """
+        try:
+            value = await asyncio.to_thread(self._read, key)
+        except Exception as e:
+            logger.warning(f"Failed to read ETL cache entry {key}: {e!s}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Store an ETL result.
+
+        Args:
+            key: Cache key from make_key
+            value: JSON-serializable ETL result
+        """
+        try:
+            await asyncio.to_thread(self._write, key, value)
+        except Exception as e:
+            logger.warning(f"Failed to write ETL cache entry {key}: {e!s}")
+
+
+_etl_cache: EtlResultCache | None = None
+_etl_cache_disabled = False
+
+
+def get_etl_cache() -> EtlResultCache | None:
+    """
+    Get the process-wide ETL result cache built from the global configuration.
+
+    Returns:
+        EtlResultCache: The shared cache, or None if the cache is disabled
+    """
+    global _etl_cache, _etl_cache_disabled
+
+    if _etl_cache is None and not _etl_cache_disabled:
+        from app.config import config
+
+        if not config.ETL_CACHE_DIR or config.ETL_CACHE_MAX_BYTES <= 0:
+            _etl_cache_disabled = True
+            return None
+        try:
+            _etl_cache = EtlResultCache(
+                cache_dir=config.ETL_CACHE_DIR,
+                max_bytes=config.ETL_CACHE_MAX_BYTES,
+                parser_version=config.ETL_CACHE_PARSER_VERSION,
+            )
+        except Exception as e:
+            logger.warning(f"ETL result cache disabled: {e!s}")
+            _etl_cache_disabled = True
+    return _etl_cache
@@ -1,4 +1,10 @@
+import hashlib
+import json
 import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
 
 import litellm
 from langchain_litellm import ChatLiteLLM
@@ -19,6 +25,168 @@ class LLMRole:
     STRATEGIC = "strategic"
 
 
+class LLMClientRegistry:
+    """
+    Registry of the LLM clients resolved per user, search space and role.
+
+    Resolving a client takes two queries and building a new ChatLiteLLM, which
+    adds up when indexers resolve the same model for every item, so resolved
+    clients are kept for a while. Entries record the LLM config they came from and expire after a TTL;
+    the LLM config routes invalidate them as soon as a config or preference
+    changes in this process, and the TTL bounds how long other processes (e.g.
+    Celery workers) keep using the previous config.
+
+    Clients are shared by every entry whose LLM config has the same settings,
+    so their connection pools are reused across users and roles.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 1024):
+        """
+        Initialize the LLM client registry
+
+        Args:
+            ttl_seconds: Time after which a resolved client is looked up again
+                (0 disables the registry)
+            max_entries: Maximum number of (user, search space, role) entries
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        # (user, search space, role) -> (expiry, LLM config ID, config fingerprint)
+        self._entries: OrderedDict[tuple[str, int, str], tuple[float, int, str]] = (
+            OrderedDict()
+        )
+        # Config fingerprint -> client
+        self._clients: dict[str, ChatLiteLLM] = {}
+
+    @staticmethod
+    def _fingerprint(litellm_kwargs: dict[str, Any]) -> str:
+        """Identify a version of an LLM config by the settings of its client."""
+        settings = json.dumps(litellm_kwargs, sort_keys=True, default=str)
+        return hashlib.sha256(settings.encode()).hexdigest()
+
+    def get(self, user_id: str, search_space_id: int, role: str) -> ChatLiteLLM | None:
+        """
+        Get the client resolved for a user, search space and role.
+
+        Returns:
+            The client, or None if it wasn't resolved or its entry expired
+        """
+        key = (str(user_id), search_space_id, role)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, fingerprint = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._drop_unused_clients()
+                return None
+            self._entries.move_to_end(key)
+            return self._clients.get(fingerprint)
+
+    def put(
+        self,
+        user_id: str,
+        search_space_id: int,
+        role: str,
+        llm_config_id: int,
+        litellm_kwargs: dict[str, Any],
+    ) -> ChatLiteLLM:
+        """
+        Store the client resolved for a user, search space and role.
+
+        Args:
+            user_id: User ID
+            search_space_id: Search Space ID
+            role: LLM role
+            llm_config_id: ID of the LLM config the client was built from
+            litellm_kwargs: Arguments of the ChatLiteLLM client
+
+        Returns:
+            The client for these settings, shared with other entries using them
+        """
+        fingerprint = self._fingerprint(litellm_kwargs)
+        with self._lock:
+            client = self._clients.get(fingerprint)
+            if client is None:
+                client = ChatLiteLLM(**litellm_kwargs)
+
+            if self.ttl_seconds <= 0:
+                return client
+
+            self._clients[fingerprint] = client
+            key = (str(user_id), search_space_id, role)
+            self._entries[key] = (
+                time.monotonic() + self.ttl_seconds,
+                llm_config_id,
+                fingerprint,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._drop_unused_clients()
+            return client
+
+    def invalidate(
+        self,
+        user_id: str | None = None,
+        search_space_id: int | None = None,
+        llm_config_id: int | None = None,
+    ) -> None:
+        """
+        Drop the entries matching every given filter.
+
+        Args:
+            user_id: Only drop the entries of this user
+            search_space_id: Only drop the entries of this search space
+            llm_config_id: Only drop the entries built from this LLM config
+        """
+        with self._lock:
+            for key, (_, entry_llm_config_id, _) in list(self._entries.items()):
+                entry_user_id, entry_search_space_id, _ = key
+                if user_id is not None and entry_user_id != str(user_id):
+                    continue
+                if (
+                    search_space_id is not None
+                    and entry_search_space_id != search_space_id
+                ):
+                    continue
+                if llm_config_id is not None and entry_llm_config_id != llm_config_id:
+                    continue
+                del self._entries[key]
+            self._drop_unused_clients()
+
+    def _drop_unused_clients(self) -> None:
+        """Forget clients no entry uses anymore, e.g. those of outdated configs."""
+        used = {fingerprint for _, _, fingerprint in self._entries.values()}
+        for fingerprint in list(self._clients):
+            if fingerprint not in used:
+                del self._clients[fingerprint]
+
+
+_llm_client_registry: LLMClientRegistry | None = None
+
+
+def get_llm_client_registry() -> LLMClientRegistry:
+    """
+    Get the process-wide LLM client registry built from the global configuration.
+
+    Returns:
+        LLMClientRegistry: The shared registry
+    """
+    global _llm_client_registry
+
+    if _llm_client_registry is None:
+        from app.config import config
+
+        _llm_client_registry = LLMClientRegistry(
+            ttl_seconds=config.LLM_CLIENT_CACHE_TTL,
+            max_entries=config.LLM_CLIENT_CACHE_SIZE,
+        )
+    return _llm_client_registry
+
+
 async def get_user_llm_instance(
     session: AsyncSession, user_id: str, search_space_id: int, role: str
 ) -> ChatLiteLLM | None:
@@ -34,6 +202,11 @@ async def get_user_llm_instance(
     Returns:
         ChatLiteLLM instance or None if not found
     """
+    registry = get_llm_client_registry()
+    llm = registry.get(user_id, search_space_id, role)
+    if llm is not None:
+        return llm
+
     try:
         # Get user's LLM preferences for this search space
         result = await session.execute(
@@ -125,7 +298,9 @@ async def get_user_llm_instance(
         if llm_config.litellm_params:
             litellm_kwargs.update(llm_config.litellm_params)
 
-        return ChatLiteLLM(**litellm_kwargs)
+        return registry.put(
+            user_id, search_space_id, role, llm_config_id, litellm_kwargs
+        )
 
     except Exception as e:
         logger.error(
@@ -0,0 +1,244 @@
+"""
+Semantic cache of Q&A answers.
+
+Answers are stored with the embedding of the question they answered, the
+connectors, search mode and language they were made with, and the version of
+the search space's documents they were made from. A later question whose
+embedding is close enough, asked with the same settings against unchanged
+documents, replays the stored answer instead of searching, reranking and
+calling the LLM again.
+
+The corpus version combines the number of documents of the search space with
+their highest revision, which every insert and update raises, so adding,
+changing or deleting a document retires every answer of the space.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, func, or_, select
+
+from app.db import Document, QnaAnswerCacheEntry, async_session_maker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QnaAnswerCacheKey:
+    """What a question was asked against, used to look up and store its answer."""
+
+    search_space_id: int
+    scope_hash: str
+    corpus_version: str
+    query_text: str
+    query_embedding: list[float]
+
+
+@dataclass
+class CachedQnaAnswer:
+    """A stored answer replayed for a similar question."""
+
+    answer: str
+    document_ids: list[Any] = field(default_factory=list)
+    sources: list[dict[str, Any]] = field(default_factory=list)
+    further_questions: list[dict[str, Any]] = field(default_factory=list)
+    similarity: float = 1.0
+
+
+class QnaAnswerCache:
+    """
+    Semantic Q&A answer cache stored in a pgvector table.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.95, ttl_seconds: int = 86400):
+        """
+        Initialize the Q&A answer cache
+
+        Args:
+            similarity_threshold: Minimum cosine similarity between two questions
+                for one's answer to be reused for the other
+            ttl_seconds: Time after which a stored answer is no longer reused
+        """
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _scope_hash(
+        connectors: list[str], search_mode: str, language: str | None
+    ) -> str:
+        """Hash the settings an answer depends on besides the question."""
+        scope = json.dumps(
+            {
+                "connectors": sorted(connectors or []),
+                "search_mode": search_mode,
+                "language": language,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(scope.encode()).hexdigest()
+
+    @staticmethod
+    async def get_corpus_version(session, search_space_id: int) -> str:
+        """
+        Get the version of the documents of a search space.
+
+        Args:
+            session: Database session
+            search_space_id: ID of the search space
+
+        Returns:
+            str: Version that changes whenever a document is added, updated or deleted
+        """
+        result = await session.execute(
+            select(func.count(Document.id), func.max(Document.revision)).where(
+                Document.search_space_id == search_space_id
+            )
+        )
+        document_count, max_revision = result.one()
+        return f"{document_count}:{max_revision or 0}"
+
+    async def lookup(
+        self,
+        search_space_id: int,
+        query_text: str,
+        connectors: list[str],
+        search_mode: str,
+        language: str | None = None,
+    ) -> tuple[CachedQnaAnswer | None, QnaAnswerCacheKey]:
+        """
+        Find a stored answer to a similar question.
+
+        Args:
+            search_space_id: ID of the search space
+            query_text: The (reformulated) question
+            connectors: Connectors searched for the answer
+            search_mode: Search mode used for the answer
+            language: Language of the answer
+
+        Returns:
+            Tuple of (the stored answer or None, key to store a new answer under)
+        """
+        from app.services.query_embedding_cache import get_query_embedding_cache
+
+        # The embedding is shared with the connector searches of the same query
+        query_embedding = await get_query_embedding_cache().get_embedding(query_text)
+        query_embedding = [float(value) for value in query_embedding]
+
+        async with async_session_maker() as session:
+            key = QnaAnswerCacheKey(
+                search_space_id=search_space_id,
+                scope_hash=self._scope_hash(connectors, search_mode, language),
+                corpus_version=await self.get_corpus_version(session, search_space_id),
+                query_text=query_text,
+                query_embedding=query_embedding,
+            )
+
+            distance = QnaAnswerCacheEntry.query_embedding.cosine_distance(
+                query_embedding
+            )
+            result = await session.execute(
+                select(QnaAnswerCacheEntry, distance.label("distance"))
+                .where(
+                    QnaAnswerCacheEntry.search_space_id == search_space_id,
+                    QnaAnswerCacheEntry.scope_hash == key.scope_hash,
+                    QnaAnswerCacheEntry.corpus_version == key.corpus_version,
+                    QnaAnswerCacheEntry.created_at
+                    >= datetime.now(UTC) - timedelta(seconds=self.ttl_seconds),
+                )
+                .order_by(distance)
+                .limit(1)
+            )
+            row = result.first()
+
+        if row is None:
+            return None, key
+
+        entry, entry_distance = row
+        similarity = 1 - entry_distance
+        if similarity < self.similarity_threshold:
+            return None, key
+
+        return (
+            CachedQnaAnswer(
+                answer=entry.answer,
+                document_ids=entry.document_ids or [],
+                sources=entry.sources or [],
+                further_questions=entry.further_questions or [],
+                similarity=similarity,
+            ),
+            key,
+        )
+
+    async def store(
+        self,
+        key: QnaAnswerCacheKey,
+        answer: str,
+        document_ids: list[Any],
+        sources: list[dict[str, Any]],
+        further_questions: list[dict[str, Any]],
+    ) -> None:
+        """
+        Store an answer, dropping the search space's retired answers.
+
+        Args:
+            key: Key returned by lookup for the question
+            answer: The final answer
+            document_ids: Chunk IDs of the reranked documents behind the answer
+            sources: Sources streamed with the answer
+            further_questions: Follow-up questions suggested with the answer
+        """
+        async with async_session_maker() as session:
+            # Answers of older corpus versions can never match again
+            await session.execute(
+                delete(QnaAnswerCacheEntry).where(
+                    QnaAnswerCacheEntry.search_space_id == key.search_space_id,
+                    or_(
+                        QnaAnswerCacheEntry.corpus_version != key.corpus_version,
+                        QnaAnswerCacheEntry.created_at
+                        < datetime.now(UTC) - timedelta(seconds=self.ttl_seconds),
+                    ),
+                )
+            )
+            session.add(
+                QnaAnswerCacheEntry(
+                    search_space_id=key.search_space_id,
+                    scope_hash=key.scope_hash,
+                    corpus_version=key.corpus_version,
+                    query_text=key.query_text,
+                    query_embedding=key.query_embedding,
+                    answer=answer,
+                    document_ids=document_ids,
+                    sources=sources,
+                    further_questions=further_questions,
+                )
+            )
+            await session.commit()
+
+
+_qna_answer_cache: QnaAnswerCache | None = None
+
+
+def get_qna_answer_cache() -> QnaAnswerCache | None:
+    """
+    Get the process-wide Q&A answer cache built from the global configuration.
+
+    Returns:
+        QnaAnswerCache: The shared cache, or None if the cache is disabled
+    """
+    global _qna_answer_cache
+
+    from app.config import config
+
+    if not config.QNA_ANSWER_CACHE_ENABLED:
+        return None
+
+    if _qna_answer_cache is None:
+        _qna_answer_cache = QnaAnswerCache(
+            similarity_threshold=config.QNA_ANSWER_CACHE_SIMILARITY,
+            ttl_seconds=config.QNA_ANSWER_CACHE_TTL,
+        )
+    return _qna_answer_cache
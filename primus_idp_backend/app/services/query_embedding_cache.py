@@ -0,0 +1,218 @@
+import asyncio
+import hashlib
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEmbeddingCache:
+    """
+    Two-tier cache for query embeddings.
+
+    The first tier is an in-process LRU with TTL so identical queries are embedded
+    once per process. The optional second tier is Redis, shared by every API and
+    worker process, so repeated queries are embedded once per cluster. Concurrent
+    misses for the same query share a single embedding computation.
+    """
+
+    def __init__(
+        self,
+        embedding_service,
+        model_name: str,
+        max_size: int = 1024,
+        ttl_seconds: int = 3600,
+        redis_url: str | None = None,
+    ):
+        """
+        Initialize the query embedding cache
+
+        Args:
+            embedding_service: EmbeddingService used to compute missing embeddings
+            model_name: Name of the embedding model, part of every cache key
+            max_size: Maximum number of embeddings kept in the in-process tier
+            ttl_seconds: Time-to-live of cached embeddings in both tiers
+            redis_url: Optional Redis URL enabling the shared tier
+        """
+        self.embedding_service = embedding_service
+        self.model_name = model_name or "default"
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = max(1, ttl_seconds)
+
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+        # Redis clients and in-flight computations are bound to an event loop
+        self._in_flight: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._redis_url = redis_url
+        self._redis_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize_query(query_text: str) -> str:
+        """Normalize query text so trivially different queries share a key."""
+        return " ".join(query_text.lower().split())
+
+    def _make_key(self, query_text: str) -> str:
+        """Build the cache key from the model name and normalized query text."""
+        digest = hashlib.sha256(
+            f"{self.model_name}:{self.normalize_query(query_text)}".encode()
+        ).hexdigest()
+        return f"query_embedding:{digest}"
+
+    def _get_local(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, embedding = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return embedding
+
+    def _set_local(self, key: str, embedding: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _get_redis_client(self):
+        """Get a Redis client bound to the running event loop, if configured."""
+        if not self._redis_url:
+            return None
+
+        loop = asyncio.get_running_loop()
+        client = self._redis_clients.get(loop)
+        if client is None:
+            try:
+                import redis.asyncio as aioredis
+
+                client = aioredis.from_url(self._redis_url)
+            except Exception as e:
+                logger.warning(f"Query embedding Redis tier disabled: {e!s}")
+                self._redis_url = None
+                return None
+            self._redis_clients[loop] = client
+        return client
+
+    async def _get_redis(self, key: str) -> Any | None:
+        client = self._get_redis_client()
+        if client is None:
+            return None
+        try:
+            payload = await client.get(key)
+        except Exception as e:
+            logger.warning(f"Query embedding Redis lookup failed: {e!s}")
+            return None
+        if payload is None:
+            return None
+        return np.frombuffer(payload, dtype=np.float32)
+
+    async def _set_redis(self, key: str, embedding: Any) -> None:
+        client = self._get_redis_client()
+        if client is None:
+            return
+        try:
+            payload = np.asarray(embedding, dtype=np.float32).tobytes()
+            await client.set(key, payload, ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Query embedding Redis store failed: {e!s}")
+
+    async def _compute(self, key: str, query_text: str) -> Any:
+        embedding = await self._get_redis(key)
+        if embedding is not None:
+            self.redis_hits += 1
+        else:
+            self.misses += 1
+            embedding = await self.embedding_service.embed(query_text)
+            await self._set_redis(key, embedding)
+
+        self._set_local(key, embedding)
+        return embedding
+
+    async def get_embedding(self, query_text: str) -> Any:
+        """
+        Get the embedding for a query, computing it only on a cache miss.
+
+        Args:
+            query_text: The search query text
+
+        Returns:
+            The query embedding
+        """
+        key = self._make_key(query_text)
+
+        embedding = self._get_local(key)
+        if embedding is not None:
+            self.local_hits += 1
+            return embedding
+
+        loop_in_flight = self._in_flight.setdefault(asyncio.get_running_loop(), {})
+        in_flight = loop_in_flight.get(key)
+        if in_flight is not None:
+            self.local_hits += 1
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.ensure_future(self._compute(key, query_text))
+        loop_in_flight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                loop_in_flight.pop(key, None)
+            else:
+                future.add_done_callback(lambda _: loop_in_flight.pop(key, None))
+
+    def clear(self) -> None:
+        """Drop every embedding from the in-process tier."""
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Get hit and miss counters for the cache.
+
+        Returns:
+            Dict with local hits, Redis hits, misses and current local size
+        """
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+        }
+
+
+_query_embedding_cache: QueryEmbeddingCache | None = None
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """
+    Get the process-wide query embedding cache built from the global configuration.
+
+    Returns:
+        QueryEmbeddingCache: The shared query embedding cache instance
+    """
+    global _query_embedding_cache
+
+    if _query_embedding_cache is None:
+        from app.config import config
+        from app.services.embedding_service import get_embedding_service
+
+        _query_embedding_cache = QueryEmbeddingCache(
+            get_embedding_service(),
+            model_name=config.EMBEDDING_MODEL,
+            max_size=config.QUERY_EMBEDDING_CACHE_SIZE,
+            ttl_seconds=config.QUERY_EMBEDDING_CACHE_TTL,
+            redis_url=config.QUERY_EMBEDDING_CACHE_REDIS_URL,
+        )
+    return _query_embedding_cache
@@ -1,32 +1,369 @@
+import asyncio
+import hashlib
+import heapq
 import logging
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
 from rerankers import Document as RerankerDocument
 
+logger = logging.getLogger(__name__)
+
 
 class RerankerService:
     """
     Service for reranking documents using a configured reranker
+
+    Reranking runs on a dedicated thread so the event loop stays free. Requests
+    made at the same time (e.g. by the sections of a report) are coalesced into
+    one batch, and the scores of (model, query, chunk) pairs are cached so
+    candidates shared between requests are only scored once.
     """
 
-    def __init__(self, reranker_instance=None):
+    def __init__(
+        self,
+        reranker_instance=None,
+        model_name: str | None = None,
+        cache_size: int = 10000,
+        batch_window_ms: int = 5,
+        prefilter_top_k: int = 0,
+    ):
         """
         Initialize the reranker service
 
         Args:
             reranker_instance: The reranker instance to use for reranking
+            model_name: Name of the reranker model, part of the score cache keys
+            cache_size: Maximum number of cached (model, query, chunk) scores
+            batch_window_ms: Time requests wait to be batched with concurrent ones
+            prefilter_top_k: Default number of candidates kept by retrieval score
+                before reranking (0 = rerank every candidate)
         """
         self.reranker_instance = reranker_instance
+        self.model_name = model_name or type(reranker_instance).__name__
+        self.cache_size = max(0, cache_size)
+        self.batch_window = max(0, batch_window_ms) / 1000
+        self.prefilter_top_k = max(0, prefilter_top_k)
+
+        # One thread: the model is never run concurrently and batches run in order
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="reranker"
+        )
+        self._score_cache: OrderedDict[tuple[str, str, str], float] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Requests waiting to be batched, per event loop
+        self._pending: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _candidate_key(doc: dict[str, Any]) -> str:
+        """
+        Identify a candidate by its chunk ID and a digest of its content.
+
+        The digest keeps placeholder IDs and re-indexed chunks from reusing the
+        score of different content.
+        """
+        content_digest = hashlib.blake2b(
+            doc.get("content", "").encode(), digest_size=16
+        ).hexdigest()
+        return f"{doc.get('chunk_id')}:{content_digest}"
+
+    def _get_cached_score(self, query_text: str, candidate_key: str) -> float | None:
+        with self._cache_lock:
+            cache_key = (self.model_name, query_text, candidate_key)
+            score = self._score_cache.get(cache_key)
+            if score is not None:
+                self._score_cache.move_to_end(cache_key)
+            return score
+
+    def _cache_scores(self, query_text: str, scores: dict[str, float]) -> None:
+        if not self.cache_size:
+            return
+        with self._cache_lock:
+            for candidate_key, score in scores.items():
+                self._score_cache[(self.model_name, query_text, candidate_key)] = score
+            while len(self._score_cache) > self.cache_size:
+                self._score_cache.popitem(last=False)
+
+    def _score_query(self, query_text: str, texts: list[str]) -> list[float]:
+        """
+        Score texts against a query in one reranker call.
+
+        Args:
+            query_text: The query text to use for reranking
+            texts: Candidate texts
+
+        Returns:
+            Score of each text, in input order
+        """
+        reranker_docs = [
+            RerankerDocument(text=text, doc_id=position)
+            for position, text in enumerate(texts)
+        ]
+        ranked = self.reranker_instance.rank(query=query_text, docs=reranker_docs)
+
+        scores = [0.0] * len(texts)
+        for result in ranked.results:
+            scores[result.document.doc_id] = float(result.score)
+        return scores
+
+    def _score_batch(
+        self, candidates_by_query: dict[str, dict[str, str]]
+    ) -> dict[str, dict[str, float]]:
+        """
+        Score the uncached candidates of every query of a batch.
+
+        The reranker ranks one query at a time, so the batch makes one call per
+        distinct query, each over every candidate requested for that query.
+
+        Args:
+            candidates_by_query: Candidate texts by candidate key, per query
+
+        Returns:
+            Scores by candidate key, per query
+        """
+        scores_by_query = {}
+        for query_text, candidates in candidates_by_query.items():
+            candidate_keys = list(candidates)
+            scores = self._score_query(
+                query_text, [candidates[key] for key in candidate_keys]
+            )
+            scores_by_query[query_text] = dict(zip(candidate_keys, scores, strict=True))
+        return scores_by_query
+
+    @staticmethod
+    def _rank_documents(
+        documents: list[dict[str, Any]], scores: list[float], top_n: int | None
+    ) -> list[dict[str, Any]]:
+        """
+        Order documents by their reranker scores, keeping the best top_n.
+
+        Args:
+            documents: Documents that were scored
+            scores: Score of each document, in document order
+            top_n: Number of documents to keep, or None to keep all
+
+        Returns:
+            Copies of the kept documents with their score and rank, best first
+        """
+        positions = range(len(documents))
+        if top_n is not None and top_n < len(documents):
+            # Partial sort: O(n log top_n) instead of sorting every candidate
+            best = heapq.nlargest(top_n, positions, key=scores.__getitem__)
+        else:
+            best = sorted(positions, key=scores.__getitem__, reverse=True)
+
+        return [
+            {**documents[position], "score": scores[position], "rank": rank}
+            for rank, position in enumerate(best, start=1)
+        ]
+
+    @staticmethod
+    def _fallback_documents(
+        documents: list[dict[str, Any]], top_n: int | None
+    ) -> list[dict[str, Any]]:
+        """
+        Keep the best top_n documents by retrieval score when reranking fails.
+
+        Args:
+            documents: Candidate documents
+            top_n: Number of documents to keep, or None to keep all
+
+        Returns:
+            The kept documents, best retrieval score first
+        """
+        if top_n is None or top_n >= len(documents):
+            return documents
+        return heapq.nlargest(top_n, documents, key=lambda doc: doc.get("score") or 0.0)
+
+    def _prefilter(
+        self, documents: list[dict[str, Any]], prefilter_top_k: int | None
+    ) -> list[dict[str, Any]]:
+        """
+        Keep the candidates with the best retrieval scores before reranking.
+
+        The retrieval score is the RRF or vector score the documents come with,
+        which is cheap to compare, so the reranker only scores the most promising
+        candidates.
+
+        Args:
+            documents: Candidate documents
+            prefilter_top_k: Maximum candidates passed to the reranker, None to
+                use the configured cap (0 = no cap)
+
+        Returns:
+            The candidates to rerank, in their original order
+        """
+        if prefilter_top_k is None:
+            prefilter_top_k = self.prefilter_top_k
+        if not prefilter_top_k or len(documents) <= prefilter_top_k:
+            return documents
+
+        kept = heapq.nlargest(
+            prefilter_top_k,
+            range(len(documents)),
+            key=lambda position: documents[position].get("score") or 0.0,
+        )
+        return [documents[position] for position in sorted(kept)]
+
+    async def _rerank_batch(
+        self, requests: list[tuple[str, list[dict[str, Any]], int | None]]
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Score the candidates of several requests in one executor job.
+
+        Args:
+            requests: Tuples of (query text, documents, top_n)
+
+        Returns:
+            Reranked documents of each request, best first
+        """
+        # Collect the candidates whose scores aren't cached yet
+        candidate_keys = []
+        candidates_by_query: dict[str, dict[str, str]] = {}
+        for query_text, documents, _ in requests:
+            keys = [self._candidate_key(doc) for doc in documents]
+            candidate_keys.append(keys)
+            for doc, candidate_key in zip(documents, keys, strict=True):
+                if self._get_cached_score(query_text, candidate_key) is None:
+                    candidates_by_query.setdefault(query_text, {})[candidate_key] = (
+                        doc.get("content", "")
+                    )
+
+        scores_by_query: dict[str, dict[str, float]] = {}
+        if candidates_by_query:
+            try:
+                scores_by_query = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._score_batch, candidates_by_query
+                )
+            except Exception as e:
+                logger.error(f"Error during reranking: {e!s}")
+                # Fall back to the retrieval order without reranking
+                return [
+                    self._fallback_documents(documents, top_n)
+                    for _, documents, top_n in requests
+                ]
+
+            for query_text, scores in scores_by_query.items():
+                self._cache_scores(query_text, scores)
+
+        results = []
+        for (query_text, documents, top_n), keys in zip(
+            requests, candidate_keys, strict=True
+        ):
+            batch_scores = scores_by_query.get(query_text, {})
+            scores = []
+            for candidate_key in keys:
+                score = batch_scores.get(candidate_key)
+                if score is None:
+                    score = self._get_cached_score(query_text, candidate_key)
+                scores.append(score or 0.0)
+            results.append(self._rank_documents(documents, scores, top_n))
+        return results
+
+    async def rerank_many(
+        self,
+        requests: list[tuple[str, list[dict[str, Any]]]],
+        top_n: int | None = None,
+        prefilter_top_k: int | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Rerank several candidate sets, each against its own query, in one batch
+
+        Args:
+            requests: Pairs of (query text, documents to rerank)
+            top_n: Number of documents returned per request, None for all
+            prefilter_top_k: Candidates per request kept by retrieval score before
+                reranking, None for the configured cap (0 = no cap)
+
+        Returns:
+            Reranked documents of each request, best first
+        """
+        if not self.reranker_instance:
+            return [documents for _, documents in requests]
+
+        return await self._rerank_batch(
+            [
+                (query_text, self._prefilter(documents, prefilter_top_k), top_n)
+                for query_text, documents in requests
+            ]
+        )
+
+    async def _flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Rerank every request waiting on the loop as one batch."""
+        await asyncio.sleep(self.batch_window)
+        pending = self._pending.pop(loop, [])
+
+        try:
+            results = await self._rerank_batch([request for request, _ in pending])
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), reranked_docs in zip(pending, results, strict=True):
+            if not future.done():
+                future.set_result(reranked_docs)
+
+    async def rerank(
+        self,
+        query_text: str,
+        documents: list[dict[str, Any]],
+        top_n: int | None = None,
+        prefilter_top_k: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Rerank documents, batched with the requests made at the same time
+
+        Args:
+            query_text: The query text to use for reranking
+            documents: List of document dictionaries to rerank
+            top_n: Number of documents to return, None for all
+            prefilter_top_k: Candidates kept by retrieval score before reranking,
+                None for the configured cap (0 = no cap)
+
+        Returns:
+            List[Dict[str, Any]]: Reranked documents, best first
+        """
+        if not self.reranker_instance or not documents:
+            return documents
+
+        request = (query_text, self._prefilter(documents, prefilter_top_k), top_n)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(loop, [])
+        if not pending:
+            flush_task = loop.create_task(self._flush(loop))
+            self._flush_tasks.add(flush_task)
+            flush_task.add_done_callback(self._flush_tasks.discard)
+        pending.append((request, future))
+        return await future
 
     def rerank_documents(
-        self, query_text: str, documents: list[dict[str, Any]]
+        self,
+        query_text: str,
+        documents: list[dict[str, Any]],
+        top_n: int | None = None,
+        prefilter_top_k: int | None = None,
     ) -> list[dict[str, Any]]:
         """
         Rerank documents using the configured reranker
 
+        Blocking variant of rerank for synchronous callers; it neither batches
+        nor caches.
+
         Args:
             query_text: The query text to use for reranking
             documents: List of document dictionaries to rerank
+            top_n: Number of documents to return, None for all
+            prefilter_top_k: Candidates kept by retrieval score before reranking,
+                None for the configured cap (0 = no cap)
 
         Returns:
             List[Dict[str, Any]]: Reranked documents
@@ -35,59 +372,16 @@ class RerankerService:
             return documents
 
         try:
-            # Create Document objects for the rerankers library
-            reranker_docs = []
-            for i, doc in enumerate(documents):
-                chunk_id = doc.get("chunk_id", f"chunk_{i}")
-                content = doc.get("content", "")
-                score = doc.get("score", 0.0)
-                document_info = doc.get("document", {})
-
-                reranker_docs.append(
-                    RerankerDocument(
-                        text=content,
-                        doc_id=chunk_id,
-                        metadata={
-                            "document_id": document_info.get("id", ""),
-                            "document_title": document_info.get("title", ""),
-                            "document_type": document_info.get("document_type", ""),
-                            "rrf_score": score,
-                        },
-                    )
-                )
-
-            # Rerank using the configured reranker
-            reranking_results = self.reranker_instance.rank(
-                query=query_text, docs=reranker_docs
+            documents = self._prefilter(documents, prefilter_top_k)
+            scores = self._score_query(
+                query_text, [doc.get("content", "") for doc in documents]
             )
-
-            # Process the results from the reranker
-            # Convert to serializable dictionaries
-            serialized_results = []
-            for result in reranking_results.results:
-                # Find the original document by id
-                original_doc = next(
-                    (
-                        doc
-                        for doc in documents
-                        if doc.get("chunk_id") == result.document.doc_id
-                    ),
-                    None,
-                )
-                if original_doc:
-                    # Create a new document with the reranked score
-                    reranked_doc = original_doc.copy()
-                    reranked_doc["score"] = float(result.score)
-                    reranked_doc["rank"] = result.rank
-                    serialized_results.append(reranked_doc)
-
-            return serialized_results
+            return self._rank_documents(documents, scores, top_n)
 
         except Exception as e:
-            # Log the error
-            logging.error(f"Error during reranking: {e!s}")
-            # Fall back to original documents without reranking
-            return documents
+            logger.error(f"Error during reranking: {e!s}")
+            # Fall back to the retrieval order without reranking
+            return self._fallback_documents(documents, top_n)
 
     @staticmethod
     def get_reranker_instance() -> Optional["RerankerService"]:
@@ -97,9 +391,31 @@ class RerankerService:
         Returns:
             Optional[RerankerService]: A reranker service instance if configured, None otherwise
         """
+        return get_reranker_service()
+
+
+_reranker_service: RerankerService | None = None
+
+
+def get_reranker_service() -> RerankerService | None:
+    """
+    Get the process-wide reranker service built from the global configuration.
+
+    Returns:
+        RerankerService: The shared reranker service, or None if no reranker is
+        configured
+    """
+    global _reranker_service
+
+    if _reranker_service is None:
         from app.config import config
 
         if hasattr(config, "reranker_instance") and config.reranker_instance:
-            return RerankerService(config.reranker_instance)
-        return None
-
+            _reranker_service = RerankerService(
+                config.reranker_instance,
+                model_name=config.RERANKERS_MODEL_NAME,
+                cache_size=config.RERANKER_SCORE_CACHE_SIZE,
+                batch_window_ms=config.RERANKER_BATCH_WINDOW_MS,
+                prefilter_top_k=config.RERANKER_PREFILTER_TOP_K,
+            )
+    return _reranker_service
@@ -0,0 +1,244 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Model whose tokenizer is used for token counts persisted at ingest time.
+# litellm counts tokens of most models with this same default tokenizer.
+REFERENCE_TOKENIZER_MODEL = "gpt-3.5-turbo"
+
+# Tokenizer type of models counted through litellm.token_counter
+LITELLM_COUNTER = "litellm_token_counter"
+
+# Tokens litellm counts for an OpenAI chat message besides its content: message
+# framing (3), the role (1) and the priming of the reply (3)
+DEFAULT_MESSAGE_OVERHEAD = 7
+
+
+class TokenCountingService:
+    """
+    Service counting tokens with the tokenizer litellm selects for a model.
+
+    Texts are encoded in a single batch call per request, and token counts are
+    cached by tokenizer and text hash so repeated texts are never re-tokenized.
+    """
+
+    def __init__(self, cache_size: int = 8192):
+        """
+        Initialize the token counting service
+
+        Args:
+            cache_size: Maximum number of cached token counts
+        """
+        self.cache_size = max(1, cache_size)
+        self._counts: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self._tokenizers: dict[str, tuple[str, str, Any]] = {}
+        self._message_overheads: dict[str, int] = {}
+
+    def _get_tokenizer(self, model: str | None) -> tuple[str, str, Any]:
+        """
+        Get the tokenizer litellm uses for a model.
+
+        Returns:
+            Tuple of (tokenizer key, tokenizer type, tokenizer), falling back to
+            litellm.token_counter when the tokenizer can't be selected
+        """
+        model = model or REFERENCE_TOKENIZER_MODEL
+        if model not in self._tokenizers:
+            try:
+                # Private litellm helper, exposing the tokenizer for batch encoding
+                from litellm.utils import _select_tokenizer
+
+                selected = _select_tokenizer(model)
+                tokenizer_type = selected["type"]
+                tokenizer = selected["tokenizer"]
+                name = getattr(tokenizer, "name", None) or model
+                self._tokenizers[model] = (
+                    f"{tokenizer_type}:{name}",
+                    tokenizer_type,
+                    tokenizer,
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Tokenizer of {model} unavailable, counting with litellm.token_counter: {e!s}"
+                )
+                # Counted text by text; the key never matches the reference tokenizer
+                self._tokenizers[model] = (
+                    f"{LITELLM_COUNTER}:{model}",
+                    LITELLM_COUNTER,
+                    model,
+                )
+        return self._tokenizers[model]
+
+    def message_overhead(self, model: str) -> int:
+        """
+        Get the tokens litellm counts for a chat message besides its content.
+
+        Args:
+            model: litellm model string
+
+        Returns:
+            Token count of an empty user message (role and message framing)
+        """
+        if model not in self._message_overheads:
+            try:
+                from litellm import token_counter
+
+                self._message_overheads[model] = token_counter(
+                    messages=[{"role": "user", "content": ""}], model=model
+                )
+            except Exception as e:
+                logger.warning(f"Could not count message overhead of {model}: {e!s}")
+                self._message_overheads[model] = DEFAULT_MESSAGE_OVERHEAD
+        return self._message_overheads[model]
+
+    def uses_reference_tokenizer(self, model: str) -> bool:
+        """
+        Check whether a model shares the tokenizer of persisted token counts.
+
+        Args:
+            model: litellm model string
+
+        Returns:
+            True if token counts persisted at ingest time are exact for the model
+        """
+        return (
+            self._get_tokenizer(model)[0]
+            == self._get_tokenizer(REFERENCE_TOKENIZER_MODEL)[0]
+        )
+
+    @staticmethod
+    def _count_batch(
+        tokenizer_type: str, tokenizer: Any, texts: list[str]
+    ) -> list[int]:
+        if tokenizer_type == LITELLM_COUNTER:
+            from litellm import token_counter
+
+            return [token_counter(model=tokenizer, text=text) for text in texts]
+        if tokenizer_type == "openai_tokenizer":
+            encoded = tokenizer.encode_batch(texts, disallowed_special=())
+            return [len(tokens) for tokens in encoded]
+        return [len(encoding.ids) for encoding in tokenizer.encode_batch(texts)]
+
+    def count_tokens_batch(
+        self, texts: list[str], model: str | None = None
+    ) -> list[int]:
+        """
+        Count the tokens of several texts with one tokenizer call.
+
+        Args:
+            texts: Texts to count
+            model: litellm model string (defaults to the reference tokenizer)
+
+        Returns:
+            Token count of each text, in input order
+        """
+        tokenizer_key, tokenizer_type, tokenizer_instance = self._get_tokenizer(model)
+
+        counts: list[int | None] = []
+        missing: dict[tuple[str, str], list[int]] = {}
+        for i, text in enumerate(texts):
+            key = (tokenizer_key, hashlib.sha1(text.encode()).hexdigest())
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+            else:
+                missing.setdefault(key, []).append(i)
+            counts.append(count)
+
+        if missing:
+            missing_texts = [texts[positions[0]] for positions in missing.values()]
+            try:
+                missing_counts = self._count_batch(
+                    tokenizer_type, tokenizer_instance, missing_texts
+                )
+            except Exception as e:
+                logger.warning(f"Batch tokenization failed, estimating: {e!s}")
+                missing_counts = [len(text) // 4 for text in missing_texts]
+
+            for (key, positions), count in zip(
+                missing.items(), missing_counts, strict=True
+            ):
+                for i in positions:
+                    counts[i] = count
+                self._counts[key] = count
+            while len(self._counts) > self.cache_size:
+                self._counts.popitem(last=False)
+
+        return counts
+
+    def count_tokens(self, text: str, model: str | None = None) -> int:
+        """
+        Count the tokens of a text.
+
+        Args:
+            text: Text to count
+            model: litellm model string (defaults to the reference tokenizer)
+
+        Returns:
+            Token count of the text
+        """
+        return self.count_tokens_batch([text], model)[0]
+
+    def truncate_to_tokens(self, text: str, model: str, max_tokens: int) -> str:
+        """
+        Cut a text to its longest prefix of at most max_tokens tokens.
+
+        The text is tokenized once and cut at a token boundary.
+
+        Args:
+            text: Text to truncate
+            model: litellm model string
+            max_tokens: Maximum number of tokens to keep
+
+        Returns:
+            The text, or its truncated prefix
+        """
+        if max_tokens <= 0:
+            return ""
+
+        _, tokenizer_type, tokenizer_instance = self._get_tokenizer(model)
+
+        try:
+            if tokenizer_type == LITELLM_COUNTER:
+                from litellm import token_counter
+
+                # Shorten by the ratio of counts until the prefix fits
+                token_count = token_counter(model=tokenizer_instance, text=text)
+                while token_count > max_tokens:
+                    text = text[: len(text) * max_tokens // token_count]
+                    token_count = token_counter(model=tokenizer_instance, text=text)
+                return text
+
+            if tokenizer_type == "openai_tokenizer":
+                tokens = tokenizer_instance.encode(text, disallowed_special=())
+                if len(tokens) <= max_tokens:
+                    return text
+                return tokenizer_instance.decode(tokens[:max_tokens])
+
+            encoding = tokenizer_instance.encode(text)
+            if len(encoding.ids) <= max_tokens:
+                return text
+            return text[: encoding.offsets[max_tokens - 1][1]]
+        except Exception as e:
+            logger.warning(f"Tokenization failed, truncating by characters: {e!s}")
+            return text[: max_tokens * 4]
+
+
+_token_counting_service: TokenCountingService | None = None
+
+
+def get_token_counting_service() -> TokenCountingService:
+    """
+    Get the process-wide token counting service.
+
+    Returns:
+        TokenCountingService: The shared token counting service instance
+    """
+    global _token_counting_service
+
+    if _token_counting_service is None:
+        _token_counting_service = TokenCountingService()
+    return _token_counting_service
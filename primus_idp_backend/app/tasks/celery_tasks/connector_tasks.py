@@ -1,28 +1,91 @@
 """Celery tasks for connector indexing."""
 
 import logging
-
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+import random
+import uuid
 
 from app.celery_app import celery_app
 from app.config import config
+from app.services.connector_lease_service import (
+    LEASE_COALESCED,
+    LEASE_USER_LIMIT,
+    get_connector_lease_service,
+)
+from app.tasks.celery_tasks.worker_runtime import get_celery_session_maker, run_async
 
 logger = logging.getLogger(__name__)
 
 
-def get_celery_session_maker():
+def _run_with_connector_lease(
+    task,
+    index_func,
+    connector_id: int,
+    search_space_id: int,
+    user_id: str,
+    start_date: str,
+    end_date: str,
+):
     """
-    Create a new async session maker for Celery tasks.
-    This is necessary because Celery tasks run in a new event loop,
-    and the default session maker is bound to the main app's event loop.
+    Run an indexing coroutine while holding the connector's lease.
+
+    A run requested while the connector is already being indexed is coalesced
+    into one follow-up run of the task holding the lease. A run over the user's
+    concurrency cap is retried later.
+
+    Args:
+        task: The bound Celery task
+        index_func: Async function indexing the connector
+        connector_id: ID of the connector
+        search_space_id: ID of the search space
+        user_id: ID of the user
+        start_date: Start date for indexing
+        end_date: End date for indexing
     """
-    engine = create_async_engine(
-        config.DATABASE_URL,
-        poolclass=NullPool,  # Don't use connection pooling for Celery tasks
-        echo=False,
-    )
-    return async_sessionmaker(engine, expire_on_commit=False)
+    args = [connector_id, search_space_id, user_id, start_date, end_date]
+
+    lease_service = get_connector_lease_service()
+    if lease_service is None:
+        run_async(index_func(*args))
+        return
+
+    token = task.request.id or str(uuid.uuid4())
+    try:
+        status, lease = lease_service.acquire(connector_id, user_id, token, args)
+    except Exception as e:
+        logger.warning(
+            f"Could not take the lease of connector {connector_id}, indexing without it: {e!s}"
+        )
+        run_async(index_func(*args))
+        return
+
+    if status == LEASE_COALESCED:
+        logger.info(
+            f"Connector {connector_id} is already being indexed; "
+            "the request will run once the current run finishes"
+        )
+        return
+    if status == LEASE_USER_LIMIT:
+        countdown = config.CONNECTOR_LEASE_RETRY_SECONDS * random.uniform(0.5, 1.5)
+        logger.info(
+            f"User {user_id} reached the limit of concurrent connector syncs; "
+            f"retrying connector {connector_id} in {countdown:.0f}s"
+        )
+        raise task.retry(countdown=countdown, max_retries=None)
+
+    try:
+        run_async(index_func(*args))
+    finally:
+        try:
+            pending_args = lease.release()
+        except Exception as e:
+            # The lease expires on its own once the heartbeat stopped
+            logger.warning(
+                f"Failed to release lease of connector {connector_id}: {e!s}"
+            )
+            pending_args = None
+        if pending_args:
+            logger.info(f"Starting coalesced indexing run of connector {connector_id}")
+            task.apply_async(args=pending_args)
 
 
 @celery_app.task(name="index_slack_messages", bind=True)
@@ -35,19 +98,15 @@ def index_slack_messages_task(
     end_date: str,
 ):
     """Celery task to index Slack messages."""
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _index_slack_messages(
-                connector_id, search_space_id, user_id, start_date, end_date
-            )
-        )
-    finally:
-        loop.close()
+    _run_with_connector_lease(
+        self,
+        _index_slack_messages,
+        connector_id,
+        search_space_id,
+        user_id,
+        start_date,
+        end_date,
+    )
 
 
 async def _index_slack_messages(
@@ -78,19 +137,15 @@ def index_notion_pages_task(
     end_date: str,
 ):
     """Celery task to index Notion pages."""
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _index_notion_pages(
-                connector_id, search_space_id, user_id, start_date, end_date
-            )
-        )
-    finally:
-        loop.close()
+    _run_with_connector_lease(
+        self,
+        _index_notion_pages,
+        connector_id,
+        search_space_id,
+        user_id,
+        start_date,
+        end_date,
+    )
 
 
 async def _index_notion_pages(
@@ -121,19 +176,15 @@ def index_github_repos_task(
     end_date: str,
 ):
     """Celery task to index GitHub repositories."""
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _index_github_repos(
-                connector_id, search_space_id, user_id, start_date, end_date
-            )
-        )
-    finally:
-        loop.close()
+    _run_with_connector_lease(
+        self,
+        _index_github_repos,
+        connector_id,
+        search_space_id,
+        user_id,
+        start_date,
+        end_date,
+    )
 
 
 async def _index_github_repos(
@@ -164,19 +215,15 @@ def index_linear_issues_task(
     end_date: str,
 ):
     """Celery task to index Linear issues."""
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _index_linear_issues(
-                connector_id, search_space_id, user_id, start_date, end_date
-            )
-        )
-    finally:
-        loop.close()
+    _run_with_connector_lease(
+        self,
+        _index_linear_issues,
+        connector_id,
+        search_space_id,
+        user_id,
+        start_date,
+        end_date,
+    )
 
 
 async def _index_linear_issues(
@@ -207,19 +254,15 @@ def index_jira_issues_task(
     end_date: str,
 ):
     """Celery task to index Jira issues."""
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _index_jira_issues(
-                connector_id, search_space_id, user_id, start_date, end_date
-            )
-        )
-    finally:
-        loop.close()
+    _run_with_connector_lease(
+        self,
+        _index_jira_issues,
+        connector_id,
+        search_space_id,
+        user_id,
+        start_date,
+        end_date,
+    )
 
 
 async def _index_jira_issues(
@@ -250,19 +293,15 @@ def index_confluence_pages_task(
     end_date: str,
 ):
     """Celery task to index Confluence pages."""
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _index_confluence_pages(
-                connector_id, search_space_id, user_id, start_date, end_date
-            )
-        )
-    finally:
-        loop.close()
+    _run_with_connector_lease(
+        self,
+        _index_confluence_pages,
+        connector_id,
+        search_space_id,
+        user_id,
+        start_date,
+        end_date,
+    )
 
 
 async def _index_confluence_pages(
@@ -293,19 +332,15 @@ def index_clickup_tasks_task(
     end_date: str,
 ):
     """Celery task to index ClickUp tasks."""
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _index_clickup_tasks(
-                connector_id, search_space_id, user_id, start_date, end_date
-            )
-        )
-    finally:
-        loop.close()
+    _run_with_connector_lease(
+        self,
+        _index_clickup_tasks,
+        connector_id,
+        search_space_id,
+        user_id,
+        start_date,
+        end_date,
+    )
 
 
 async def _index_clickup_tasks(
@@ -336,19 +371,15 @@ def index_google_calendar_events_task(
     end_date: str,
 ):
     """Celery task to index Google Calendar events."""
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _index_google_calendar_events(
-                connector_id, search_space_id, user_id, start_date, end_date
-            )
-        )
-    finally:
-        loop.close()
+    _run_with_connector_lease(
+        self,
+        _index_google_calendar_events,
+        connector_id,
+        search_space_id,
+        user_id,
+        start_date,
+        end_date,
+    )
 
 
 async def _index_google_calendar_events(
@@ -379,19 +410,15 @@ def index_airtable_records_task(
     end_date: str,
 ):
     """Celery task to index Airtable records."""
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _index_airtable_records(
-                connector_id, search_space_id, user_id, start_date, end_date
-            )
-        )
-    finally:
-        loop.close()
+    _run_with_connector_lease(
+        self,
+        _index_airtable_records,
+        connector_id,
+        search_space_id,
+        user_id,
+        start_date,
+        end_date,
+    )
 
 
 async def _index_airtable_records(
@@ -422,19 +449,15 @@ def index_google_gmail_messages_task(
     end_date: str,
 ):
     """Celery task to index Google Gmail messages."""
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _index_google_gmail_messages(
-                connector_id, search_space_id, user_id, start_date, end_date
-            )
-        )
-    finally:
-        loop.close()
+    _run_with_connector_lease(
+        self,
+        _index_google_gmail_messages,
+        connector_id,
+        search_space_id,
+        user_id,
+        start_date,
+        end_date,
+    )
 
 
 async def _index_google_gmail_messages(
@@ -453,7 +476,8 @@ async def _index_google_gmail_messages(
 
     # Parse dates to calculate days_back
     max_messages = 100
-    days_back = 30  # Default
+    # Periodic runs pass no start date and sync the changes since the last run
+    days_back = None
 
     if start_date:
         try:
@@ -483,19 +507,15 @@ def index_discord_messages_task(
     end_date: str,
 ):
     """Celery task to index Discord messages."""
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _index_discord_messages(
-                connector_id, search_space_id, user_id, start_date, end_date
-            )
-        )
-    finally:
-        loop.close()
+    _run_with_connector_lease(
+        self,
+        _index_discord_messages,
+        connector_id,
+        search_space_id,
+        user_id,
+        start_date,
+        end_date,
+    )
 
 
 async def _index_discord_messages(
@@ -526,19 +546,15 @@ def index_luma_events_task(
     end_date: str,
 ):
     """Celery task to index Luma events."""
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _index_luma_events(
-                connector_id, search_space_id, user_id, start_date, end_date
-            )
-        )
-    finally:
-        loop.close()
+    _run_with_connector_lease(
+        self,
+        _index_luma_events,
+        connector_id,
+        search_space_id,
+        user_id,
+        start_date,
+        end_date,
+    )
 
 
 async def _index_luma_events(
@@ -569,19 +585,15 @@ def index_elasticsearch_documents_task(
     end_date: str,
 ):
     """Celery task to index Elasticsearch documents."""
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _index_elasticsearch_documents(
-                connector_id, search_space_id, user_id, start_date, end_date
-            )
-        )
-    finally:
-        loop.close()
+    _run_with_connector_lease(
+        self,
+        _index_elasticsearch_documents,
+        connector_id,
+        search_space_id,
+        user_id,
+        start_date,
+        end_date,
+    )
 
 
 async def _index_elasticsearch_documents(
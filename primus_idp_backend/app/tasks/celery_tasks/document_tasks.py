@@ -2,35 +2,19 @@
 
 import logging
 
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
-
 from app.celery_app import celery_app
-from app.config import config
 from app.services.task_logging_service import TaskLoggingService
+from app.tasks.celery_tasks.worker_runtime import get_celery_session_maker, run_async
 from app.tasks.document_processors import (
     add_crawled_url_document,
     add_extension_received_document,
     add_youtube_video_document,
 )
+from app.utils.file_uploads import record_file_hash
 
 logger = logging.getLogger(__name__)
 
 
-def get_celery_session_maker():
-    """
-    Create a new async session maker for Celery tasks.
-    This is necessary because Celery tasks run in a new event loop,
-    and the default session maker is bound to the main app's event loop.
-    """
-    engine = create_async_engine(
-        config.DATABASE_URL,
-        poolclass=NullPool,  # Don't use connection pooling for Celery tasks
-        echo=False,
-    )
-    return async_sessionmaker(engine, expire_on_commit=False)
-
-
 @celery_app.task(name="process_extension_document", bind=True)
 def process_extension_document_task(
     self, individual_document_dict, search_space_id: int, user_id: str
@@ -43,20 +27,9 @@ def process_extension_document_task(
         search_space_id: ID of the search space
         user_id: ID of the user
     """
-    import asyncio
-
-    # Create a new event loop for this task
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _process_extension_document(
-                individual_document_dict, search_space_id, user_id
-            )
-        )
-    finally:
-        loop.close()
+    run_async(
+        _process_extension_document(individual_document_dict, search_space_id, user_id)
+    )
 
 
 async def _process_extension_document(
@@ -130,15 +103,7 @@ def process_crawled_url_task(self, url: str, search_space_id: int, user_id: str)
         search_space_id: ID of the search space
         user_id: ID of the user
     """
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(_process_crawled_url(url, search_space_id, user_id))
-    finally:
-        loop.close()
+    run_async(_process_crawled_url(url, search_space_id, user_id))
 
 
 async def _process_crawled_url(url: str, search_space_id: int, user_id: str):
@@ -195,15 +160,7 @@ def process_youtube_video_task(self, url: str, search_space_id: int, user_id: st
         search_space_id: ID of the search space
         user_id: ID of the user
     """
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(_process_youtube_video(url, search_space_id, user_id))
-    finally:
-        loop.close()
+    run_async(_process_youtube_video(url, search_space_id, user_id))
 
 
 async def _process_youtube_video(url: str, search_space_id: int, user_id: str):
@@ -252,7 +209,12 @@ async def _process_youtube_video(url: str, search_space_id: int, user_id: str):
 
 @celery_app.task(name="process_file_upload", bind=True)
 def process_file_upload_task(
-    self, file_path: str, filename: str, search_space_id: int, user_id: str
+    self,
+    file_path: str,
+    filename: str,
+    search_space_id: int,
+    user_id: str,
+    file_hash: str | None = None,
 ):
     """
     Celery task to process uploaded file.
@@ -262,22 +224,19 @@ def process_file_upload_task(
         filename: Original filename
         search_space_id: ID of the search space
         user_id: ID of the user
+        file_hash: Optional SHA-256 of the file, stored on the created document
     """
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _process_file_upload(file_path, filename, search_space_id, user_id)
-        )
-    finally:
-        loop.close()
+    run_async(
+        _process_file_upload(file_path, filename, search_space_id, user_id, file_hash)
+    )
 
 
 async def _process_file_upload(
-    file_path: str, filename: str, search_space_id: int, user_id: str
+    file_path: str,
+    filename: str,
+    search_space_id: int,
+    user_id: str,
+    file_hash: str | None = None,
 ):
     """Process file upload with new session."""
     from app.tasks.document_processors.file_processors import process_file_in_background
@@ -306,7 +265,10 @@ async def _process_file_upload(
                 session,
                 task_logger,
                 log_entry,
+                file_hash=file_hash,
             )
+            if file_hash:
+                await record_file_hash(session, filename, search_space_id, file_hash)
         except Exception as e:
             await task_logger.log_task_failure(
                 log_entry,
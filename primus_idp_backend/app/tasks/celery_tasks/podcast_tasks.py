@@ -2,30 +2,13 @@
 
 import logging
 
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
-
 from app.celery_app import celery_app
-from app.config import config
+from app.tasks.celery_tasks.worker_runtime import get_celery_session_maker, run_async
 from app.tasks.podcast_tasks import generate_chat_podcast
 
 logger = logging.getLogger(__name__)
 
 
-def get_celery_session_maker():
-    """
-    Create a new async session maker for Celery tasks.
-    This is necessary because Celery tasks run in a new event loop,
-    and the default session maker is bound to the main app's event loop.
-    """
-    engine = create_async_engine(
-        config.DATABASE_URL,
-        poolclass=NullPool,  # Don't use connection pooling for Celery tasks
-        echo=False,
-    )
-    return async_sessionmaker(engine, expire_on_commit=False)
-
-
 @celery_app.task(name="generate_chat_podcast", bind=True)
 def generate_chat_podcast_task(
     self, chat_id: int, search_space_id: int, podcast_title: str, user_id: int
@@ -39,17 +22,7 @@ def generate_chat_podcast_task(
         podcast_title: Title for the podcast
         user_id: ID of the user
     """
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        loop.run_until_complete(
-            _generate_chat_podcast(chat_id, search_space_id, podcast_title, user_id)
-        )
-    finally:
-        loop.close()
+    run_async(_generate_chat_podcast(chat_id, search_space_id, podcast_title, user_id))
 
 
 async def _generate_chat_podcast(
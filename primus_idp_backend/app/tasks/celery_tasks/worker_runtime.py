@@ -0,0 +1,119 @@
+"""
+Async runtime shared by the Celery tasks of a worker process.
+
+Each worker process keeps one event loop and one pooled database engine for its
+whole lifetime instead of creating them for every task, so tasks reuse open
+database connections. The runtime is created by the worker_process_init signal
+and disposed by worker_process_shutdown; it is also created lazily on first use
+for pools that don't send these signals (e.g. solo or threads).
+"""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Coroutine
+from typing import Any
+
+from celery.signals import worker_process_init, worker_process_shutdown
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerRuntime:
+    """Persistent event loop and pooled database engine of a worker."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.engine: AsyncEngine = create_async_engine(
+            config.DATABASE_URL,
+            pool_size=config.CELERY_DB_POOL_SIZE,
+            max_overflow=config.CELERY_DB_MAX_OVERFLOW,
+            pool_recycle=config.CELERY_DB_POOL_RECYCLE,
+            pool_pre_ping=True,  # Connections may idle for long between tasks
+            echo=False,
+        )
+        self.session_maker = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    def run[T](self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine to completion on the runtime's event loop."""
+        asyncio.set_event_loop(self.loop)
+        return self.loop.run_until_complete(coro)
+
+    def close(self) -> None:
+        """Dispose of the engine's connections and close the event loop."""
+        try:
+            self.loop.run_until_complete(self.engine.dispose())
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        finally:
+            self.loop.close()
+
+
+# Runtimes are per thread so thread-based pools never share a running loop
+_local = threading.local()
+
+
+def get_worker_runtime() -> WorkerRuntime:
+    """
+    Get the runtime of the current worker, creating it on first use.
+
+    Returns:
+        WorkerRuntime: The worker's event loop and database engine
+    """
+    runtime = getattr(_local, "runtime", None)
+    if runtime is None:
+        runtime = WorkerRuntime()
+        _local.runtime = runtime
+    return runtime
+
+
+def run_async[T](coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a task coroutine on the worker's persistent event loop.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    return get_worker_runtime().run(coro)
+
+
+def get_celery_session_maker() -> async_sessionmaker:
+    """
+    Get the async session maker of the worker's pooled database engine.
+
+    Sessions must be used from coroutines run with run_async, as the engine's
+    connections belong to the worker's event loop.
+    """
+    return get_worker_runtime().session_maker
+
+
+@worker_process_init.connect
+def init_worker_runtime(**kwargs) -> None:
+    """Create the runtime when a worker process starts."""
+    get_worker_runtime()
+    logger.info(
+        f"Celery worker runtime initialized (db pool size {config.CELERY_DB_POOL_SIZE})"
+    )
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_runtime(**kwargs) -> None:
+    """Dispose of the runtime when a worker process stops."""
+    runtime = getattr(_local, "runtime", None)
+    if runtime is None:
+        return
+
+    _local.runtime = None
+    try:
+        runtime.close()
+    except Exception as e:
+        logger.warning(f"Error closing Celery worker runtime: {e!s}")
@@ -5,11 +5,11 @@ Airtable connector indexer.
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.airtable_connector import AirtableConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
 from app.routes.airtable_add_connector_route import refresh_airtable_token
 from app.schemas.airtable_auth_credentials import AirtableAuthCredentialsBase
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -303,7 +303,7 @@ async def index_airtable_records(
                                             f"Airtable Record: {record_id}\n\n"
                                         )
                                         summary_embedding = (
-                                            config.embedding_model_instance.embed(
+                                            await get_embedding_service().embed(
                                                 summary_content
                                             )
                                         )
@@ -356,10 +356,8 @@ async def index_airtable_records(
                             else:
                                 # Fallback to simple summary if no LLM configured
                                 summary_content = f"Airtable Record: {record_id}\n\n"
-                                summary_embedding = (
-                                    config.embedding_model_instance.embed(
-                                        summary_content
-                                    )
+                                summary_embedding = await get_embedding_service().embed(
+                                    summary_content
                                 )
 
                             # Process chunks
@@ -3,12 +3,18 @@ Base functionality and shared imports for connector indexers.
 """
 
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from typing import Any
 
+from sqlalchemy import delete, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.config import config
 from app.db import (
+    Chunk,
     Document,
     SearchSourceConnector,
     SearchSourceConnectorType,
@@ -61,6 +67,204 @@ async def check_document_by_unique_identifier(
     return existing_doc_result.scalars().first()
 
 
+@dataclass
+class BulkIngestItem:
+    """
+    A connector item prepared for bulk ingestion.
+
+    Attributes:
+        unique_identifier_hash: Hash of the item's identifier in the source system
+        content_hash: Hash of the item's document content
+        payload: Indexer-specific data needed to build the document
+    """
+
+    unique_identifier_hash: str
+    content_hash: str
+    payload: dict[str, Any] = field(default_factory=dict)
+
+
+async def get_existing_content_hashes(
+    session: AsyncSession, unique_identifier_hashes: list[str]
+) -> dict[str, str]:
+    """
+    Resolve the stored content hashes of many documents in a single query.
+
+    Unlike check_document_by_unique_identifier, no Document objects or chunks
+    are loaded.
+
+    Args:
+        session: Database session
+        unique_identifier_hashes: Unique identifier hashes to look up
+
+    Returns:
+        Dictionary mapping each existing unique identifier hash to its content hash
+    """
+    if not unique_identifier_hashes:
+        return {}
+
+    result = await session.execute(
+        select(Document.unique_identifier_hash, Document.content_hash).where(
+            Document.unique_identifier_hash.in_(unique_identifier_hashes)
+        )
+    )
+    return dict(result.all())
+
+
+async def get_existing_document_metadata(
+    session: AsyncSession, unique_identifier_hashes: list[str]
+) -> dict[str, dict[str, Any]]:
+    """
+    Resolve the stored metadata of many documents in a single query.
+
+    Connectors use it to skip unchanged items by a source-side version (e.g. a
+    last edited time) before fetching their content.
+
+    Args:
+        session: Database session
+        unique_identifier_hashes: Unique identifier hashes to look up
+
+    Returns:
+        Dictionary mapping each existing unique identifier hash to its metadata
+    """
+    if not unique_identifier_hashes:
+        return {}
+
+    result = await session.execute(
+        select(Document.unique_identifier_hash, Document.document_metadata).where(
+            Document.unique_identifier_hash.in_(unique_identifier_hashes)
+        )
+    )
+    return {
+        unique_identifier_hash: metadata or {}
+        for unique_identifier_hash, metadata in result.all()
+    }
+
+
+async def filter_changed_items(
+    session: AsyncSession, items: list[BulkIngestItem]
+) -> tuple[list[BulkIngestItem], int]:
+    """
+    Keep only the items that are new or whose content changed since the last sync.
+
+    Items repeated within the batch are collapsed to their last occurrence, and
+    items whose content already belongs to another document are skipped because
+    content hashes are unique.
+
+    Args:
+        session: Database session
+        items: Items prepared for ingestion
+
+    Returns:
+        Tuple of (items to index, number of skipped items)
+    """
+    unique_items = list({item.unique_identifier_hash: item for item in items}.values())
+
+    existing_hashes = await get_existing_content_hashes(
+        session, [item.unique_identifier_hash for item in unique_items]
+    )
+
+    changed_items = [
+        item
+        for item in unique_items
+        if existing_hashes.get(item.unique_identifier_hash) != item.content_hash
+    ]
+
+    # Content hashes are unique, so content already stored under another
+    # identifier can't be stored again
+    taken_content_hashes: dict[str, str | None] = {}
+    if changed_items:
+        result = await session.execute(
+            select(Document.content_hash, Document.unique_identifier_hash).where(
+                Document.content_hash.in_([item.content_hash for item in changed_items])
+            )
+        )
+        taken_content_hashes = dict(result.all())
+
+    items_to_index = []
+    for item in changed_items:
+        owner = taken_content_hashes.get(item.content_hash, item.unique_identifier_hash)
+        if owner != item.unique_identifier_hash:
+            continue
+        taken_content_hashes[item.content_hash] = item.unique_identifier_hash
+        items_to_index.append(item)
+
+    return items_to_index, len(items) - len(items_to_index)
+
+
+async def bulk_upsert_documents(
+    session: AsyncSession,
+    documents: list[dict[str, Any]],
+    batch_size: int | None = None,
+) -> int:
+    """
+    Insert or update many documents and replace their chunks in batches.
+
+    Documents are written with INSERT ... ON CONFLICT (unique_identifier_hash)
+    DO UPDATE, so new and changed documents share one statement per batch. The
+    chunks of every written document are then replaced with bulk inserts.
+
+    Args:
+        session: Database session
+        documents: Document column values, each with an optional "chunks" list of
+            {"content", "embedding", "token_count"} dictionaries
+        batch_size: Number of documents written per statement
+
+    Returns:
+        Number of documents written
+    """
+    batch_size = batch_size or config.CONNECTOR_BULK_BATCH_SIZE
+    documents_written = 0
+
+    for start in range(0, len(documents), batch_size):
+        batch = documents[start : start + batch_size]
+        document_rows = [
+            {key: value for key, value in document.items() if key != "chunks"}
+            for document in batch
+        ]
+
+        upsert_statement = pg_insert(Document)
+        upsert_statement = upsert_statement.on_conflict_do_update(
+            index_elements=[Document.unique_identifier_hash],
+            set_={
+                "title": upsert_statement.excluded.title,
+                "content": upsert_statement.excluded.content,
+                "content_hash": upsert_statement.excluded.content_hash,
+                "embedding": upsert_statement.excluded.embedding,
+                "document_metadata": upsert_statement.excluded.document_metadata,
+            },
+        ).returning(Document.id, Document.unique_identifier_hash)
+
+        result = await session.execute(upsert_statement, document_rows)
+        document_ids = {
+            unique_identifier_hash: document_id
+            for document_id, unique_identifier_hash in result.all()
+        }
+
+        # Replace the chunks of every written document
+        await session.execute(
+            delete(Chunk).where(Chunk.document_id.in_(list(document_ids.values())))
+        )
+        chunk_rows = [
+            {
+                "document_id": document_ids[document["unique_identifier_hash"]],
+                "content": chunk["content"],
+                "embedding": chunk["embedding"],
+                "token_count": chunk.get("token_count"),
+            }
+            for document in batch
+            if document["unique_identifier_hash"] in document_ids
+            for chunk in document.get("chunks", [])
+        ]
+        for chunk_start in range(0, len(chunk_rows), batch_size):
+            await session.execute(
+                insert(Chunk), chunk_rows[chunk_start : chunk_start + batch_size]
+            )
+
+        documents_written += len(document_ids)
+
+    return documents_written
+
+
 async def get_connector_by_id(
     session: AsyncSession, connector_id: int, connector_type: SearchSourceConnectorType
 ) -> SearchSourceConnector | None:
@@ -7,9 +7,9 @@ from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.clickup_connector import ClickUpConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -262,8 +262,8 @@ async def index_clickup_tasks(
                                 )
                             else:
                                 summary_content = task_content
-                                summary_embedding = (
-                                    config.embedding_model_instance.embed(task_content)
+                                summary_embedding = await get_embedding_service().embed(
+                                    task_content
                                 )
 
                             # Process chunks
@@ -322,7 +322,7 @@ async def index_clickup_tasks(
                     else:
                         # Fallback to simple summary if no LLM configured
                         summary_content = task_content
-                        summary_embedding = config.embedding_model_instance.embed(
+                        summary_embedding = await get_embedding_service().embed(
                             task_content
                         )
 
@@ -7,9 +7,9 @@ from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.confluence_connector import ConfluenceConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -277,7 +277,7 @@ async def index_confluence_pages(
                                     f"Content Preview: {content_preview}\n\n"
                                 )
                             summary_content += f"Comments: {comment_count}"
-                            summary_embedding = config.embedding_model_instance.embed(
+                            summary_embedding = await get_embedding_service().embed(
                                 summary_content
                             )
 
@@ -337,7 +337,7 @@ async def index_confluence_pages(
                             content_preview += "..."
                         summary_content += f"Content Preview: {content_preview}\n\n"
                     summary_content += f"Comments: {comment_count}"
-                    summary_embedding = config.embedding_model_instance.embed(
+                    summary_embedding = await get_embedding_service().embed(
                         summary_content
                     )
 
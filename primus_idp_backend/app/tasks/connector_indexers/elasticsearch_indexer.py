@@ -2,24 +2,30 @@
 Elasticsearch indexer for Primus IDP
 """
 
+import asyncio
 import json
 import logging
+import time
 from datetime import UTC, datetime
+from itertools import islice
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.config import config as app_config
 from app.connectors.elasticsearch_connector import ElasticsearchConnector
-from app.db import Document, DocumentType, SearchSourceConnector
+from app.db import DocumentType, SearchSourceConnector
+from app.services.chunking_service import get_chunking_service
+from app.services.embedding_service import get_embedding_service
 from app.services.task_logging_service import TaskLoggingService
+from app.services.token_counting_service import get_token_counting_service
 from app.utils.document_converters import (
-    create_document_chunks,
     generate_content_hash,
     generate_unique_identifier_hash,
 )
 
-from .base import check_document_by_unique_identifier, check_duplicate_document_by_hash
+from .base import BulkIngestItem, bulk_upsert_documents, filter_changed_items
 
 logger = logging.getLogger(__name__)
 
@@ -144,163 +150,167 @@ async def index_elasticsearch_documents(
 
         # Get max documents to index
         max_documents = config.get("ELASTICSEARCH_MAX_DOCUMENTS", 1000)
+        slices = max(
+            1, int(config.get("ELASTICSEARCH_SLICES", app_config.ELASTICSEARCH_SLICES))
+        )
+        page_size = max(1, min(app_config.ELASTICSEARCH_PAGE_SIZE, max_documents))
+        fields = config.get("ELASTICSEARCH_FIELDS")
 
         logger.info(
             f"Starting Elasticsearch indexing for index '{index_name}' with max {max_documents} documents"
         )
 
-        documents_processed = 0
+        # Pages of hits flow from the slice readers to a single writer, which
+        # owns the database session; the bounded queue applies back pressure
+        page_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * slices)
+        slice_stats: dict[int, dict[str, int]] = {}
+        hits_fetched = 0
 
+        async def read_pages(slice_id: int, pages) -> None:
+            nonlocal hits_fetched
+            stats = slice_stats.setdefault(
+                slice_id, {"fetched": 0, "indexed": 0, "skipped": 0}
+            )
+            try:
+                async for hits in pages:
+                    hits = hits[: max(0, max_documents - hits_fetched)]
+                    if not hits:
+                        break
+                    hits_fetched += len(hits)
+                    stats["fetched"] += len(hits)
+                    await page_queue.put((slice_id, hits))
+            except Exception:
+                # The writer still has to learn the slice is done; its error is
+                # raised once every slice finished
+                await page_queue.put((slice_id, None))
+                raise
+            await page_queue.put((slice_id, None))
+
+        pit_id = None
         try:
+            try:
+                pit_id = await es_connector.open_point_in_time(
+                    index_name, keep_alive=app_config.ELASTICSEARCH_PIT_KEEP_ALIVE
+                )
+                readers = [
+                    read_pages(
+                        slice_id,
+                        es_connector.sliced_search(
+                            pit_id,
+                            query,
+                            slice_id=slice_id,
+                            max_slices=slices,
+                            size=page_size,
+                            keep_alive=app_config.ELASTICSEARCH_PIT_KEEP_ALIVE,
+                            fields=fields,
+                        ),
+                    )
+                    for slice_id in range(slices)
+                ]
+            except Exception as e:
+                # Clusters without point in time support are read with one scroll
+                logger.warning(
+                    f"Could not open a point in time on '{index_name}', falling back to scroll search: {e}"
+                )
+                slices = 1
+                readers = [
+                    read_pages(
+                        0,
+                        _batch_hits(
+                            es_connector.scroll_search(
+                                index=index_name,
+                                query=query,
+                                size=page_size,
+                                fields=fields,
+                            ),
+                            page_size,
+                        ),
+                    )
+                ]
+
             await task_logger.log_task_progress(
                 log_entry,
-                "Starting scroll search",
+                "Starting sliced search",
                 {
                     "index": index_name,
-                    "stage": "scroll_start",
+                    "stage": "search_start",
                     "max_documents": max_documents,
+                    "slices": slices,
+                    "point_in_time": pit_id is not None,
                 },
             )
-            # Use scroll search for large result sets
-            async for hit in es_connector.scroll_search(
-                index=index_name,
-                query=query,
-                size=min(max_documents, 100),  # Scroll in batches
-                fields=config.get("ELASTICSEARCH_FIELDS"),
-            ):
-                if documents_processed >= max_documents:
-                    break
 
-                try:
-                    # Extract document data
-                    doc_id = hit["_id"]
-                    source = hit.get("_source", {})
-
-                    # Build document title
-                    title_field = config.get("ELASTICSEARCH_TITLE_FIELD")
-                    if not title_field:
-                        for candidate in ("title", "name", "subject"):
-                            if candidate in source:
-                                title_field = candidate
-                                break
-                    title = (
-                        str(source.get(title_field, doc_id))
-                        if title_field is not None
-                        else str(doc_id)
-                    )
-
-                    # Build document content
-                    content = _build_document_content(source, config)
-
-                    if not content.strip():
-                        logger.warning(f"Skipping document {doc_id} - no content found")
+            started_at = time.monotonic()
+            last_progress_at = started_at
+            documents_processed = 0
+            reader_tasks = [asyncio.create_task(reader) for reader in readers]
+            try:
+                open_readers = len(reader_tasks)
+                while open_readers:
+                    slice_id, hits = await page_queue.get()
+                    if hits is None:
+                        open_readers -= 1
                         continue
 
-                    # Create content hash
-                    content_hash = generate_content_hash(content, search_space_id)
-
-                    # Build metadata
-                    metadata = {
-                        "elasticsearch_id": doc_id,
-                        "elasticsearch_index": hit.get("_index", index_name),
-                        "elasticsearch_score": hit.get("_score"),
-                        "indexed_at": datetime.now().isoformat(),
-                        "source": "ELASTICSEARCH_CONNECTOR",
-                    }
-
-                    # Add any additional metadata fields specified in config
-                    if "ELASTICSEARCH_METADATA_FIELDS" in config:
-                        for field in config["ELASTICSEARCH_METADATA_FIELDS"]:
-                            if field in source:
-                                metadata[f"es_{field}"] = source[field]
-
-                    # Build source-unique identifier and hash (prefer source id dedupe)
-                    source_identifier = f"{hit.get('_index', index_name)}:{doc_id}"
-                    unique_identifier_hash = generate_unique_identifier_hash(
-                        DocumentType.ELASTICSEARCH_CONNECTOR,
-                        source_identifier,
-                        search_space_id,
-                    )
-
-                    # Two-step duplicate detection: first by source-unique id, then by content hash
-                    existing_doc = await check_document_by_unique_identifier(
-                        session, unique_identifier_hash
-                    )
-                    if not existing_doc:
-                        existing_doc = await check_duplicate_document_by_hash(
-                            session, content_hash
+                    try:
+                        written, skipped = await _index_hits(
+                            session, hits, index_name, config, search_space_id
                         )
+                        await session.commit()
+                    except Exception as e:
+                        # Skip the page rather than failing the whole import
+                        logger.error(
+                            f"Error indexing a page of {len(hits)} Elasticsearch "
+                            f"documents from slice {slice_id}: {e}",
+                            exc_info=True,
+                        )
+                        await session.rollback()
+                        slice_stats[slice_id]["skipped"] += len(hits)
+                        continue
 
-                    if existing_doc:
-                        # If content is unchanged, skip. Otherwise update the existing document.
-                        if existing_doc.content_hash == content_hash:
-                            logger.info(
-                                f"Skipping ES doc {doc_id} — already indexed (doc id {existing_doc.id})"
-                            )
-                            continue
-                        else:
-                            logger.info(
-                                f"Updating existing document {existing_doc.id} for ES doc {doc_id}"
-                            )
-                            existing_doc.title = title
-                            existing_doc.content = content
-                            existing_doc.content_hash = content_hash
-                            existing_doc.document_metadata = metadata
-                            existing_doc.unique_identifier_hash = unique_identifier_hash
-                            chunks = await create_document_chunks(content)
-                            existing_doc.chunks = chunks
-                            await session.flush()
-                            documents_processed += 1
-                            if documents_processed % 10 == 0:
-                                await session.commit()
-                            continue
-
-                    # Create document
-                    document = Document(
-                        title=title,
-                        content=content,
-                        content_hash=content_hash,
-                        unique_identifier_hash=unique_identifier_hash,
-                        document_type=DocumentType.ELASTICSEARCH_CONNECTOR,
-                        document_metadata=metadata,
-                        search_space_id=search_space_id,
-                    )
-
-                    # Create chunks and attach to document (persist via relationship)
-                    chunks = await create_document_chunks(content)
-                    document.chunks = chunks
-                    session.add(document)
-                    await session.flush()
-
-                    documents_processed += 1
-
-                    if documents_processed % 10 == 0:
-                        logger.info(
-                            f"Processed {documents_processed} Elasticsearch documents"
+                    documents_processed += written
+                    slice_stats[slice_id]["indexed"] += written
+                    slice_stats[slice_id]["skipped"] += skipped
+
+                    if time.monotonic() - last_progress_at >= 10:
+                        last_progress_at = time.monotonic()
+                        await task_logger.log_task_progress(
+                            log_entry,
+                            f"Indexed {documents_processed} Elasticsearch documents",
+                            {
+                                "index": index_name,
+                                "stage": "indexing",
+                                "documents_indexed": documents_processed,
+                                "slices": _summarize_slices(
+                                    slice_stats, last_progress_at - started_at
+                                ),
+                            },
                         )
-                        await session.commit()
 
-                except Exception as e:
-                    msg = f"Error processing Elasticsearch document {hit.get('_id', 'unknown')}: {e}"
-                    logger.error(msg)
-                    await task_logger.log_task_failure(
-                        log_entry,
-                        "Document processing error",
-                        msg,
-                        {
-                            "document_id": hit.get("_id", "unknown"),
-                            "error_type": type(e).__name__,
-                        },
-                    )
-                    continue
+                # Surface errors of the slice readers
+                await asyncio.gather(*reader_tasks)
+            finally:
+                for task in reader_tasks:
+                    task.cancel()
 
-            # Final commit
-            await session.commit()
+            slice_summary = _summarize_slices(
+                slice_stats, time.monotonic() - started_at
+            )
+            for slice_id, stats in slice_summary.items():
+                logger.info(
+                    f"Elasticsearch slice {slice_id}: fetched {stats['fetched']}, "
+                    f"indexed {stats['indexed']}, skipped {stats['skipped']} "
+                    f"({stats['docs_per_second']} docs/s)"
+                )
 
             await task_logger.log_task_success(
                 log_entry,
                 f"Successfully indexed {documents_processed} documents from Elasticsearch",
-                {"documents_indexed": documents_processed, "index": index_name},
+                {
+                    "documents_indexed": documents_processed,
+                    "index": index_name,
+                    "slices": slice_summary,
+                },
             )
             logger.info(
                 f"Successfully indexed {documents_processed} documents from Elasticsearch"
@@ -324,6 +334,8 @@ async def index_elasticsearch_documents(
         finally:
             # Clean up Elasticsearch connection
             if es_connector:
+                if pit_id:
+                    await es_connector.close_point_in_time(pit_id)
                 await es_connector.close()
 
     except Exception as e:
@@ -338,6 +350,164 @@ async def index_elasticsearch_documents(
         return 0, error_msg
 
 
+async def _batch_hits(hits, size: int):
+    """
+    Group the hits of a scroll search into pages
+
+    Args:
+        hits: Async iterator of document hits
+        size: Number of hits per page
+
+    Yields:
+        Pages of document hits
+    """
+    page = []
+    async for hit in hits:
+        page.append(hit)
+        if len(page) >= size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+async def _index_hits(
+    session: AsyncSession,
+    hits: list[dict[str, Any]],
+    index_name: str,
+    config: dict[str, Any],
+    search_space_id: int,
+) -> tuple[int, int]:
+    """
+    Index a page of Elasticsearch hits in bulk
+
+    Hits are deduplicated by their source ID hash in one query, the chunks of
+    every changed document are embedded in one batch and the documents are
+    written with bulk upserts.
+
+    Args:
+        session: Database session
+        hits: Document hits from Elasticsearch
+        index_name: Index the hits were searched in
+        config: Connector configuration
+        search_space_id: Search space ID
+
+    Returns:
+        Tuple of (number of documents written, number of hits skipped)
+    """
+    items = []
+    for hit in hits:
+        # Extract document data
+        doc_id = hit["_id"]
+        source = hit.get("_source", {})
+
+        # Build document title
+        title_field = config.get("ELASTICSEARCH_TITLE_FIELD")
+        if not title_field:
+            for candidate in ("title", "name", "subject"):
+                if candidate in source:
+                    title_field = candidate
+                    break
+        title = (
+            str(source.get(title_field, doc_id))
+            if title_field is not None
+            else str(doc_id)
+        )
+
+        # Build document content
+        content = _build_document_content(source, config)
+
+        if not content.strip():
+            logger.warning(f"Skipping document {doc_id} - no content found")
+            continue
+
+        # Build metadata
+        metadata = {
+            "elasticsearch_id": doc_id,
+            "elasticsearch_index": hit.get("_index", index_name),
+            "elasticsearch_score": hit.get("_score"),
+            "indexed_at": datetime.now().isoformat(),
+            "source": "ELASTICSEARCH_CONNECTOR",
+        }
+
+        # Add any additional metadata fields specified in config
+        if "ELASTICSEARCH_METADATA_FIELDS" in config:
+            for field in config["ELASTICSEARCH_METADATA_FIELDS"]:
+                if field in source:
+                    metadata[f"es_{field}"] = source[field]
+
+        # Build source-unique identifier and hash (prefer source id dedupe)
+        source_identifier = f"{hit.get('_index', index_name)}:{doc_id}"
+        items.append(
+            BulkIngestItem(
+                unique_identifier_hash=generate_unique_identifier_hash(
+                    DocumentType.ELASTICSEARCH_CONNECTOR,
+                    source_identifier,
+                    search_space_id,
+                ),
+                content_hash=generate_content_hash(content, search_space_id),
+                payload={"title": title, "content": content, "metadata": metadata},
+            )
+        )
+
+    items_to_index, skipped = await filter_changed_items(session, items)
+    skipped += len(hits) - len(items)
+    if not items_to_index:
+        return 0, skipped
+
+    # Chunk every document, then embed all chunks of the page at once
+    chunking_service = get_chunking_service()
+    chunk_texts_per_item = await asyncio.gather(
+        *(chunking_service.chunk(item.payload["content"]) for item in items_to_index)
+    )
+    chunk_texts = [text for texts in chunk_texts_per_item for text in texts]
+    embeddings = await get_embedding_service().embed_batch(chunk_texts)
+    token_counts = get_token_counting_service().count_tokens_batch(chunk_texts)
+
+    chunks = iter(zip(chunk_texts, embeddings, token_counts, strict=True))
+    documents = [
+        {
+            "search_space_id": search_space_id,
+            "title": item.payload["title"],
+            "document_type": DocumentType.ELASTICSEARCH_CONNECTOR,
+            "document_metadata": item.payload["metadata"],
+            "content": item.payload["content"],
+            "content_hash": item.content_hash,
+            "unique_identifier_hash": item.unique_identifier_hash,
+            "embedding": None,
+            "chunks": [
+                {"content": text, "embedding": embedding, "token_count": count}
+                for text, embedding, count in islice(chunks, len(texts))
+            ],
+        }
+        for item, texts in zip(items_to_index, chunk_texts_per_item, strict=True)
+    ]
+
+    return await bulk_upsert_documents(session, documents), skipped
+
+
+def _summarize_slices(
+    slice_stats: dict[int, dict[str, int]], elapsed_seconds: float
+) -> dict[int, dict[str, Any]]:
+    """
+    Add the throughput of each slice to its counters
+
+    Args:
+        slice_stats: Fetched, indexed and skipped hits per slice
+        elapsed_seconds: Time since the import started
+
+    Returns:
+        Counters and documents fetched per second of each slice
+    """
+    return {
+        slice_id: {
+            **stats,
+            "docs_per_second": round(stats["fetched"] / max(elapsed_seconds, 1e-6), 1),
+        }
+        for slice_id, stats in sorted(slice_stats.items())
+    }
+
+
 def _build_elasticsearch_query(config: dict[str, Any]) -> dict[str, Any]:
     """
     Build Elasticsearch query from connector configuration
@@ -2,14 +2,18 @@
 GitHub connector indexer.
 """
 
+import asyncio
 from datetime import UTC, datetime
+from typing import Any
 
+from sqlalchemy import delete, or_, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import config
 from app.connectors.github_connector import GitHubConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -20,12 +24,83 @@ from app.utils.document_converters import (
 )
 
 from .base import (
-    check_document_by_unique_identifier,
+    BulkIngestItem,
+    bulk_upsert_documents,
+    filter_changed_items,
     get_connector_by_id,
     logger,
 )
 
 
+async def _get_stored_repository_files(
+    session: AsyncSession, search_space_id: int, repo_full_name: str
+) -> dict[str, list[tuple[int, str, str | None]]]:
+    """
+    Resolve the documents stored for the files of a repository in a single query.
+
+    Args:
+        session: Database session
+        search_space_id: ID of the search space
+        repo_full_name: The full name of the repository (e.g., 'owner/repo')
+
+    Returns:
+        Dictionary mapping each stored file path to its
+        (document id, unique identifier hash, blob SHA) tuples
+    """
+    result = await session.execute(
+        select(
+            Document.id, Document.unique_identifier_hash, Document.document_metadata
+        ).where(
+            Document.search_space_id == search_space_id,
+            Document.document_type == DocumentType.GITHUB_CONNECTOR,
+            or_(
+                Document.document_metadata["repository_full_name"].as_string()
+                == repo_full_name,
+                Document.document_metadata["repository"].as_string() == repo_full_name,
+            ),
+        )
+    )
+
+    stored_files: dict[str, list[tuple[int, str, str | None]]] = {}
+    for document_id, unique_identifier_hash, metadata in result.all():
+        file_path = (metadata or {}).get("file_path")
+        if not file_path:
+            continue
+        # Documents updated by older syncs store the SHA as "file_sha"
+        sha = metadata.get("sha") or metadata.get("file_sha")
+        stored_files.setdefault(file_path, []).append(
+            (document_id, unique_identifier_hash, sha)
+        )
+    return stored_files
+
+
+async def _download_blobs(
+    github_client: GitHubConnector,
+    repo_full_name: str,
+    files: list[dict[str, Any]],
+) -> list[str | None]:
+    """
+    Download the content of many files concurrently by their blob SHAs.
+
+    Args:
+        github_client: GitHub connector client
+        repo_full_name: The full name of the repository (e.g., 'owner/repo')
+        files: File details as listed by get_repository_tree
+
+    Returns:
+        Content of each file in input order, None where the download failed
+    """
+    semaphore = asyncio.Semaphore(max(1, config.GITHUB_MAX_CONCURRENT_DOWNLOADS))
+
+    async def download(file_info: dict[str, Any]) -> str | None:
+        async with semaphore:
+            return await asyncio.to_thread(
+                github_client.get_blob_content, repo_full_name, file_info["sha"]
+            )
+
+    return await asyncio.gather(*(download(file_info) for file_info in files))
+
+
 async def index_github_repos(
     session: AsyncSession,
     connector_id: int,
@@ -157,6 +232,10 @@ async def index_github_repos(
                 f"Date range requested: {start_date} to {end_date} (Note: GitHub indexing processes all files regardless of dates)"
             )
 
+        # Decide once whether summaries use the user's LLM or the fallback
+        user_llm = await get_user_long_context_llm(session, user_id, search_space_id)
+        documents_deleted = 0
+
         # 6. Iterate through selected repositories and index files
         for repo_full_name in repo_full_names_to_index:
             if not repo_full_name or not isinstance(repo_full_name, str):
@@ -165,140 +244,127 @@ async def index_github_repos(
 
             logger.info(f"Processing repository: {repo_full_name}")
             try:
-                files_to_index = github_client.get_repository_files(repo_full_name)
+                # List the whole branch with a single Git Trees API call
+                files_to_index, listing_complete = await asyncio.to_thread(
+                    github_client.get_repository_tree, repo_full_name
+                )
                 if not files_to_index:
                     logger.info(
                         f"No indexable files found in repository: {repo_full_name}"
                     )
-                    continue
+                    # A complete empty listing still removes the stored documents
+                    if not listing_complete:
+                        continue
 
                 logger.info(
                     f"Found {len(files_to_index)} files to process in {repo_full_name}"
                 )
 
+                # Diff blob SHAs against the documents stored for this repository
+                stored_files = await _get_stored_repository_files(
+                    session, search_space_id, repo_full_name
+                )
+                tree_paths = {file_info["path"] for file_info in files_to_index}
+
+                # A partial listing (e.g. a rate-limited directory) says nothing
+                # about the files it misses, so only a complete one removes documents
+                removed_document_ids = []
+                if listing_complete:
+                    removed_document_ids = [
+                        document_id
+                        for file_path, stored in stored_files.items()
+                        if file_path not in tree_paths
+                        for document_id, _, _ in stored
+                    ]
+                else:
+                    logger.warning(
+                        f"File listing of {repo_full_name} is incomplete, "
+                        "keeping documents of files that were not listed"
+                    )
+                if removed_document_ids:
+                    await session.execute(
+                        delete(Document).where(Document.id.in_(removed_document_ids))
+                    )
+                    documents_deleted += len(removed_document_ids)
+                    logger.info(
+                        f"Deleted {len(removed_document_ids)} documents for files removed from {repo_full_name}"
+                    )
+
+                changed_files = []
                 for file_info in files_to_index:
-                    file_path = file_info.get("path")
-                    file_url = file_info.get("url")
-                    file_sha = file_info.get("sha")
-                    file_type = file_info.get("type")  # 'code' or 'doc'
-                    full_path_key = f"{repo_full_name}/{file_path}"
+                    stored = stored_files.get(file_info["path"], [])
+                    if any(sha == file_info["sha"] for _, _, sha in stored):
+                        continue
+                    changed_files.append(file_info)
+
+                logger.info(
+                    f"{len(changed_files)} new or changed files in {repo_full_name}, "
+                    f"{len(files_to_index) - len(changed_files)} unchanged"
+                )
+                if not changed_files:
+                    continue
 
-                    if not file_path or not file_url or not file_sha:
+                # Stay within the hourly API quota; files left out are picked up
+                # by the next sync because their SHAs are not stored yet
+                remaining_calls = await asyncio.to_thread(
+                    github_client.get_rate_limit_remaining
+                )
+                if remaining_calls is not None:
+                    download_budget = max(
+                        0, remaining_calls - config.GITHUB_RATE_LIMIT_RESERVE
+                    )
+                    if download_budget < len(changed_files):
                         logger.warning(
-                            f"Skipping file with missing info in {repo_full_name}: {file_info}"
+                            f"GitHub rate limit allows {download_budget} of {len(changed_files)} downloads for {repo_full_name}. "
+                            "Remaining files will be indexed by the next sync."
                         )
-                        continue
+                        errors.append(
+                            f"Rate limit reached for {repo_full_name}: {len(changed_files) - download_budget} files deferred"
+                        )
+                        changed_files = changed_files[:download_budget]
 
-                    # Get file content
-                    file_content = github_client.get_file_content(
-                        repo_full_name, file_path
-                    )
+                # Download only new or changed blobs, a few at a time
+                file_contents = await _download_blobs(
+                    github_client, repo_full_name, changed_files
+                )
 
+                items = []
+                for file_info, file_content in zip(
+                    changed_files, file_contents, strict=True
+                ):
+                    full_path_key = f"{repo_full_name}/{file_info['path']}"
                     if file_content is None:
                         logger.warning(
                             f"Could not retrieve content for {full_path_key}. Skipping."
                         )
                         continue  # Skip if content fetch failed
 
-                    # Generate unique identifier hash for this GitHub file
-                    unique_identifier_hash = generate_unique_identifier_hash(
-                        DocumentType.GITHUB_CONNECTOR, file_sha, search_space_id
+                    # Files are identified by path so a changed file updates its
+                    # document; the path is part of the content hash so identical
+                    # files (e.g. empty __init__.py) each get a document
+                    items.append(
+                        BulkIngestItem(
+                            unique_identifier_hash=generate_unique_identifier_hash(
+                                DocumentType.GITHUB_CONNECTOR,
+                                full_path_key,
+                                search_space_id,
+                            ),
+                            content_hash=generate_content_hash(
+                                f"{full_path_key}\n{file_content}", search_space_id
+                            ),
+                            payload={**file_info, "content": file_content},
+                        )
                     )
 
-                    # Generate content hash
-                    content_hash = generate_content_hash(file_content, search_space_id)
+                items_to_index, _ = await filter_changed_items(session, items)
 
-                    # Check if document with this unique identifier already exists
-                    existing_document = await check_document_by_unique_identifier(
-                        session, unique_identifier_hash
-                    )
+                documents = []
+                for item in items_to_index:
+                    file_path = item.payload["path"]
+                    file_content = item.payload["content"]
+                    full_path_key = f"{repo_full_name}/{file_path}"
 
-                    if existing_document:
-                        # Document exists - check if content has changed
-                        if existing_document.content_hash == content_hash:
-                            logger.info(
-                                f"Document for GitHub file {full_path_key} unchanged. Skipping."
-                            )
-                            continue
-                        else:
-                            # Content has changed - update the existing document
-                            logger.info(
-                                f"Content changed for GitHub file {full_path_key}. Updating document."
-                            )
-
-                            # Generate summary with metadata
-                            user_llm = await get_user_long_context_llm(
-                                session, user_id, search_space_id
-                            )
-                            if user_llm:
-                                file_extension = (
-                                    file_path.split(".")[-1]
-                                    if "." in file_path
-                                    else None
-                                )
-                                document_metadata = {
-                                    "file_path": full_path_key,
-                                    "repository": repo_full_name,
-                                    "file_type": file_extension or "unknown",
-                                    "document_type": "GitHub Repository File",
-                                    "connector_type": "GitHub",
-                                }
-                                (
-                                    summary_content,
-                                    summary_embedding,
-                                ) = await generate_document_summary(
-                                    file_content, user_llm, document_metadata
-                                )
-                            else:
-                                summary_content = f"GitHub file: {full_path_key}\n\n{file_content[:1000]}..."
-                                summary_embedding = (
-                                    config.embedding_model_instance.embed(
-                                        summary_content
-                                    )
-                                )
-
-                            # Chunk the content
-                            try:
-                                if hasattr(config, "code_chunker_instance"):
-                                    chunks_data = [
-                                        await create_document_chunks(file_content)
-                                    ][0]
-                                else:
-                                    chunks_data = await create_document_chunks(
-                                        file_content
-                                    )
-                            except Exception as chunk_err:
-                                logger.error(
-                                    f"Failed to chunk file {full_path_key}: {chunk_err}"
-                                )
-                                continue
-
-                            # Update existing document
-                            existing_document.title = f"GitHub - {full_path_key}"
-                            existing_document.content = summary_content
-                            existing_document.content_hash = content_hash
-                            existing_document.embedding = summary_embedding
-                            existing_document.document_metadata = {
-                                "file_path": file_path,
-                                "file_sha": file_sha,
-                                "file_url": file_url,
-                                "repository": repo_full_name,
-                                "indexed_at": datetime.now(UTC).strftime(
-                                    "%Y-%m-%d %H:%M:%S"
-                                ),
-                            }
-                            existing_document.chunks = chunks_data
-
-                            logger.info(
-                                f"Successfully updated GitHub file {full_path_key}"
-                            )
-                            continue
-
-                    # Document doesn't exist - create new one
                     # Generate summary with metadata
-                    user_llm = await get_user_long_context_llm(
-                        session, user_id, search_space_id
-                    )
                     if user_llm:
                         # Extract file extension from file path
                         file_extension = (
@@ -322,30 +388,15 @@ async def index_github_repos(
                         summary_content = (
                             f"GitHub file: {full_path_key}\n\n{file_content[:1000]}..."
                         )
-                        summary_embedding = config.embedding_model_instance.embed(
+                        summary_embedding = await get_embedding_service().embed(
                             summary_content
                         )
 
                     # Chunk the content
                     try:
-                        chunks_data = [await create_document_chunks(file_content)][0]
-
-                        # Use code chunker if available, otherwise regular chunker
-                        if hasattr(config, "code_chunker_instance"):
-                            chunks_data = [
-                                {
-                                    "content": chunk.text,
-                                    "embedding": config.embedding_model_instance.embed(
-                                        chunk.text
-                                    ),
-                                }
-                                for chunk in config.code_chunker_instance.chunk(
-                                    file_content
-                                )
-                            ]
-                        else:
-                            chunks_data = await create_document_chunks(file_content)
-
+                        chunks = await create_document_chunks(
+                            file_content, file_path=file_path
+                        )
                     except Exception as chunk_err:
                         logger.error(
                             f"Failed to chunk file {full_path_key}: {chunk_err}"
@@ -355,31 +406,57 @@ async def index_github_repos(
                         )
                         continue  # Skip this file if chunking fails
 
-                    doc_metadata = {
-                        "repository_full_name": repo_full_name,
-                        "file_path": file_path,
-                        "full_path": full_path_key,  # For easier lookup
-                        "url": file_url,
-                        "sha": file_sha,
-                        "type": file_type,
-                        "indexed_at": datetime.now(UTC).isoformat(),
-                    }
-
-                    # Create new document
-                    logger.info(f"Creating new document for file: {full_path_key}")
-                    document = Document(
-                        title=f"GitHub - {file_path}",
-                        document_type=DocumentType.GITHUB_CONNECTOR,
-                        document_metadata=doc_metadata,
-                        content=summary_content,  # Store summary
-                        content_hash=content_hash,
-                        unique_identifier_hash=unique_identifier_hash,
-                        embedding=summary_embedding,
-                        search_space_id=search_space_id,
-                        chunks=chunks_data,  # Associate chunks directly
+                    documents.append(
+                        {
+                            "search_space_id": search_space_id,
+                            "title": f"GitHub - {file_path}",
+                            "document_type": DocumentType.GITHUB_CONNECTOR,
+                            "document_metadata": {
+                                "repository_full_name": repo_full_name,
+                                "file_path": file_path,
+                                "full_path": full_path_key,  # For easier lookup
+                                "url": item.payload["url"],
+                                "sha": item.payload["sha"],
+                                "type": item.payload["type"],
+                                "indexed_at": datetime.now(UTC).isoformat(),
+                            },
+                            "content": summary_content,  # Store summary
+                            "content_hash": item.content_hash,
+                            "unique_identifier_hash": item.unique_identifier_hash,
+                            "embedding": summary_embedding,
+                            "chunks": [
+                                {
+                                    "content": chunk.content,
+                                    "embedding": chunk.embedding,
+                                    "token_count": chunk.token_count,
+                                }
+                                for chunk in chunks
+                            ],
+                        }
+                    )
+
+                # Insert new and update changed files in bulk
+                documents_processed += await bulk_upsert_documents(session, documents)
+
+                # Older versions stored under other identifiers (earlier syncs keyed
+                # documents by blob SHA) are replaced by the documents just written
+                written_paths = {
+                    document["document_metadata"]["file_path"]: document[
+                        "unique_identifier_hash"
+                    ]
+                    for document in documents
+                }
+                replaced_document_ids = [
+                    document_id
+                    for file_path, unique_identifier_hash in written_paths.items()
+                    for document_id, stored_hash, _ in stored_files.get(file_path, [])
+                    if stored_hash != unique_identifier_hash
+                ]
+                if replaced_document_ids:
+                    await session.execute(
+                        delete(Document).where(Document.id.in_(replaced_document_ids))
                     )
-                    session.add(document)
-                    documents_processed += 1
+                    documents_deleted += len(replaced_document_ids)
 
             except Exception as repo_err:
                 logger.error(
@@ -399,6 +476,7 @@ async def index_github_repos(
             f"Successfully completed GitHub indexing for connector {connector_id}",
             {
                 "documents_processed": documents_processed,
+                "documents_deleted": documents_deleted,
                 "errors_count": len(errors),
                 "repo_count": len(repo_full_names_to_index),
             },
@@ -8,9 +8,9 @@ from google.oauth2.credentials import Credentials
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.google_calendar_connector import GoogleCalendarConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -313,7 +313,7 @@ async def index_google_calendar_events(
                                 if len(description) > 1000:
                                     desc_preview += "..."
                                 summary_content += f"Description: {desc_preview}\n"
-                            summary_embedding = config.embedding_model_instance.embed(
+                            summary_embedding = await get_embedding_service().embed(
                                 summary_content
                             )
 
@@ -378,7 +378,7 @@ async def index_google_calendar_events(
                         if len(description) > 1000:
                             desc_preview += "..."
                         summary_content += f"Description: {desc_preview}\n"
-                    summary_embedding = config.embedding_model_instance.embed(
+                    summary_embedding = await get_embedding_service().embed(
                         summary_content
                     )
                 chunks = await create_document_chunks(event_markdown)
@@ -5,16 +5,20 @@ Google Gmail connector indexer.
 from datetime import datetime
 
 from google.oauth2.credentials import Credentials
+from sqlalchemy import delete
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import flag_modified
 
 from app.config import config
 from app.connectors.google_gmail_connector import GoogleGmailConnector
 from app.db import (
     Document,
     DocumentType,
+    SearchSourceConnector,
     SearchSourceConnectorType,
 )
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -32,6 +36,18 @@ from .base import (
 )
 
 
+def _store_history_id(connector: SearchSourceConnector, history_id: str) -> None:
+    """
+    Store the mailbox history ID the next sync fetches changes from.
+
+    Args:
+        connector: The Gmail connector
+        history_id: Gmail history ID reached by this sync
+    """
+    connector.config = {**connector.config, "history_id": history_id}
+    flag_modified(connector, "config")
+
+
 async def index_google_gmail_messages(
     session: AsyncSession,
     connector_id: int,
@@ -125,19 +141,71 @@ async def index_google_gmail_messages(
             credentials, session, user_id, connector_id
         )
 
-        # Fetch recent Google gmail messages
-        logger.info(f"Fetching recent emails for connector {connector_id}")
-        messages, error = await gmail_connector.get_recent_messages(
-            max_results=max_messages, start_date=start_date, end_date=end_date
-        )
+        # Periodic syncs (no explicit date range) fetch only the changes made
+        # since the mailbox history ID stored by the previous sync
+        stored_history_id = config_data.get("history_id")
+        new_history_id = None
+        deleted_message_ids: list[str] = []
+        messages = None
 
-        if error:
-            await task_logger.log_task_failure(
-                log_entry, f"Failed to fetch messages: {error}", {}
+        if stored_history_id and start_date is None and end_date is None:
+            logger.info(
+                f"Fetching Gmail changes since history ID {stored_history_id} for connector {connector_id}"
+            )
+            changes, error = await gmail_connector.get_history_changes(
+                stored_history_id
             )
-            return 0, f"Failed to fetch Gmail messages: {error}"
+            if error:
+                await task_logger.log_task_failure(
+                    log_entry, f"Failed to fetch mailbox history: {error}", {}
+                )
+                return 0, f"Failed to fetch Gmail history: {error}"
 
-        if not messages:
+            if changes is None:
+                logger.info(
+                    f"Gmail history ID of connector {connector_id} expired, running a full sync"
+                )
+            else:
+                messages, failed_ids = await gmail_connector.get_messages_batch(
+                    changes["changed_ids"],
+                    batch_size=config.GMAIL_BATCH_SIZE,
+                    max_concurrent_batches=config.GMAIL_MAX_CONCURRENT_BATCHES,
+                )
+                deleted_message_ids = changes["deleted_ids"]
+                # Keep the stored history ID so failed messages are fetched again
+                if not failed_ids:
+                    new_history_id = changes["history_id"]
+
+        if messages is None:
+            # Read the history ID before listing so changes made meanwhile aren't missed
+            profile, _ = await gmail_connector.get_user_profile()
+            new_history_id = profile.get("history_id")
+
+            # Fetch recent Google gmail messages
+            logger.info(f"Fetching recent emails for connector {connector_id}")
+            failed_ids: list[str] = []
+            messages, error = await gmail_connector.get_recent_messages(
+                max_results=max_messages,
+                start_date=start_date,
+                end_date=end_date,
+                batch_size=config.GMAIL_BATCH_SIZE,
+                max_concurrent_batches=config.GMAIL_MAX_CONCURRENT_BATCHES,
+                failed_ids=failed_ids,
+            )
+            # Keep the stored history ID so the next sync doesn't skip failed messages
+            if failed_ids:
+                new_history_id = None
+
+            if error:
+                await task_logger.log_task_failure(
+                    log_entry, f"Failed to fetch messages: {error}", {}
+                )
+                return 0, f"Failed to fetch Gmail messages: {error}"
+
+        if not messages and not deleted_message_ids:
+            if new_history_id:
+                _store_history_id(connector, new_history_id)
+                await session.commit()
             success_msg = "No Google gmail messages found in the specified date range"
             await task_logger.log_task_success(
                 log_entry, success_msg, {"messages_count": 0}
@@ -240,12 +308,14 @@ async def index_google_gmail_messages(
                             summary_content = f"Google Gmail Message: {subject}\n\n"
                             summary_content += f"Sender: {sender}\n"
                             summary_content += f"Date: {date_str}\n"
-                            summary_embedding = config.embedding_model_instance.embed(
+                            summary_embedding = await get_embedding_service().embed(
                                 summary_content
                             )
 
                         # Process chunks
-                        chunks = await create_document_chunks(markdown_content)
+                        chunks = await create_document_chunks(
+                            markdown_content, content_type="markdown"
+                        )
 
                         # Update existing document
                         existing_document.title = f"Gmail: {subject}"
@@ -293,12 +363,14 @@ async def index_google_gmail_messages(
                     summary_content = f"Google Gmail Message: {subject}\n\n"
                     summary_content += f"Sender: {sender}\n"
                     summary_content += f"Date: {date_str}\n"
-                    summary_embedding = config.embedding_model_instance.embed(
+                    summary_embedding = await get_embedding_service().embed(
                         summary_content
                     )
 
                 # Process chunks
-                chunks = await create_document_chunks(markdown_content)
+                chunks = await create_document_chunks(
+                    markdown_content, content_type="markdown"
+                )
 
                 # Create and store new document
                 logger.info(f"Creating new document for Gmail message: {subject}")
@@ -333,6 +405,29 @@ async def index_google_gmail_messages(
                 documents_skipped += 1
                 continue  # Skip this message and continue with others
 
+        # Delete documents of messages deleted, trashed or marked as spam
+        if deleted_message_ids:
+            await session.execute(
+                delete(Document).where(
+                    Document.unique_identifier_hash.in_(
+                        [
+                            generate_unique_identifier_hash(
+                                DocumentType.GOOGLE_GMAIL_CONNECTOR,
+                                message_id,
+                                search_space_id,
+                            )
+                            for message_id in deleted_message_ids
+                        ]
+                    )
+                )
+            )
+            logger.info(
+                f"Removed documents of {len(deleted_message_ids)} deleted Gmail messages"
+            )
+
+        if new_history_id:
+            _store_history_id(connector, new_history_id)
+
         # Update the last_indexed_at timestamp for the connector only if requested
         total_processed = documents_indexed
         if total_processed > 0:
@@ -7,9 +7,9 @@ from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.jira_connector import JiraConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -256,7 +256,7 @@ async def index_jira_issues(
                             if formatted_issue.get("description"):
                                 summary_content += f"Description: {formatted_issue.get('description')}\n\n"
                             summary_content += f"Comments: {comment_count}"
-                            summary_embedding = config.embedding_model_instance.embed(
+                            summary_embedding = await get_embedding_service().embed(
                                 summary_content
                             )
 
@@ -316,7 +316,7 @@ async def index_jira_issues(
                             f"Description: {formatted_issue.get('description')}\n\n"
                         )
                     summary_content += f"Comments: {comment_count}"
-                    summary_embedding = config.embedding_model_instance.embed(
+                    summary_embedding = await get_embedding_service().embed(
                         summary_content
                     )
 
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import config
 from app.connectors.notion_history import NotionHistoryConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
 from app.services.llm_service import get_user_long_context_llm
@@ -22,6 +23,7 @@ from .base import (
     build_document_metadata_string,
     check_document_by_unique_identifier,
     get_connector_by_id,
+    get_existing_document_metadata,
     logger,
     update_connector_last_indexed,
 )
@@ -143,7 +145,11 @@ async def index_notion_pages(
                 "%Y-%m-%dT%H:%M:%SZ"
             )
 
-        notion_client = NotionHistoryConnector(token=notion_token)
+        notion_client = NotionHistoryConnector(
+            token=notion_token,
+            requests_per_second=config.NOTION_REQUESTS_PER_SECOND,
+            max_concurrent_pages=config.NOTION_MAX_CONCURRENT_PAGES,
+        )
 
         logger.info(f"Fetching Notion pages from {start_date_iso} to {end_date_iso}")
 
@@ -157,9 +163,9 @@ async def index_notion_pages(
             },
         )
 
-        # Get all pages
+        # List all pages, without their blocks
         try:
-            pages = await notion_client.get_all_pages(
+            pages = await notion_client.search_pages(
                 start_date=start_date_iso, end_date=end_date_iso
             )
             logger.info(f"Found {len(pages)} Notion pages")
@@ -189,6 +195,31 @@ async def index_notion_pages(
         documents_skipped = 0
         skipped_pages = []
 
+        # Skip pages not edited since they were stored, before fetching their blocks
+        page_hashes = {
+            page["id"]: generate_unique_identifier_hash(
+                DocumentType.NOTION_CONNECTOR, page["id"], search_space_id
+            )
+            for page in pages
+        }
+        stored_metadata = await get_existing_document_metadata(
+            session, list(page_hashes.values())
+        )
+        changed_pages = [
+            page
+            for page in pages
+            if stored_metadata.get(page_hashes[page["id"]], {}).get("last_edited_time")
+            != page["last_edited_time"]
+        ]
+        documents_skipped += len(pages) - len(changed_pages)
+        logger.info(
+            f"{len(changed_pages)} Notion pages new or edited, "
+            f"{len(pages) - len(changed_pages)} unchanged"
+        )
+
+        # Fetch the block trees of changed pages concurrently
+        pages = await notion_client.get_pages_content(changed_pages)
+
         await task_logger.log_task_progress(
             log_entry,
             f"Starting to process {len(pages)} Notion pages",
@@ -201,6 +232,7 @@ async def index_notion_pages(
                 page_id = page.get("page_id")
                 page_title = page.get("title", f"Untitled page ({page_id})")
                 page_content = page.get("content", [])
+                last_edited_time = page.get("last_edited_time")
 
                 logger.info(f"Processing Notion page: {page_title} ({page_id})")
 
@@ -305,6 +337,11 @@ async def index_notion_pages(
                         logger.info(
                             f"Document for Notion page {page_title} unchanged. Skipping."
                         )
+                        # Remember the edit time so the blocks aren't fetched again
+                        existing_document.document_metadata = {
+                            **(existing_document.document_metadata or {}),
+                            "last_edited_time": last_edited_time,
+                        }
                         documents_skipped += 1
                         continue
                     else:
@@ -340,7 +377,9 @@ async def index_notion_pages(
                         )
 
                         # Process chunks
-                        chunks = await create_document_chunks(markdown_content)
+                        chunks = await create_document_chunks(
+                            markdown_content, content_type="markdown"
+                        )
 
                         # Update existing document
                         existing_document.title = f"Notion - {page_title}"
@@ -350,6 +389,7 @@ async def index_notion_pages(
                         existing_document.document_metadata = {
                             "page_title": page_title,
                             "page_id": page_id,
+                            "last_edited_time": last_edited_time,
                             "indexed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                         }
                         existing_document.chunks = chunks
@@ -383,7 +423,9 @@ async def index_notion_pages(
 
                 # Process chunks
                 logger.debug(f"Chunking content for page {page_title}")
-                chunks = await create_document_chunks(markdown_content)
+                chunks = await create_document_chunks(
+                    markdown_content, content_type="markdown"
+                )
 
                 # Create and store new document
                 document = Document(
@@ -393,6 +435,7 @@ async def index_notion_pages(
                     document_metadata={
                         "page_title": page_title,
                         "page_id": page_id,
+                        "last_edited_time": last_edited_time,
                         "indexed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     },
                     content=summary_content,
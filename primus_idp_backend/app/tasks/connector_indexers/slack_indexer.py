@@ -2,6 +2,7 @@
 Slack connector indexer.
 """
 
+import asyncio
 from datetime import datetime
 
 from slack_sdk.errors import SlackApiError
@@ -10,7 +11,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import config
 from app.connectors.slack_history import SlackHistory
-from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.db import DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
     create_document_chunks,
@@ -19,9 +21,11 @@ from app.utils.document_converters import (
 )
 
 from .base import (
+    BulkIngestItem,
     build_document_metadata_markdown,
+    bulk_upsert_documents,
     calculate_date_range,
-    check_document_by_unique_identifier,
+    filter_changed_items,
     get_connector_by_id,
     logger,
     update_connector_last_indexed,
@@ -67,6 +71,9 @@ async def index_slack_messages(
         },
     )
 
+    # Channel history fetches started ahead of processing
+    history_tasks: dict[str, asyncio.Task] = {}
+
     try:
         # Get the connector
         await task_logger.log_task_progress(
@@ -109,7 +116,10 @@ async def index_slack_messages(
             {"stage": "client_initialization"},
         )
 
-        slack_client = SlackHistory(token=slack_token)
+        slack_client = SlackHistory(
+            token=slack_token,
+            max_concurrent_channels=config.SLACK_MAX_CONCURRENT_CHANNELS,
+        )
 
         # Calculate date range
         await task_logger.log_task_progress(
@@ -140,7 +150,7 @@ async def index_slack_messages(
 
         # Get all channels
         try:
-            channels = slack_client.get_all_channels()
+            channels = await slack_client.get_all_channels()
         except Exception as e:
             await task_logger.log_task_failure(
                 log_entry,
@@ -169,6 +179,27 @@ async def index_slack_messages(
             {"stage": "process_channels", "total_channels": len(channels)},
         )
 
+        # Load all user profiles at once instead of one users.info call per author
+        if config.SLACK_PREFETCH_USERS:
+            try:
+                await slack_client.prefetch_users()
+            except Exception as e:
+                logger.warning(f"Failed to prefetch Slack users: {e!s}")
+
+        # Start fetching channel histories concurrently; the client bounds the
+        # number of channels in flight and keeps calls within the rate budget
+        for channel_obj in channels:
+            if channel_obj["is_private"] and not channel_obj["is_member"]:
+                continue
+            history_tasks[channel_obj["id"]] = asyncio.create_task(
+                slack_client.get_history_by_date_range(
+                    channel_id=channel_obj["id"],
+                    start_date=start_date_str,
+                    end_date=end_date_str,
+                    limit=1000,  # Limit to 1000 messages per channel
+                )
+            )
+
         # Process each channel
         for channel_obj in channels:
             channel_id = channel_obj["id"]
@@ -189,12 +220,7 @@ async def index_slack_messages(
                     continue
 
                 # Get messages for this channel
-                messages, error = slack_client.get_history_by_date_range(
-                    channel_id=channel_id,
-                    start_date=start_date_str,
-                    end_date=end_date_str,
-                    limit=1000,  # Limit to 1000 messages per channel
-                )
+                messages, error = await history_tasks.pop(channel_id)
 
                 if error:
                     logger.warning(
@@ -211,21 +237,15 @@ async def index_slack_messages(
                     documents_skipped += 1
                     continue  # Skip if no messages
 
-                # Format messages with user info
-                formatted_messages = []
-                for msg in messages:
-                    # Skip bot messages and system messages
-                    if msg.get("subtype") in [
-                        "bot_message",
-                        "channel_join",
-                        "channel_leave",
-                    ]:
-                        continue
-
-                    formatted_msg = slack_client.format_message(
-                        msg, include_user_info=True
+                # Format messages with user info, skipping bot and system messages
+                formatted_messages = await asyncio.gather(
+                    *(
+                        slack_client.format_message(msg, include_user_info=True)
+                        for msg in messages
+                        if msg.get("subtype")
+                        not in ["bot_message", "channel_join", "channel_leave"]
                     )
-                    formatted_messages.append(formatted_msg)
+                )
 
                 if not formatted_messages:
                     logger.info(
@@ -234,6 +254,7 @@ async def index_slack_messages(
                     documents_skipped += 1
                     continue  # Skip if no valid messages after filtering
 
+                channel_items = []
                 for msg in formatted_messages:
                     timestamp = msg.get("datetime", "Unknown Time")
                     msg_ts = msg.get("ts", timestamp)  # Get original Slack timestamp
@@ -275,38 +296,43 @@ async def index_slack_messages(
                         combined_document_string, search_space_id
                     )
 
-                    # Check if document with this unique identifier already exists
-                    existing_document = await check_document_by_unique_identifier(
-                        session, unique_identifier_hash
+                    channel_items.append(
+                        BulkIngestItem(
+                            unique_identifier_hash=unique_identifier_hash,
+                            content_hash=content_hash,
+                            payload={"content": combined_document_string},
+                        )
+                    )
+
+                # Resolve existing messages in one query and skip unchanged ones
+                items_to_index, unchanged_count = await filter_changed_items(
+                    session, channel_items
+                )
+                documents_skipped += unchanged_count
+                if unchanged_count:
+                    logger.info(
+                        f"Skipping {unchanged_count} unchanged Slack messages in channel {channel_name}"
                     )
 
-                    if existing_document:
-                        # Document exists - check if content has changed
-                        if existing_document.content_hash == content_hash:
-                            logger.info(
-                                f"Document for Slack message {msg_ts} in channel {channel_name} unchanged. Skipping."
-                            )
-                            documents_skipped += 1
-                            continue
-                        else:
-                            # Content has changed - update the existing document
-                            logger.info(
-                                f"Content changed for Slack message {msg_ts} in channel {channel_name}. Updating document."
-                            )
-
-                            # Update chunks and embedding
-                            chunks = await create_document_chunks(
-                                combined_document_string
-                            )
-                            doc_embedding = config.embedding_model_instance.embed(
-                                combined_document_string
-                            )
-
-                            # Update existing document
-                            existing_document.content = combined_document_string
-                            existing_document.content_hash = content_hash
-                            existing_document.embedding = doc_embedding
-                            existing_document.document_metadata = {
+                if not items_to_index:
+                    continue
+
+                # Embed all new or changed messages of the channel in batches
+                doc_embeddings = await get_embedding_service().embed_batch(
+                    [item.payload["content"] for item in items_to_index]
+                )
+
+                documents = []
+                for item, doc_embedding in zip(
+                    items_to_index, doc_embeddings, strict=True
+                ):
+                    chunks = await create_document_chunks(item.payload["content"])
+                    documents.append(
+                        {
+                            "search_space_id": search_space_id,
+                            "title": f"Slack - {channel_name}",
+                            "document_type": DocumentType.SLACK_CONNECTOR,
+                            "document_metadata": {
                                 "channel_name": channel_name,
                                 "channel_id": channel_id,
                                 "start_date": start_date_str,
@@ -315,44 +341,24 @@ async def index_slack_messages(
                                 "indexed_at": datetime.now().strftime(
                                     "%Y-%m-%d %H:%M:%S"
                                 ),
-                            }
-
-                            # Delete old chunks and add new ones
-                            existing_document.chunks = chunks
-
-                            documents_indexed += 1
-                            logger.info(f"Successfully updated Slack message {msg_ts}")
-                            continue
-
-                    # Document doesn't exist - create new one
-                    # Process chunks
-                    chunks = await create_document_chunks(combined_document_string)
-                    doc_embedding = config.embedding_model_instance.embed(
-                        combined_document_string
-                    )
-
-                    # Create and store new document
-                    document = Document(
-                        search_space_id=search_space_id,
-                        title=f"Slack - {channel_name}",
-                        document_type=DocumentType.SLACK_CONNECTOR,
-                        document_metadata={
-                            "channel_name": channel_name,
-                            "channel_id": channel_id,
-                            "start_date": start_date_str,
-                            "end_date": end_date_str,
-                            "message_count": len(formatted_messages),
-                            "indexed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        },
-                        content=combined_document_string,
-                        embedding=doc_embedding,
-                        chunks=chunks,
-                        content_hash=content_hash,
-                        unique_identifier_hash=unique_identifier_hash,
+                            },
+                            "content": item.payload["content"],
+                            "content_hash": item.content_hash,
+                            "unique_identifier_hash": item.unique_identifier_hash,
+                            "embedding": doc_embedding,
+                            "chunks": [
+                                {
+                                    "content": chunk.content,
+                                    "embedding": chunk.embedding,
+                                    "token_count": chunk.token_count,
+                                }
+                                for chunk in chunks
+                            ],
+                        }
                     )
 
-                    session.add(document)
-                    documents_indexed += 1
+                # Insert new and update changed messages in bulk
+                documents_indexed += await bulk_upsert_documents(session, documents)
                 logger.info(
                     f"Successfully indexed new channel {channel_name} with {len(formatted_messages)} messages"
                 )
@@ -424,4 +430,8 @@ async def index_slack_messages(
         )
         logger.error(f"Failed to index Slack messages: {e!s}")
         return 0, f"Failed to index Slack messages: {e!s}"
+    finally:
+        # Don't leave fetches running if indexing stopped early
+        for task in history_tasks.values():
+            task.cancel()
 
@@ -3,6 +3,8 @@ File document processors for different ETL services (Unstructured, LlamaCloud, D
 """
 
 import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
 
 from fastapi import HTTPException
 from langchain_core.documents import Document as LangChainDocument
@@ -12,6 +14,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import config as app_config
 from app.db import Document, DocumentType, Log
+from app.services.embedding_service import get_embedding_service
+from app.services.etl_cache_service import get_etl_cache
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -21,6 +25,7 @@ from app.utils.document_converters import (
     generate_document_summary,
     generate_unique_identifier_hash,
 )
+from app.utils.file_uploads import hash_file
 
 from .base import (
     check_document_by_unique_identifier,
@@ -95,7 +100,7 @@ async def add_received_file_document_using_unstructured(
         )
 
         # Process chunks
-        chunks = await create_document_chunks(file_in_markdown)
+        chunks = await create_document_chunks(file_in_markdown, content_type="markdown")
 
         # Update or create document
         if existing_document:
@@ -209,7 +214,7 @@ async def add_received_file_document_using_llamacloud(
         )
 
         # Process chunks
-        chunks = await create_document_chunks(file_in_markdown)
+        chunks = await create_document_chunks(file_in_markdown, content_type="markdown")
 
         # Update or create document
         if existing_document:
@@ -313,12 +318,10 @@ async def add_received_file_document_using_docling(
                 f"No long context LLM configured for user {user_id} in search space {search_space_id}"
             )
 
-        # Generate summary using chunked processing for large documents
-        from app.services.docling_service import create_docling_service
-
-        docling_service = create_docling_service()
+        # Generate summary using map-reduce processing for large documents
+        from app.services.document_summary_service import get_document_summarizer
 
-        summary_content = await docling_service.process_large_document_summary(
+        summary_content = await get_document_summarizer().summarize(
             content=file_in_markdown, llm=user_llm, document_title=file_name
         )
 
@@ -341,14 +344,12 @@ async def add_received_file_document_using_docling(
             f"{metadata_section}\n\n# DOCUMENT SUMMARY\n\n{summary_content}"
         )
 
-        from app.config import config
-
-        summary_embedding = config.embedding_model_instance.embed(
+        summary_embedding = await get_embedding_service().embed(
             enhanced_summary_content
         )
 
         # Process chunks
-        chunks = await create_document_chunks(file_in_markdown)
+        chunks = await create_document_chunks(file_in_markdown, content_type="markdown")
 
         # Update or create document
         if existing_document:
@@ -476,7 +477,7 @@ async def add_received_file_document_using_chandra(
         )
 
         # Process chunks
-        chunks = await create_document_chunks(file_in_markdown)
+        chunks = await create_document_chunks(file_in_markdown, content_type="markdown")
 
         # Update or create document
         if existing_document:
@@ -528,6 +529,47 @@ async def add_received_file_document_using_chandra(
         ) from e
 
 
+async def parse_file_with_cache(
+    file_path: str,
+    file_hash: str | None,
+    etl_service: str,
+    parser_options: dict[str, Any],
+    parse: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    Parse a file with an ETL service unless the result is cached.
+
+    Results are cached by the file's content, the ETL service and the parser
+    options, so a file uploaded again is not parsed again.
+
+    Args:
+        file_path: Path to the file
+        file_hash: SHA-256 of the file, computed from file_path if not given
+        etl_service: Name of the ETL service
+        parser_options: Parser options affecting the result
+        parse: Coroutine function parsing the file into a JSON-serializable result
+
+    Returns:
+        The ETL result
+    """
+    etl_cache = get_etl_cache()
+    if etl_cache is None:
+        return await parse()
+
+    if not file_hash:
+        file_hash = await hash_file(file_path)
+    cache_key = etl_cache.make_key(file_hash, etl_service, parser_options)
+
+    result = await etl_cache.get(cache_key)
+    if result is not None:
+        logging.info(f"Using cached {etl_service} result for file {file_hash}")
+        return result
+
+    result = await parse()
+    await etl_cache.set(cache_key, result)
+    return result
+
+
 async def process_file_in_background(
     file_path: str,
     filename: str,
@@ -536,6 +578,7 @@ async def process_file_in_background(
     session: AsyncSession,
     task_logger: TaskLoggingService,
     log_entry: Log,
+    file_hash: str | None = None,
 ):
     try:
         # Check if the file is a markdown or text file
@@ -720,20 +763,36 @@ async def process_file_in_background(
                     },
                 )
 
-                from langchain_unstructured import UnstructuredLoader
+                unstructured_options = {
+                    "mode": "elements",
+                    "languages": ["eng"],
+                    "include_orig_elements": False,
+                    "include_metadata": False,
+                    "strategy": "auto",
+                }
+
+                async def parse_with_unstructured():
+                    from langchain_unstructured import UnstructuredLoader
 
-                # Process the file
-                loader = UnstructuredLoader(
+                    # Process the file
+                    loader = UnstructuredLoader(
+                        file_path, post_processors=[], **unstructured_options
+                    )
+
+                    elements = await loader.aload()
+                    return [
+                        {"page_content": doc.page_content, "metadata": doc.metadata}
+                        for doc in elements
+                    ]
+
+                elements = await parse_file_with_cache(
                     file_path,
-                    mode="elements",
-                    post_processors=[],
-                    languages=["eng"],
-                    include_orig_elements=False,
-                    include_metadata=False,
-                    strategy="auto",
+                    file_hash,
+                    "UNSTRUCTURED",
+                    unstructured_options,
+                    parse_with_unstructured,
                 )
-
-                docs = await loader.aload()
+                docs = [LangChainDocument(**element) for element in elements]
 
                 await task_logger.log_task_progress(
                     log_entry,
@@ -788,20 +847,35 @@ async def process_file_in_background(
                     },
                 )
 
-                from llama_cloud_services import LlamaParse
-                from llama_cloud_services.parse.utils import ResultType
+                async def parse_with_llamacloud():
+                    from llama_cloud_services import LlamaParse
+                    from llama_cloud_services.parse.utils import ResultType
+
+                    # Create LlamaParse parser instance
+                    parser = LlamaParse(
+                        api_key=app_config.LLAMA_CLOUD_API_KEY,
+                        num_workers=1,  # Use single worker for file processing
+                        verbose=True,
+                        language="en",
+                        result_type=ResultType.MD,
+                    )
 
-                # Create LlamaParse parser instance
-                parser = LlamaParse(
-                    api_key=app_config.LLAMA_CLOUD_API_KEY,
-                    num_workers=1,  # Use single worker for file processing
-                    verbose=True,
-                    language="en",
-                    result_type=ResultType.MD,
-                )
+                    # Parse the file asynchronously
+                    result = await parser.aparse(file_path)
+
+                    # Get markdown documents from the result
+                    documents = await result.aget_markdown_documents(
+                        split_by_page=False
+                    )
+                    return [doc.text for doc in documents]
 
-                # Parse the file asynchronously
-                result = await parser.aparse(file_path)
+                markdown_documents = await parse_file_with_cache(
+                    file_path,
+                    file_hash,
+                    "LLAMACLOUD",
+                    {"language": "en", "result_type": "md"},
+                    parse_with_llamacloud,
+                )
 
                 # Clean up the temp file
                 import os
@@ -812,11 +886,6 @@ async def process_file_in_background(
                     print("Error deleting temp file", e)
                     pass
 
-                # Get markdown documents from the result
-                markdown_documents = await result.aget_markdown_documents(
-                    split_by_page=False
-                )
-
                 await task_logger.log_task_progress(
                     log_entry,
                     f"LlamaCloud parsing completed, creating documents: {filename}",
@@ -826,10 +895,7 @@ async def process_file_in_background(
                     },
                 )
 
-                for doc in markdown_documents:
-                    # Extract text content from the markdown documents
-                    markdown_content = doc.text
-
+                for markdown_content in markdown_documents:
                     # Process the documents using our LlamaCloud background task
                     doc_result = await add_received_file_document_using_llamacloud(
                         session,
@@ -872,14 +938,21 @@ async def process_file_in_background(
                     },
                 )
 
-                # Use Docling service for document processing
-                from app.services.docling_service import create_docling_service
+                async def parse_with_docling():
+                    # Convert in the Docling worker pool to keep the event loop free
+                    from app.services.document_conversion_pool import (
+                        get_document_conversion_pool,
+                    )
 
-                # Create Docling service
-                docling_service = create_docling_service()
+                    # Process the document
+                    result = await get_document_conversion_pool().convert(
+                        file_path, filename
+                    )
+                    return {"content": result["content"]}
 
-                # Process the document
-                result = await docling_service.process_document(file_path, filename)
+                result = await parse_file_with_cache(
+                    file_path, file_hash, "DOCLING", {}, parse_with_docling
+                )
 
                 # Clean up the temp file
                 import os
@@ -941,68 +1014,82 @@ async def process_file_in_background(
                     },
                 )
 
-                from app.services.chandra_service import ChandraService
-                import tempfile
-                import shutil
-                
-                # Chandra needs an output directory
-                # We'll use a temp directory for output
-                with tempfile.TemporaryDirectory() as temp_output_dir:
-                    chandra_service = ChandraService(model_method=app_config.CHANDRA_METHOD)
-                    
-                    # Process the document
-                    result = chandra_service.process_document(
-                        file_path=file_path,
-                        output_dir=temp_output_dir
-                    )
-                    
-                    # Clean up the input temp file
-                    try:
-                        os.unlink(file_path)
-                    except Exception as e:
-                        print("Error deleting temp file", e)
-                        pass
-
-                    await task_logger.log_task_progress(
+                async def parse_with_chandra():
+                    import tempfile
+
+                    from app.services.chandra_service import ChandraService
+
+                    # Chandra needs an output directory
+                    # We'll use a temp directory for output
+                    with tempfile.TemporaryDirectory() as temp_output_dir:
+                        chandra_service = ChandraService(
+                            model_method=app_config.CHANDRA_METHOD
+                        )
+
+                        # Process the document
+                        result = chandra_service.process_document(
+                            file_path=file_path, output_dir=temp_output_dir
+                        )
+                    return {
+                        "markdown": result["markdown"],
+                        "metadata": result["metadata"],
+                    }
+
+                result = await parse_file_with_cache(
+                    file_path,
+                    file_hash,
+                    "CHANDRA",
+                    {"method": app_config.CHANDRA_METHOD},
+                    parse_with_chandra,
+                )
+
+                # Clean up the input temp file
+                try:
+                    os.unlink(file_path)
+                except Exception as e:
+                    print("Error deleting temp file", e)
+                    pass
+
+                await task_logger.log_task_progress(
+                    log_entry,
+                    f"Chandra processing completed, creating document: {filename}",
+                    {
+                        "processing_stage": "processing_complete",
+                        "content_length": len(result["markdown"]),
+                    },
+                )
+
+                # Process the document using our Chandra background task
+                doc_result = await add_received_file_document_using_chandra(
+                    session,
+                    filename,
+                    chandra_markdown_document=result["markdown"],
+                    chandra_metadata=result["metadata"],
+                    search_space_id=search_space_id,
+                    user_id=user_id,
+                )
+
+                if doc_result:
+                    await task_logger.log_task_success(
                         log_entry,
-                        f"Chandra processing completed, creating document: {filename}",
+                        f"Successfully processed file with Chandra: {filename}",
                         {
-                            "processing_stage": "processing_complete",
-                            "content_length": len(result["markdown"]),
+                            "document_id": doc_result.id,
+                            "content_hash": doc_result.content_hash,
+                            "file_type": "document",
+                            "etl_service": "CHANDRA",
                         },
                     )
-
-                    # Process the document using our Chandra background task
-                    doc_result = await add_received_file_document_using_chandra(
-                        session,
-                        filename,
-                        chandra_markdown_document=result["markdown"],
-                        chandra_metadata=result["metadata"],
-                        search_space_id=search_space_id,
-                        user_id=user_id,
+                else:
+                    await task_logger.log_task_success(
+                        log_entry,
+                        f"Document already exists (duplicate): {filename}",
+                        {
+                            "duplicate_detected": True,
+                            "file_type": "document",
+                            "etl_service": "CHANDRA",
+                        },
                     )
-
-                    if doc_result:
-                        await task_logger.log_task_success(
-                            log_entry,
-                            f"Successfully processed file with Chandra: {filename}",
-                            {
-                                "document_id": doc_result.id,
-                                "content_hash": doc_result.content_hash,
-                                "file_type": "document",
-                                "etl_service": "CHANDRA",
-                            },
-                        )
-                    else:
-                        await task_logger.log_task_success(
-                            log_entry,
-                            f"Document already exists (duplicate): {filename}",
-                            {
-                                "duplicate_detected": True,
-                                "file_type": "document",
-                                "etl_service": "CHANDRA",
-                            },
-                        )
     except Exception as e:
         await session.rollback()
         await task_logger.log_task_failure(
@@ -108,7 +108,7 @@ async def add_received_markdown_file_document(
         )
 
         # Process chunks
-        chunks = await create_document_chunks(file_in_markdown)
+        chunks = await create_document_chunks(file_in_markdown, content_type="markdown")
 
         # Update or create document
         if existing_document:
@@ -211,7 +211,9 @@ async def add_crawled_url_document(
             {"stage": "chunk_processing"},
         )
 
-        chunks = await create_document_chunks(content_in_markdown)
+        chunks = await create_document_chunks(
+            content_in_markdown, content_type="markdown"
+        )
 
         # Update or create document
         if existing_document:
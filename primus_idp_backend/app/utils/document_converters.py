@@ -2,9 +2,11 @@ import hashlib
 
 from litellm import get_model_info, token_counter
 
-from app.config import config
 from app.db import Chunk, DocumentType
 from app.prompts import SUMMARY_PROMPT_TEMPLATE
+from app.services.chunking_service import get_chunking_service
+from app.services.embedding_service import get_embedding_service
+from app.services.token_counting_service import get_token_counting_service
 
 
 def get_model_context_window(model_name: str) -> int:
@@ -24,7 +26,7 @@ def optimize_content_for_context_window(
     content: str, document_metadata: dict | None, model_name: str
 ) -> str:
     """
-    Optimize content length to fit within model context window using binary search.
+    Optimize content length to fit within model context window, tokenizing it once.
 
     Args:
         content: Original document content
@@ -61,29 +63,22 @@ def optimize_content_for_context_window(
         print(f"Warning: Very limited tokens available for content: {available_tokens}")
         return content[:500]  # Fallback to first 500 chars
 
-    # Binary search to find optimal content length
-    left, right = 0, len(content)
-    optimal_length = 0
-
-    while left <= right:
-        mid = (left + right) // 2
-        test_content = content[:mid]
-
-        # Test token count for this content length
-        test_document = f"<DOCUMENT_CONTENT>\n\n{test_content}\n\n</DOCUMENT_CONTENT>"
-        test_tokens = token_counter(
-            messages=[{"role": "user", "content": test_document}], model=model_name
-        )
-
-        if test_tokens <= available_tokens:
-            optimal_length = mid
-            left = mid + 1
-        else:
-            right = mid - 1
-
-    optimized_content = (
-        content[:optimal_length] if optimal_length > 0 else content[:500]
+    # Tokenize once and cut the content at the last token that fits
+    wrapper_tokens = token_counter(
+        messages=[
+            {
+                "role": "user",
+                "content": "<DOCUMENT_CONTENT>\n\n\n\n</DOCUMENT_CONTENT>",
+            }
+        ],
+        model=model_name,
     )
+    optimized_content = get_token_counting_service().truncate_to_tokens(
+        content, model_name, available_tokens - wrapper_tokens
+    )
+    optimal_length = len(optimized_content)
+    if optimal_length == 0:
+        optimized_content = content[:500]
 
     if optimal_length < len(content):
         print(
@@ -140,27 +135,42 @@ async def generate_document_summary(
     else:
         enhanced_summary_content = summary_content
 
-    summary_embedding = config.embedding_model_instance.embed(enhanced_summary_content)
+    summary_embedding = await get_embedding_service().embed(enhanced_summary_content)
 
     return enhanced_summary_content, summary_embedding
 
 
-async def create_document_chunks(content: str) -> list[Chunk]:
+async def create_document_chunks(
+    content: str,
+    file_path: str | None = None,
+    content_type: str | None = None,
+) -> list[Chunk]:
     """
     Create chunks from document content.
 
+    Source files are split by a code chunker for their language and markdown on
+    its headers; all other content is split by the recursive chunker.
+
     Args:
         content: Document content to chunk
+        file_path: Optional path or name of the source file, used to pick the chunker
+        content_type: Optional content type ("code", "markdown" or "prose")
+            overriding the one detected from file_path
 
     Returns:
         List of Chunk objects with embeddings
     """
+    chunk_texts = await get_chunking_service().chunk(
+        content, file_path=file_path, content_type=content_type
+    )
+    embeddings = await get_embedding_service().embed_batch(chunk_texts)
+    token_counts = get_token_counting_service().count_tokens_batch(chunk_texts)
+
     return [
-        Chunk(
-            content=chunk.text,
-            embedding=config.embedding_model_instance.embed(chunk.text),
+        Chunk(content=chunk_text, embedding=embedding, token_count=token_count)
+        for chunk_text, embedding, token_count in zip(
+            chunk_texts, embeddings, token_counts, strict=True
         )
-        for chunk in config.chunker_instance.chunk(content)
     ]
 
 
@@ -0,0 +1,137 @@
+"""
+Helpers for storing uploaded files and detecting re-uploads by their content hash.
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO
+
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.db import Document, DocumentType
+from app.utils.document_converters import generate_unique_identifier_hash
+
+# Document metadata key holding the SHA-256 of the uploaded file's raw bytes
+FILE_HASH_METADATA_KEY = "FILE_SHA256"
+
+
+def _copy_to_temp_file(
+    source: BinaryIO, suffix: str, chunk_size: int
+) -> tuple[str, str]:
+    """Copy a file object to a new temporary file in chunks, hashing the bytes."""
+    file_hash = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+        try:
+            while chunk := source.read(chunk_size):
+                file_hash.update(chunk)
+                temp_file.write(chunk)
+        except BaseException:
+            temp_file.close()
+            os.unlink(temp_file.name)
+            raise
+    return temp_file.name, file_hash.hexdigest()
+
+
+def _hash_file(file_path: str, chunk_size: int) -> str:
+    """Hash a file in chunks."""
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+async def hash_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 of a file on disk without blocking the event loop.
+
+    Args:
+        file_path: Path to the file
+        chunk_size: Number of bytes read at a time
+
+    Returns:
+        SHA-256 hex digest of the file
+    """
+    return await asyncio.to_thread(_hash_file, file_path, chunk_size)
+
+
+async def save_upload_to_temp_file(
+    file: UploadFile, chunk_size: int = 1024 * 1024
+) -> tuple[str, str]:
+    """
+    Stream an uploaded file to a temporary file and hash its content.
+
+    The file is copied in fixed-size chunks on a worker thread, so neither the
+    whole upload is held in memory nor the event loop is blocked.
+
+    Args:
+        file: The uploaded file
+        chunk_size: Number of bytes read and written at a time
+
+    Returns:
+        Tuple of (temporary file path, SHA-256 hex digest of the file)
+    """
+    suffix = os.path.splitext(file.filename or "")[1]
+    await file.seek(0)
+    return await asyncio.to_thread(_copy_to_temp_file, file.file, suffix, chunk_size)
+
+
+async def get_file_document_by_hash(
+    session: AsyncSession, search_space_id: int, file_hash: str
+) -> Document | None:
+    """
+    Find the file document of a search space created from a file with this hash.
+
+    Args:
+        session: Database session
+        search_space_id: ID of the search space
+        file_hash: SHA-256 hex digest of the file
+
+    Returns:
+        The existing document, or None if the file wasn't uploaded before
+    """
+    result = await session.execute(
+        select(Document)
+        .where(
+            Document.search_space_id == search_space_id,
+            Document.document_type == DocumentType.FILE,
+            Document.document_metadata[FILE_HASH_METADATA_KEY].as_string() == file_hash,
+        )
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
+async def record_file_hash(
+    session: AsyncSession, file_name: str, search_space_id: int, file_hash: str
+) -> None:
+    """
+    Store the hash of the uploaded file on the document created from it.
+
+    Args:
+        session: Database session
+        file_name: Name of the uploaded file
+        search_space_id: ID of the search space
+        file_hash: SHA-256 hex digest of the file
+    """
+    unique_identifier_hash = generate_unique_identifier_hash(
+        DocumentType.FILE, file_name, search_space_id
+    )
+    result = await session.execute(
+        select(Document).where(
+            Document.unique_identifier_hash == unique_identifier_hash
+        )
+    )
+    document = result.scalars().first()
+    if document is None:
+        return
+
+    document.document_metadata = {
+        **(document.document_metadata or {}),
+        FILE_HASH_METADATA_KEY: file_hash,
+    }
+    await session.commit()
@@ -0,0 +1,57 @@
+"""
+Rate limiting shared by connectors calling rate-limited APIs.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket limiting calls to a fixed number per minute.
+
+    Callers reserve a token and sleep until it becomes available, so the
+    bucket needs no lock and can be shared by every coroutine of a process.
+    """
+
+    def __init__(self, rate_per_minute: int, capacity: int | None = None):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate_per_minute: Sustained number of calls allowed per minute
+            capacity: Maximum burst size (defaults to one second's worth, at least 1)
+        """
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity or max(1, int(self.rate_per_second))
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Wait until a call is allowed by the bucket."""
+        now = time.monotonic()
+        self._refill(now)
+
+        # Reserve a token; a negative balance is the queue of waiting callers
+        self._tokens -= 1
+        wait_time = max(
+            -self._tokens / self.rate_per_second if self._tokens < 0 else 0.0,
+            self._blocked_until - now,
+        )
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+    def block_for(self, seconds: float) -> None:
+        """
+        Pause the bucket after the API answered with HTTP 429.
+
+        Args:
+            seconds: Value of the Retry-After header
+        """
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)